@@ -1,10 +1,32 @@
 import streamlit as st
 import os
-import requests
 from datetime import datetime, timedelta
-import json
 import pandas as pd
-import re
+
+from skillet.cache import open_cache
+from skillet.cassette import transport_from_env
+from skillet.euron import EURON_MODEL, EuronClient, requests_key
+from skillet.intents import (
+    ADD_TO_LIST, CHAT_CALL, INGREDIENTS_CALL, MEAL_PLAN, MEAL_PLAN_CALL, PREFERENCES_CALL, IntentRouter, plan_calls
+)
+from skillet.limiter import RateLimiter
+from skillet.models import (
+    DAYS, MEAL_TYPES, Ingredient, Message, Quantity, content_digest, merge_shopping_list, parse_json_reply,
+    parse_shopping_list, parse_week, shopping_list_rows
+)
+from skillet.preferences import PreferenceExtractor
+from skillet.prefetch import Prefetcher
+from skillet.profiles import AdaptiveProfiles
+from skillet.profiling import profiled, span
+from skillet.prompts import (
+    PREFERENCES_PROMPT, assistant_prompt, ingredient_messages, meal_plan_messages
+)
+from skillet.ui import (
+    profiling_sidebar, rerun_fragment, session_id, show_prefetch_stats, show_queue_stats, show_request_profiles,
+    show_session_memory, start_profiling, timed_fragment
+)
+from skillet.session import MemoryLimits, recent_messages, spill_messages, trim_oldest
+from skillet.weekplan import diff_week, meal_texts, patch_week, unlocked_slots
 
 # Page configuration
 st.set_page_config(
@@ -12,6 +34,7 @@ st.set_page_config(
     page_icon="🍳",
     layout="wide"
 )
+profile = start_profiling()
 
 # Streamlit UI styling
 st.markdown("""
@@ -66,6 +89,16 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+profile.mark("css")
+
+# Number of chat messages shown before "Load older messages"
+CHAT_WINDOW = 20
+# Per-session caps on chat history and cached extractions (SKILLET_MAX_* variables)
+MEMORY_LIMITS = MemoryLimits.from_env()
+COOKING_STYLES = ["General", "Bangladeshi", "Italian", "Mexican", "Asian", "Mediterranean", "Indian", "French", "American", "Vegetarian", "Vegan"]
+EXPERTISE_LEVELS = ["Beginner", "Intermediate", "Advanced", "Professional"]
+DIETARY_OPTIONS = ["Gluten-Free", "Dairy-Free", "Nut-Free", "Vegetarian", "Vegan", "Low-Carb", "Low-Sugar", "Keto", "Paleo"]
+
 # Initialize session state variables
 if 'messages' not in st.session_state:
     st.session_state.messages = []
@@ -93,6 +126,20 @@ if 'current_tab' not in st.session_state:
 
     Switch between tabs to access your **Chat**, **Shopping List**, or **Meal Plan** at any time.
     """)
+if 'recipe_ingredients' not in st.session_state:
+    # Ingredients extracted from each recipe text, by content digest
+    st.session_state.recipe_ingredients = {}
+if 'added_recipes' not in st.session_state:
+    # Digests of the recipes already merged into the shopping list
+    st.session_state.added_recipes = set()
+if 'locked_meals' not in st.session_state:
+    # (day, meal type) slots of the meal plan kept when it is regenerated
+    st.session_state.locked_meals = set()
+if 'chat_window' not in st.session_state:
+    st.session_state.chat_window = CHAT_WINDOW
+if 'spilled_messages' not in st.session_state:
+    # Older chat messages moved to the shared cache by enforce_memory_limits
+    st.session_state.spilled_messages = 0
 if 'user_preferences' not in st.session_state:
     # Default preferences - you can customize these
     st.session_state.user_preferences = {
@@ -101,6 +148,8 @@ if 'user_preferences' not in st.session_state:
         "dietary_restrictions": []
     }
 
+profile.mark("session_init")
+
 # Custom tab UI
 tabs = ["Chat", "Shopping List", "Meal Planning"]
 cols = st.columns(len(tabs))
@@ -114,160 +163,100 @@ for i, tab in enumerate(tabs):
 st.markdown(f"## {st.session_state.current_tab}")
 st.divider()
 
-# Euron API configuration
-EURON_API_URL = "https://api.euron.one/api/v1/euri/alpha/chat/completions"
-EURON_MODEL = "gemini-2.5-pro-exp-03-25"
-
 # Access the API key from Streamlit secrets
 def get_euron_api_key():
-    return st.secrets["euron"]["api_key"]
-
-def call_euron_api(messages, temperature=0.7, max_tokens=1000):
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {get_euron_api_key()}"
-    }
-    
-    payload = {
-        "messages": messages,
-        "model": EURON_MODEL,
-        "max_tokens": max_tokens,
-        "temperature": temperature
-    }
-    
     try:
-        response = requests.post(EURON_API_URL, headers=headers, json=payload)
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        data = response.json()
-        # Extract content based on Euron API response structure
-        if 'choices' in data and len(data['choices']) > 0:
-            if 'message' in data['choices'][0] and 'content' in data['choices'][0]['message']:
-                return data['choices'][0]['message']['content']
-        return "I'm sorry, I couldn't process that request."
-    except Exception as e:
-        print(f"API error: {str(e)}")
-        return f"Error: {str(e)}"
+        return st.secrets["euron"]["api_key"]
+    except (KeyError, FileNotFoundError) as e:
+        print(f"API key not configured: {str(e)}")
+        return None
+
+@st.cache_resource
+def get_shared_cache():
+    return open_cache()
+
+# Chat is served before extraction, and no session can use more than its share of the budget
+@st.cache_resource
+def get_rate_limiter():
+    return RateLimiter(cache=get_shared_cache(), counter_key=requests_key)
+
+# Timeouts and max_tokens per kind of call, adapted to the latencies seen by this worker
+@st.cache_resource
+def get_request_profiles():
+    return AdaptiveProfiles()
+
+# Responses are cached across reruns, sessions and workers
+@st.cache_resource
+def get_euron_client():
+    return EuronClient(get_euron_api_key, models=(EURON_MODEL,), timeout=None, retries=1,
+                       cache=get_shared_cache(), transport=transport_from_env(), limiter=get_rate_limiter(),
+                       profiles=get_request_profiles())
+
+# Likely next requests, sent in the background at the lowest priority; SKILLET_PREFETCH=0 turns it off
+@st.cache_resource
+def get_prefetcher():
+    return Prefetcher(get_euron_client(), enabled=os.environ.get("SKILLET_PREFETCH", "1") != "0")
+
+# Keep this session within MEMORY_LIMITS: old messages go to the shared cache and the
+# oldest extractions are dropped
+def enforce_memory_limits():
+    st.session_state.spilled_messages = spill_messages(
+        st.session_state.messages, get_shared_cache(), session_id(), st.session_state.spilled_messages, MEMORY_LIMITS
+    )
+    trim_oldest(st.session_state.recipe_ingredients, MEMORY_LIMITS.extractions)
+
+@profiled("api_call")
+def call_euron_api(messages, purpose="chat"):
+    settings = get_request_profiles().settings(purpose)
+    get_prefetcher().observe(messages, settings.temperature, settings.max_tokens)
+    return get_euron_client().complete(messages, temperature=settings.temperature, max_tokens=settings.max_tokens,
+                                       session=session_id(), priority=settings.priority, purpose=purpose)
 
 # Function to generate system message based on preferences
+@profiled("prompt_build")
 def generate_system_message(purpose="general"):
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    
-    # Use stored preferences
-    prefs = st.session_state.user_preferences
-    cooking_style = prefs["cooking_style"]
-    expertise_level = prefs["expertise_level"]
-    diet_string = ", ".join(prefs["dietary_restrictions"]) if prefs["dietary_restrictions"] else "No specific dietary restrictions"
-    
-    base_system_message = f"""
-    You are a specialized cooking assistant with expertise in various cuisines and cooking techniques. 
-    Today is {current_date}.
-    
-    Current preferences:
-    - Cooking Style Focus: {cooking_style}
-    - Expertise Level: {expertise_level}
-    - Dietary Restrictions: {diet_string}
-    
-    Guidelines:
-    1. Provide clear, step-by-step cooking instructions when sharing recipes
-    2. Suggest ingredient substitutions when appropriate, especially for dietary restrictions
-    3. Explain cooking techniques at the appropriate level
-    4. Include cooking times, temperatures, and yields where relevant
-    5. Offer tips for food preparation, storage, and safety
-    
-    Always prioritize food safety and proper handling techniques in your advice.
-    
-    The user can:
-    - Ask for recipes
-    - Add recipes to their shopping list by saying "add this to my shopping list"
-    - Request a meal plan by asking for one
-    - Ask cooking questions
-    
-    Help the user accomplish their cooking goals regardless of their experience level.
-    """
-    
-    if purpose == "shopping_list":
-        return base_system_message + """
-        For extracting shopping list ingredients:
-        1. Extract ingredients from the recipe in a structured format
-        2. Group ingredients by category (produce, dairy, meat, pantry items, etc.)
-        3. Specify quantities and units clearly
-        4. Format your response as a JSON object with the following structure:
-        {
-            "produce": [{"item": "tomato", "quantity": "2", "unit": "medium"}],
-            "dairy": [{"item": "milk", "quantity": "1", "unit": "cup"}],
-            "meat": [],
-            "pantry": [],
-            "spices": [],
-            "other": []
-        }
-        Only respond with the JSON. Do not include any explanations or additional text.
-        """
-    
-    elif purpose == "meal_plan":
-        return base_system_message + """
-        For creating a meal plan:
-        1. Create a 7-day meal plan with breakfast, lunch, and dinner options
-        2. Follow any dietary preferences, restrictions and cooking style
-        3. Keep recipes appropriate to the skill level
-        4. Include variety across the week\
-        5. If Nothing mentioned generate Bangladeshi style Recipes
-        6. Format your response as a JSON object with the following structure:
-        {
-            "monday": {
-                "breakfast": {"title": "Avocado Toast", "description": "Simple avocado toast with eggs", "prep_time": "15 minutes"},
-                "lunch": {"title": "Mediterranean Salad", "description": "Fresh salad with feta and olives", "prep_time": "20 minutes"},
-                "dinner": {"title": "Pasta Primavera", "description": "Seasonal vegetables with pasta", "prep_time": "30 minutes"}
-            },
-            "tuesday": {
-                "breakfast": {},
-                "lunch": {},
-                "dinner": {}
-            },
-            ...and so on for each day of the week...
-        }
-        Only respond with the JSON. Do not include any explanations or additional text.
-        """
-    
-    return base_system_message
+    return assistant_prompt(st.session_state.user_preferences, purpose)
 
-# Function to extract preferences from user messages
+@st.cache_resource
+def get_preference_extractor():
+    return PreferenceExtractor(COOKING_STYLES, EXPERTISE_LEVELS, DIETARY_OPTIONS)
+
+# Function to extract preferences from user messages. Known options, synonyms and
+# negations are handled locally; the LLM is only asked about unknown or conflicting signals.
 def extract_preferences(message):
+    signals = get_preference_extractor().extract(message)
+    if not signals.needs_llm:
+        return signals.apply(st.session_state.user_preferences)
     try:
         # Call Euron API to extract preferences
-        system_content = "You are a system that extracts cooking preferences from user messages. Extract any mentioned cooking style, dietary restrictions, or expertise level. Format as JSON with keys 'cooking_style', 'expertise_level', and 'dietary_restrictions' (array). Only respond with JSON. Follow Bangladeshi Style by default if not mentioned in cooking style"
-        
         messages = [
-            {"role": "system", "content": system_content},
+            {"role": "system", "content": PREFERENCES_PROMPT},
             {"role": "user", "content": message}
         ]
         
-        response_content = call_euron_api(messages, temperature=0.3, max_tokens=500)
+        response_content = call_euron_api(messages, purpose="preferences")
         
         # Extract JSON from response
         try:
-            # Find JSON in the response
-            json_match = re.search(r'({.+})', response_content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-                prefs = json.loads(json_str)
-            else:
-                prefs = json.loads(response_content)
+            with span("json_parse"):
+                prefs = parse_json_reply(response_content)
             
             # Update preferences if new ones were found
             updated = False
             
-            if "cooking_style" in prefs and prefs["cooking_style"]:
+            # Only keep values the preference widgets can show
+            if "cooking_style" in prefs and prefs["cooking_style"] in COOKING_STYLES:
                 st.session_state.user_preferences["cooking_style"] = prefs["cooking_style"]
                 updated = True
                 
-            if "expertise_level" in prefs and prefs["expertise_level"]:
+            if "expertise_level" in prefs and prefs["expertise_level"] in EXPERTISE_LEVELS:
                 st.session_state.user_preferences["expertise_level"] = prefs["expertise_level"]
                 updated = True
                 
-            if "dietary_restrictions" in prefs and prefs["dietary_restrictions"]:
+            new = set(prefs.get("dietary_restrictions") or []) & set(DIETARY_OPTIONS)
+            if new:
                 # Add new restrictions without duplicates
                 current = set(st.session_state.user_preferences["dietary_restrictions"])
-                new = set(prefs["dietary_restrictions"])
                 st.session_state.user_preferences["dietary_restrictions"] = list(current.union(new))
                 updated = True
                 
@@ -285,24 +274,14 @@ def extract_preferences(message):
 def extract_ingredients(recipe_text):
     try:
         # Call Euron API to extract ingredients in structured format
-        messages = [
-            {"role": "system", "content": generate_system_message(purpose="shopping_list")},
-            {"role": "user", "content": f"Extract ingredients from this recipe: {recipe_text}"}
-        ]
+        messages = ingredient_messages(recipe_text)
         
-        response_content = call_euron_api(messages, temperature=0.3, max_tokens=1000)
+        response_content = call_euron_api(messages, purpose="extraction")
         
         # Parse the response as JSON
         try:
-            # Find JSON in the response
-            json_match = re.search(r'({.+})', response_content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-                ingredients_json = json.loads(json_str)
-            else:
-                ingredients_json = json.loads(response_content)
-            
-            return ingredients_json
+            with span("json_parse"):
+                return parse_shopping_list(parse_json_reply(response_content))
         except Exception as e:
             print(f"Error parsing ingredients JSON: {str(e)}")
             return {}
@@ -313,29 +292,14 @@ def extract_ingredients(recipe_text):
 # Function to generate a meal plan
 def generate_meal_plan():
     try:
-        # Get preferences for the meal plan
-        prefs = st.session_state.user_preferences
-        preferences = f"Cooking style: {prefs['cooking_style']}, Expertise level: {prefs['expertise_level']}, Dietary restrictions: {', '.join(prefs['dietary_restrictions'])}"
-        
-        # Call Euron API to generate a meal plan
-        messages = [
-            {"role": "system", "content": generate_system_message(purpose="meal_plan")},
-            {"role": "user", "content": f"Create a weekly meal plan based on these preferences: {preferences}"}
-        ]
-        
-        response_content = call_euron_api(messages, temperature=0.7, max_tokens=2000)
+        # Call Euron API to generate a meal plan from the stored preferences
+        messages = meal_plan_messages(st.session_state.user_preferences)
+        response_content = call_euron_api(messages, purpose="meal_plan")
         
         # Parse the response as JSON
         try:
-            # Find JSON in the response
-            json_match = re.search(r'({.+})', response_content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-                meal_plan_json = json.loads(json_str)
-            else:
-                meal_plan_json = json.loads(response_content)
-            
-            return meal_plan_json
+            with span("json_parse"):
+                return parse_week(parse_json_reply(response_content))
         except Exception as e:
             print(f"Error parsing meal plan JSON: {str(e)}")
             return {}
@@ -343,169 +307,205 @@ def generate_meal_plan():
         st.error(f"Error generating meal plan: {str(e)}")
         return {}
 
+# Ask for new meals in the given slots only and patch them into the plan in place.
+# Returns the slots that changed.
+def regenerate_meals(slots):
+    if not slots:
+        return []
+    try:
+        messages = meal_plan_messages(st.session_state.user_preferences, plan=st.session_state.meal_plan,
+                                      slots=slots)
+        response_content = call_euron_api(messages, purpose="meal_plan")
+        try:
+            with span("json_parse"):
+                data = parse_json_reply(response_content)
+        except Exception as e:
+            print(f"Error parsing meal plan JSON: {str(e)}")
+            return []
+        return patch_week(st.session_state.meal_plan, data, slots)
+    except Exception as e:
+        st.error(f"Error updating meal plan: {str(e)}")
+        return []
+
+# A whole new plan when there is none yet; otherwise only the unlocked meals (of the given
+# days, or the whole week) are regenerated. Returns the changed slots.
+def update_meal_plan(days=None):
+    old_plan = st.session_state.meal_plan
+    if not old_plan:
+        meal_plan = generate_meal_plan()
+        if not meal_plan:
+            return []
+        st.session_state.meal_plan = meal_plan
+        changed = diff_week(old_plan, meal_plan)
+    else:
+        changed = regenerate_meals(unlocked_slots(st.session_state.locked_meals, days))
+    if changed:
+        prefetch_shopping_list(st.session_state.meal_plan)
+    return changed
+
+# Meals of the plan not on the shopping list yet, one per line, as their ingredients are
+# extracted: in one call, so the cost follows how many meals are new
+def meals_to_add(meal_plan):
+    texts = [text for text in meal_texts(meal_plan) if content_digest(text) not in st.session_state.added_recipes]
+    return texts, "".join(f"{text}\n" for text in texts)
+
+# A new or updated plan is usually followed by "Add All to Shopping List"; warm the cache
+# for the meals it would add
+def prefetch_shopping_list(meal_plan):
+    texts, recipe_text = meals_to_add(meal_plan)
+    if texts:
+        settings = get_request_profiles().settings("extraction")
+        get_prefetcher().submit(session_id(), ingredient_messages(recipe_text), temperature=settings.temperature,
+                                max_tokens=settings.max_tokens, purpose="extraction")
+
 # Function to add items to shopping list
 def add_to_shopping_list(ingredients):
-    for category, items in ingredients.items():
-        if category not in st.session_state.shopping_list:
-            st.session_state.shopping_list[category] = []
-        
-        # Add new items or update quantities of existing items
-        for new_item in items:
-            item_exists = False
-            for existing_item in st.session_state.shopping_list[category]:
-                if existing_item["item"].lower() == new_item["item"].lower():
-                    # Item exists, try to update quantity if possible
-                    try:
-                        if existing_item["unit"] == new_item["unit"]:
-                            existing_item["quantity"] = str(float(existing_item["quantity"]) + float(new_item["quantity"]))
-                        else:
-                            # If units don't match, just add as separate item
-                            st.session_state.shopping_list[category].append(new_item)
-                    except:
-                        # If conversion fails, just add as a new item
-                        st.session_state.shopping_list[category].append(new_item)
-                    item_exists = True
-                    break
-            
-            if not item_exists:
-                st.session_state.shopping_list[category].append(new_item)
+    merge_shopping_list(st.session_state.shopping_list, ingredients)
 
-# Main content based on current tab
-if st.session_state.current_tab == "Chat":
-    # Optional user preferences (hidden by default)
-    with st.expander("Customize Your Experience", expanded=False):
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            cooking_style = st.selectbox(
-                "Cooking Style Preference",
-                ["General", "Bangladeshi", "Italian", "Mexican", "Asian", "Mediterranean", "Indian", "French", "American", "Vegetarian", "Vegan"],
-                index=["General", "Bangladeshi", "Italian", "Mexican", "Asian", "Mediterranean", "Indian", "French", "American", "Vegetarian", "Vegan"].index(st.session_state.user_preferences["cooking_style"])
-            )
-            
-            if cooking_style != st.session_state.user_preferences["cooking_style"]:
-                st.session_state.user_preferences["cooking_style"] = cooking_style
-        
-        with col2:
-            expertise_level = st.select_slider(
-                "Your Cooking Expertise",
-                options=["Beginner", "Intermediate", "Advanced", "Professional"],
-                value=st.session_state.user_preferences["expertise_level"]
-            )
-            
-            if expertise_level != st.session_state.user_preferences["expertise_level"]:
-                st.session_state.user_preferences["expertise_level"] = expertise_level
-        
-        dietary_restrictions = st.multiselect(
-            "Dietary Preferences or Restrictions",
-            ["Gluten-Free", "Dairy-Free", "Nut-Free", "Vegetarian", "Vegan", "Low-Carb", "Low-Sugar", "Keto", "Paleo"],
-            default=st.session_state.user_preferences["dietary_restrictions"]
-        )
-        
-        if dietary_restrictions != st.session_state.user_preferences["dietary_restrictions"]:
-            st.session_state.user_preferences["dietary_restrictions"] = dietary_restrictions
-    
-    # Intro message for new users
-    if not st.session_state.messages:
-        st.markdown("""
-        ## 👋 Welcome to Shared Skillet AI!
-        You can visit sharedskillet.com and view some ready made recipes. You can also share your own recipes with community.
-        
-        I'm your AI cooking assistant, ready to help with:
-        
-        - 🍲 **Recipe ideas and cooking instructions**
-        - 📝 **Meal planning** for the week
-        - 🛒 **Shopping list generation** from recipes
-        - 💡 **Cooking techniques and tips**
-        
-        Just ask me anything about cooking! Try these examples:
-        - "I need a quick pasta recipe for dinner"
-        - "How do I make sourdough bread?"
-        - "Create a meal plan for the week"
-        - "What can I cook with chicken, broccoli and rice?"
-        """)
-        
-        # Add default welcome message
-        st.session_state.messages.append({
-            "role": "assistant", 
-            "content": "Hello! I'm Shared Skillet AI: your cooking assistant. What would you like to cook today?"
-        })
-    
-    # Display chat messages from history
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.write(message["content"])
+# Ingredients of a recipe, extracted on first use and kept with the session by content
+# digest, so adding the same text again is a local merge without an API call
+def recipe_ingredients(recipe_text):
+    digest = content_digest(recipe_text)
+    ingredients = st.session_state.recipe_ingredients.get(digest)
+    if ingredients is None:
+        ingredients = extract_ingredients(recipe_text)
+        if ingredients:
+            st.session_state.recipe_ingredients[digest] = ingredients
+    return digest, ingredients
+
+# Merge a recipe into the shopping list once. Returns "added", "duplicate" when this exact
+# text is already on the list, or "" when no ingredients could be extracted.
+def add_recipe_to_shopping_list(recipe_text):
+    if content_digest(recipe_text) in st.session_state.added_recipes:
+        return "duplicate"
+    digest, ingredients = recipe_ingredients(recipe_text)
+    if not ingredients:
+        return ""
+    add_to_shopping_list(ingredients)
+    st.session_state.added_recipes.add(digest)
+    return "added"
+
+# Merge the meals of the plan that aren't on the shopping list yet, so after a partial
+# regeneration only the new meals are extracted. Returns how many meals were added and
+# how many were already there.
+def add_meal_plan_to_shopping_list(meal_plan):
+    texts, recipe_text = meals_to_add(meal_plan)
+    already = len(meal_texts(meal_plan)) - len(texts)
+    if not texts:
+        return 0, already
+    _, ingredients = recipe_ingredients(recipe_text)
+    if not ingredients:
+        return 0, already
+    add_to_shopping_list(ingredients)
+    st.session_state.added_recipes.update(content_digest(text) for text in texts)
+    return len(texts), already
+
+@st.cache_resource
+def get_intent_router():
+    return IntentRouter()
+
+# Reply for commands that are handled without a chat completion
+def local_reply(route):
+    if route.intent == ADD_TO_LIST:
+        return "Sure! I'll add the ingredients from the latest recipe to your shopping list."
+    if route.intent == MEAL_PLAN:
+        return "Sure! I'm putting together a weekly meal plan based on your preferences."
+    prefs = st.session_state.user_preferences
+    diet_string = ", ".join(prefs["dietary_restrictions"]) if prefs["dietary_restrictions"] else "no dietary restrictions"
+    return f"Got it! I'll keep that in mind. Your preferences: {prefs['cooking_style']} cooking, {prefs['expertise_level']} level, {diet_string}."
+
+# Chat log and input; a new message only reruns this fragment
+@timed_fragment
+def chat_view():
+    # Display the most recent chat messages; older ones load on demand
+    hidden = st.session_state.spilled_messages + len(st.session_state.messages) - st.session_state.chat_window
+    if hidden > 0 and st.button(f"Load older messages ({hidden} hidden)", key="load_older"):
+        st.session_state.chat_window += CHAT_WINDOW
+        rerun_fragment()
+    for message in recent_messages(st.session_state.messages, st.session_state.chat_window, get_shared_cache(),
+                                   session_id(), st.session_state.spilled_messages, MEMORY_LIMITS):
+        with st.chat_message(message.role):
+            st.write(message.content)
 
     # New message input
     prompt = st.chat_input("Ask me anything about cooking...")
 
     if prompt:
         # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        st.session_state.messages.append(Message("user", prompt))
         
         # Display user message
         with st.chat_message("user"):
             st.write(prompt)
         
+        # Classify the prompt locally and only make the API calls this turn needs
+        route = get_intent_router().route(prompt)
+        calls = plan_calls(route)
+        
         # Extract preferences if any are mentioned
-        extract_preferences(prompt)
+        if PREFERENCES_CALL in calls:
+            extract_preferences(prompt)
         
         # Check if this is a request to add to shopping list or create meal plan
-        shopping_list_request = re.search(r"add (this|these|the) (recipe|ingredients) to (my )?(shopping|grocery) list", prompt.lower())
-        meal_plan_request = re.search(r"(create|make|generate) (a )?(meal|weekly|menu) plan", prompt.lower())
+        shopping_list_request = INGREDIENTS_CALL in calls
+        meal_plan_request = MEAL_PLAN_CALL in calls
         
         # Display assistant response with a spinner
         with st.chat_message("assistant"):
             with st.spinner("Cooking up a response..."):
-                # Create the messages array for the API call
-                messages = [
-                    {"role": "system", "content": generate_system_message()}
-                ]
-                
-                # Add all conversation history
-                for msg in st.session_state.messages:
-                    messages.append({"role": msg["role"], "content": msg["content"]})
-                
-                # Call Euron API
                 try:
-                    response_content = call_euron_api(messages, temperature=0.7, max_tokens=1000)
+                    if CHAT_CALL in calls:
+                        # Create the messages array for the API call
+                        messages = [
+                            {"role": "system", "content": generate_system_message()}
+                        ]
+                        
+                        # Add all conversation history
+                        messages.extend(msg.to_api() for msg in st.session_state.messages)
+                        
+                        # Call Euron API
+                        response_content = call_euron_api(messages, purpose="chat")
+                    else:
+                        response_content = local_reply(route)
                     
                     # Add assistant response to chat history
-                    st.session_state.messages.append({"role": "assistant", "content": response_content})
+                    st.session_state.messages.append(Message("assistant", response_content))
                     
                     # Display assistant response
                     st.write(response_content)
                     
                     # Handle shopping list requests
                     if shopping_list_request:
-                        # Look at the last few messages to find recipe content
-                        recent_messages = st.session_state.messages[-5:]  # Get last 5 messages
+                        # Look at the last few messages, newest first, to find the latest recipe
+                        last_messages = st.session_state.messages[-5:]  # Get last 5 messages
                         recipe_text = ""
-                        for msg in recent_messages:
-                            if msg["role"] == "assistant" and len(msg["content"]) > 100:  # Likely a recipe
-                                recipe_text = msg["content"]
+                        for msg in reversed(last_messages):
+                            if msg.role == "assistant" and len(msg.content) > 100:  # Likely a recipe
+                                recipe_text = msg.content
                                 break
                         
                         if recipe_text:
                             with st.spinner("Adding to shopping list..."):
-                                ingredients = extract_ingredients(recipe_text)
-                                if ingredients:
-                                    add_to_shopping_list(ingredients)
-                                    st.success("✅ Ingredients added to your shopping list! Go to the Shopping List tab to view them.")
+                                added = add_recipe_to_shopping_list(recipe_text)
+                            if added == "added":
+                                st.success("✅ Ingredients added to your shopping list! Go to the Shopping List tab to view them.")
+                            elif added == "duplicate":
+                                st.info("This recipe is already on your shopping list.")
                     
                     # Handle meal plan requests
                     if meal_plan_request:
                         with st.spinner("Creating your meal plan..."):
-                            meal_plan = generate_meal_plan()
-                            if meal_plan:
-                                st.session_state.meal_plan = meal_plan
+                            if update_meal_plan():
                                 st.success("✅ Meal plan created! Go to the Meal Planning tab to view it.")
                     
                 except Exception as e:
                     st.error(f"Error: {str(e)}")
                     st.error("Something went wrong. Please try again later.")
+        enforce_memory_limits()
 
-elif st.session_state.current_tab == "Shopping List":
+# Shopping list rows and actions
+@timed_fragment
+def shopping_list_view():
     # Empty shopping list message
     if not st.session_state.shopping_list:
         st.info("Your shopping list is empty. Get recipes in the chat and add them to your list!")
@@ -530,31 +530,22 @@ elif st.session_state.current_tab == "Shopping List":
                                 # Mark as purchased (to implement)
                                 pass
                         with col_b:
-                            st.write(f"{item['quantity']} {item['unit']} {item['item']}")
+                            st.write(str(item))
                         with col_c:
                             if st.button("Remove", key=f"remove_{category}_{i}"):
                                 st.session_state.shopping_list[category].pop(i)
-                                st.rerun()
+                                rerun_fragment()
             
         with col2:
             st.subheader("Actions")
             if st.button("Clear Shopping List"):
                 st.session_state.shopping_list = {}
-                st.rerun()
+                st.session_state.added_recipes = set()
+                rerun_fragment()
             
             if st.button("Export as CSV"):
                 # Convert to dataframe
-                shopping_data = []
-                for category, items in st.session_state.shopping_list.items():
-                    for item in items:
-                        shopping_data.append({
-                            "Category": category,
-                            "Item": item["item"],
-                            "Quantity": item["quantity"],
-                            "Unit": item["unit"]
-                        })
-                
-                df = pd.DataFrame(shopping_data)
+                df = pd.DataFrame(shopping_list_rows(st.session_state.shopping_list))
                 
                 # Create a download button
                 csv = df.to_csv(index=False)
@@ -582,13 +573,145 @@ elif st.session_state.current_tab == "Shopping List":
                         if new_category not in st.session_state.shopping_list:
                             st.session_state.shopping_list[new_category] = []
                         
-                        st.session_state.shopping_list[new_category].append({
-                            "item": new_item,
-                            "quantity": new_quantity,
-                            "unit": new_unit
-                        })
+                        st.session_state.shopping_list[new_category].append(
+                            Ingredient(new_item, Quantity.parse(new_quantity, new_unit), new_category)
+                        )
                         st.success(f"Added {new_item} to shopping list!")
+                        rerun_fragment()
+
+# One day of the meal plan
+@timed_fragment
+def meal_plan_day(day, date_label):
+    with st.expander(f"{day.capitalize()} ({date_label})", expanded=True):
+        # Only this day's unlocked meals are asked for again; the rest of the plan stays as it is
+        if st.button(f"Regenerate {day.capitalize()}", key=f"regen_{day}"):
+            if not unlocked_slots(st.session_state.locked_meals, [day]):
+                st.info("Every meal of this day is kept. Unlock one to regenerate it.")
+            else:
+                with st.spinner(f"Updating {day.capitalize()}..."):
+                    if not update_meal_plan(days=[day]):
+                        st.warning("Couldn't update this day right now. Please try again.")
+
+        # Three columns for breakfast, lunch, dinner
+        cols = st.columns(3)
+        
+        for i, meal_type in enumerate(MEAL_TYPES):
+            with cols[i]:
+                st.subheader(meal_type.capitalize())
+                
+                meal = st.session_state.meal_plan[day].meals.get(meal_type)
+                if meal is not None:
+                    
+                    st.markdown(f"""
+                    <div class="recipe-card">
+                        <h4>{meal.title}</h4>
+                        <p>{meal.description}</p>
+                        <p><strong>Prep time:</strong> {meal.prep_time}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    
+                    if st.button(f"Get Recipe", key=f"recipe_{day}_{meal_type}"):
+                        # Add message to chat history asking for this recipe
+                        st.session_state.messages.append(Message(
+                            "user",
+                            f"Please give me a detailed recipe for {meal.title} ({meal.description})"
+                        ))
+                        st.session_state.current_tab = "Chat"
                         st.rerun()
+                    
+                    if st.button(f"Add to Shopping List", key=f"shop_{day}_{meal_type}"):
+                        with st.spinner("Adding to shopping list..."):
+                            added = add_recipe_to_shopping_list(meal.text)
+                        if added == "added":
+                            st.success(f"✅ Added {meal.title} ingredients to shopping list!")
+                        elif added == "duplicate":
+                            st.info(f"{meal.title} is already on your shopping list.")
+                else:
+                    st.write("No meal planned")
+
+                slot = (day, meal_type)
+                if st.checkbox("Keep this meal", value=slot in st.session_state.locked_meals,
+                               key=f"lock_{day}_{meal_type}"):
+                    st.session_state.locked_meals.add(slot)
+                else:
+                    st.session_state.locked_meals.discard(slot)
+
+enforce_memory_limits()
+
+# Main content based on current tab
+if st.session_state.current_tab == "Chat":
+    # Optional user preferences (hidden by default)
+    with st.expander("Customize Your Experience", expanded=False):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            cooking_style = st.selectbox(
+                "Cooking Style Preference",
+                COOKING_STYLES,
+                index=COOKING_STYLES.index(st.session_state.user_preferences["cooking_style"])
+            )
+            
+            if cooking_style != st.session_state.user_preferences["cooking_style"]:
+                st.session_state.user_preferences["cooking_style"] = cooking_style
+        
+        with col2:
+            expertise_level = st.select_slider(
+                "Your Cooking Expertise",
+                options=EXPERTISE_LEVELS,
+                value=st.session_state.user_preferences["expertise_level"]
+            )
+            
+            if expertise_level != st.session_state.user_preferences["expertise_level"]:
+                st.session_state.user_preferences["expertise_level"] = expertise_level
+        
+        dietary_restrictions = st.multiselect(
+            "Dietary Preferences or Restrictions",
+            DIETARY_OPTIONS,
+            default=st.session_state.user_preferences["dietary_restrictions"]
+        )
+        
+        if dietary_restrictions != st.session_state.user_preferences["dietary_restrictions"]:
+            st.session_state.user_preferences["dietary_restrictions"] = dietary_restrictions
+        
+        extractor = get_preference_extractor()
+        if extractor.messages:
+            st.caption(f"Preferences understood locally in {extractor.messages - extractor.escalated} of "
+                       f"{extractor.messages} messages ({extractor.escalation_rate:.0%} sent to the AI)")
+        show_queue_stats(get_rate_limiter())
+        show_request_profiles(get_request_profiles())
+        show_prefetch_stats(get_prefetcher())
+        show_session_memory(st.session_state, MEMORY_LIMITS)
+    
+    # Intro message for new users
+    if not st.session_state.messages:
+        st.markdown("""
+        ## 👋 Welcome to Shared Skillet AI!
+        You can visit sharedskillet.com and view some ready made recipes. You can also share your own recipes with community.
+        
+        I'm your AI cooking assistant, ready to help with:
+        
+        - 🍲 **Recipe ideas and cooking instructions**
+        - 📝 **Meal planning** for the week
+        - 🛒 **Shopping list generation** from recipes
+        - 💡 **Cooking techniques and tips**
+        
+        Just ask me anything about cooking! Try these examples:
+        - "I need a quick pasta recipe for dinner"
+        - "How do I make sourdough bread?"
+        - "Create a meal plan for the week"
+        - "What can I cook with chicken, broccoli and rice?"
+        """)
+        
+        # Add default welcome message
+        st.session_state.messages.append(Message(
+            "assistant",
+            "Hello! I'm Shared Skillet AI: your cooking assistant. What would you like to cook today?"
+        ))
+    
+    chat_view()
+
+elif st.session_state.current_tab == "Shopping List":
+    shopping_list_view()
 
 elif st.session_state.current_tab == "Meal Planning":
     # Empty meal plan message
@@ -598,96 +721,59 @@ elif st.session_state.current_tab == "Meal Planning":
         # Button to create a meal plan
         if st.button("Create a Meal Plan Now"):
             with st.spinner("Creating your personalized meal plan..."):
-                meal_plan = generate_meal_plan()
-                if meal_plan:
-                    st.session_state.meal_plan = meal_plan
+                if update_meal_plan():
                     st.rerun()
                 else:
                     st.error("Failed to create meal plan. Please try again.")
         
         # Button to go back to chat
         if st.button("Ask About Meal Planning"):
-            st.session_state.messages.append({
-                "role": "user", 
-                "content": "I'd like you to create a meal plan for me. Can you help with that?"
-            })
+            st.session_state.messages.append(Message(
+                "user",
+                "I'd like you to create a meal plan for me. Can you help with that?"
+            ))
             st.session_state.current_tab = "Chat"
             st.rerun()
     else:
-        # Display meal plan
-        days_of_week = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-        meal_types = ["breakfast", "lunch", "dinner"]
-        
         # Date display for the week
         today = datetime.now()
         start_of_week = today - timedelta(days=today.weekday())
-        dates = {days_of_week[i]: (start_of_week + timedelta(days=i)).strftime('%b %d') for i in range(7)}
+        dates = {DAYS[i]: (start_of_week + timedelta(days=i)).strftime('%b %d') for i in range(7)}
         
         # Actions for meal plan
         col1, col2, col3 = st.columns([2, 2, 1])
         with col1:
             st.subheader("Your Weekly Meal Plan")
         with col3:
-            if st.button("Create New Plan"):
-                st.session_state.meal_plan = {}
-                st.rerun()
+            # Kept meals stay; everything else is asked for again and patched into the plan. The
+            # label doesn't depend on the locks, which change inside the day fragments.
+            if st.button("Regenerate Unlocked Meals"):
+                if not unlocked_slots(st.session_state.locked_meals):
+                    st.info("Every meal of the week is kept. Unlock one to regenerate it.")
+                else:
+                    with st.spinner("Updating your meal plan..."):
+                        changed = update_meal_plan()
+                    if changed:
+                        st.session_state.plan_update = f"✅ {len(changed)} meal{'s' if len(changed) != 1 else ''} updated."
+                        st.rerun()
+                    st.error("Failed to update meal plan. Please try again.")
             
             if st.button("Add All to Shopping List"):
-                # Extract all ingredients from all meals
-                all_meals_text = ""
-                for day in days_of_week:
-                    if day in st.session_state.meal_plan:
-                        for meal_type in meal_types:
-                            if meal_type in st.session_state.meal_plan[day] and st.session_state.meal_plan[day][meal_type]:
-                                meal = st.session_state.meal_plan[day][meal_type]
-                                all_meals_text += f"{meal['title']}: {meal['description']}\n"
-                
                 with st.spinner("Adding ingredients to shopping list..."):
-                    ingredients = extract_ingredients(all_meals_text)
-                    if ingredients:
-                        add_to_shopping_list(ingredients)
-                        st.success("✅ All meal ingredients added to your shopping list!")
+                    added, already = add_meal_plan_to_shopping_list(st.session_state.meal_plan)
+                if added:
+                    st.success(f"✅ Ingredients of {added} meal{'s' if added != 1 else ''} added to your shopping list!")
+                elif already:
+                    st.info("This meal plan is already on your shopping list.")
+                else:
+                    st.error("Couldn't extract the ingredients right now. Please try again.")
+        with col2:
+            if "plan_update" in st.session_state:
+                st.success(st.session_state.pop("plan_update"))
         
         # Display the meal plan in a calendar view
-        for day in days_of_week:
-            if day in st.session_state.meal_plan:
-                with st.expander(f"{day.capitalize()} ({dates[day]})", expanded=True):
-                    # Three columns for breakfast, lunch, dinner
-                    cols = st.columns(3)
-                    
-                    for i, meal_type in enumerate(meal_types):
-                        with cols[i]:
-                            st.subheader(meal_type.capitalize())
-                            
-                            if meal_type in st.session_state.meal_plan[day] and st.session_state.meal_plan[day][meal_type]:
-                                meal = st.session_state.meal_plan[day][meal_type]
-                                
-                                st.markdown(f"""
-                                <div class="recipe-card">
-                                    <h4>{meal['title']}</h4>
-                                    <p>{meal['description']}</p>
-                                    <p><strong>Prep time:</strong> {meal['prep_time']}</p>
-                                </div>
-                                """, unsafe_allow_html=True)
-                                
-                                if st.button(f"Get Recipe", key=f"recipe_{day}_{meal_type}"):
-                                    # Add message to chat history asking for this recipe
-                                    st.session_state.messages.append({
-                                        "role": "user", 
-                                        "content": f"Please give me a detailed recipe for {meal['title']} ({meal['description']})"
-                                    })
-                                    st.session_state.current_tab = "Chat"
-                                    st.rerun()
-                                
-                                if st.button(f"Add to Shopping List", key=f"shop_{day}_{meal_type}"):
-                                    with st.spinner("Adding to shopping list..."):
-                                        meal_text = f"{meal['title']}: {meal['description']}"
-                                        ingredients = extract_ingredients(meal_text)
-                                        if ingredients:
-                                            add_to_shopping_list(ingredients)
-                                            st.success(f"✅ Added {meal['title']} ingredients to shopping list!")
-                            else:
-                                st.write("No meal planned")
+        for day in st.session_state.meal_plan:
+            meal_plan_day(day, dates[day])
 
 # Add a small custom footer
 st.markdown("""
@@ -695,3 +781,5 @@ st.markdown("""
     Shared Skillet AI | Your personal AI cooking assistant
 </div>
 """, unsafe_allow_html=True)
+
+profiling_sidebar(profile)
@@ -1,14 +1,31 @@
 import streamlit as st
-import requests
-import json
 import pandas as pd
-import re
-from datetime import datetime
 from typing import Dict, List, Any
-import difflib
-from dataclasses import dataclass
 import logging
-import time
+import os
+
+from skillet.cache import SharedCache, open_cache
+from skillet.cassette import transport_from_env
+from skillet.catering import CateringOptimizer
+from skillet.euron import EURON_MODEL, EuronClient, requests_key
+from skillet.images import ThumbnailCache
+from skillet.ingredients import order_servings, order_shopping_list
+from skillet.intents import MENU_LOOKUP, MIN_CONFIDENCE, QUESTION, IntentRouter
+from skillet.limiter import RateLimiter
+from skillet.menu import MenuItem, MENU_BY_ID, MENU_ITEMS
+from skillet.models import Message, shopping_list_rows
+from skillet.planner import MealPlanner
+from skillet.prefetch import Prefetcher
+from skillet.profiles import AdaptiveProfiles
+from skillet.recommender import Recommender
+from skillet.search import MenuIndex, cached_menu_index
+from skillet.session import MemoryLimits, dedupe_by_id, keep_last, recent_messages, spill_messages
+from skillet.profiling import profiled
+from skillet.prompts import MENU_CONTEXT_K, kitchen_prompt, recipe_request
+from skillet.ui import (
+    menu_card_html, profiling_sidebar, rerun_fragment, session_id, show_prefetch_stats, show_queue_stats,
+    show_request_profiles, show_session_memory, start_profiling, timed_fragment
+)
 
 # Set up logging
 logging.basicConfig(
@@ -24,6 +41,7 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="collapsed"
 )
+profile = start_profiling()
 
 # Darker theme styling
 st.markdown("""
@@ -98,6 +116,17 @@ st.markdown("""
         background: linear-gradient(90deg, #5a5af5, #8a5af5);
     }
     
+    .menu-item-card img {
+        width: 100%;
+        max-width: 300px;
+        height: 200px;
+        object-fit: cover;
+        border-radius: 12px;
+        box-shadow: 0 4px 15px rgba(0,0,0,0.3);
+        display: block;
+        margin: 0 auto;
+    }
+    
     .price-badge {
         background: linear-gradient(135deg, #5a5af5 0%, #8a5af5 100%);
         color: #ffffff;
@@ -214,62 +243,34 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Data class for menu items
-@dataclass
-class MenuItem:
-    id: int
-    dish_name: str
-    category: str
-    taste_category: str
-    image_url: str
-    youtube_link: str
-    pricing: Dict[str, float]
-    serving_info: Dict[str, str]
-
-# Menu items database
-MENU_ITEMS = [
-    MenuItem(1, "Chicken Mandi", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Chicken+Mandi..jpg", "https://youtube.com/embed/B3IV5P-4PCk?si=Ql_EWzyo6hhQ6mp1", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"}),
-    MenuItem(2, "Kabuli Pulao", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Kabuli+Polao.jpg", "https://www.youtube.com/embed/ch8zl7V4ABo", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"}),
-    MenuItem(3, "Chicken Dum Biryani", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Chicken+Biryani.jpg", "https://www.youtube.com/embed/9CsloZe-ekI", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"}),
-    MenuItem(4, "Kebab Platter", "Appetizer", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Kabab+Platter..jpg", "https://www.youtube.com/embed/3ELfF5s8yz0", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"}),
-    MenuItem(5, "Chicken Kabsa", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Chicken+Kabsa.jpg", "", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"}),
-    MenuItem(6, "Chicken 65 Biryani", "Main", "Spicy", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Chicken+65+Biryani.jpg", "https://www.youtube.com/embed/jFh6NF7cVcE", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"}),
-    MenuItem(7, "Chicken Kofta Biryani", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Kofta+Biryani.jpg", "https://www.youtube.com/embed/Q1nDOX4lDuE", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"}),
-    MenuItem(8, "Beef Dum Biryani", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Beef+Dum+Biryani.jpg", "https://www.youtube.com/embed/qkiMa9Bke0M", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"}),
-    MenuItem(9, "Dubai Cheese Cake", "Dessert", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Dubai+Cheese+Cake.jpg", "https://www.youtube.com/embed/tVJtZBSp3Hw&t", {"full_tray": 94.99, "half_tray": 54.99, "per_serving": 7.99}, {"full_tray": "28-30 people", "half_tray": "12-15 people"}),
-    MenuItem(10, "Tiramisu", "Dessert", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Tiramisu.jpg", "https://www.youtube.com/embed/ens-bJaLuQQ", {"full_tray": 89.99, "half_tray": 49.99, "per_serving": 6.99}, {"full_tray": "28-30 people", "half_tray": "12-15 people"}),
-    MenuItem(11, "Mango Tiramisu", "Dessert", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Mango+Tiramisu.jpg", "https://drive.google.com/file/d/16rZwh15xVDdm2RE8LseEpjqSrCFdWPJi/preview", {"full_tray": 89.99, "half_tray": 49.99, "per_serving": 6.99}, {"full_tray": "28-30 people", "half_tray": "12-15 people"}),
-    MenuItem(12, "Butter Pound Cake", "Dessert", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Pound+Cake.jpg", "https://www.youtube.com/embed/luaEFTC78aQ", {"Whole Cake": 7.99}, {}),
-    MenuItem(13, "Malai Sheek Kebab (Beef/Chicken)", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Chicken+Malai+Sheek+Kebab.jpg", "https://www.youtube.com/embed/3Ci1Jr8cWn8&t", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"}),
-    MenuItem(14, "Egg Potato Cutlet", "Appetizer", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Egg+Potato+Cutlet.jpg", "https://www.youtube.com/embed/LjSN5QtdLmE", {"per count": 3.99}, {}),
-    MenuItem(15, "Shahi Malai Jorda", "Dessert", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Shahi+Malai+Jorda.jpg", "https://www.youtube.com/embed/GXS3UHmB6NM", {"full_tray": 90, "half_tray": 50, "per_serving": 9.99}, {"full_tray": "15-17 people", "half_tray": "5-6 people"}),
-    MenuItem(16, "Beef Tehari", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Beef+Tehari.jpg", "https://www.youtube.com/embed/3wwr5nW6af0", {"full_tray": 90, "half_tray": 39.99, "per_serving": 9.99}, {"full_tray": "15-17 people", "half_tray": "5-6 people"}),
-    MenuItem(17, "Chicken Roast", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Chicken+Roast.jpg", "https://www.youtube.com/embed/P56bYJXx8Ak", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"}),
-    MenuItem(18, "Pina colada (Non Alcoholic)", "Drinks", "Sweet and Refreshing", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Pina+Colada.jpg", "", {"per glass": 3}, {}),
-    MenuItem(19, "Mango Lassi", "Drinks", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Mango+Lassi.jpg", "", {"per glass": 4}, {}),
-    MenuItem(20, "Mint Lemon", "Drinks", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Mint+Lemon.jpg", "", {"per glass": 2}, {})
-]
-
-# Validate image URLs
-@st.cache_data
-def validate_image_urls():
-    for item in MENU_ITEMS:
-        try:
-            response = requests.head(item.image_url, timeout=5)
-            if response.status_code != 200:
-                item.image_url = f"https://via.placeholder.com/300x200?text={item.dish_name.replace(' ', '+')}"
-                logging.info(f"Replaced URL for {item.dish_name} with placeholder due to status {response.status_code}")
-        except Exception as e:
-            item.image_url = f"https://via.placeholder.com/300x200?text={item.dish_name.replace(' ', '+')}"
-            logging.error(f"Error for {item.dish_name}: {str(e)} - Replaced with placeholder")
-
-# Run URL validation at startup
-validate_image_urls()
+profile.mark("css")
+
+# Chat messages shown before "Load older messages", and menu cards per Menu Explorer page
+CHAT_WINDOW = 20
+MENU_PAGE_SIZE = 9
+# Per-session caps on chat history, recommendations and interaction history (SKILLET_MAX_* variables)
+MEMORY_LIMITS = MemoryLimits.from_env()
+
+# Responses, thumbnails and the menu index live in a cache shared by every worker
+@st.cache_resource
+def get_shared_cache() -> SharedCache:
+    return open_cache()
+
+# Thumbnails for menu photos, fetched once and served from the shared cache
+@st.cache_resource
+def get_thumbnail_cache() -> ThumbnailCache:
+    cache = ThumbnailCache(get_shared_cache())
+    cache.warm((item.image_url, item.dish_name) for item in MENU_ITEMS)
+    return cache
+
+get_thumbnail_cache()
+profile.mark("thumbnails")
 
 # Initialize session state
 if 'messages' not in st.session_state:
     st.session_state.messages = []
 if 'shopping_list' not in st.session_state:
+    # Menu item id -> servings to shop for; the ingredient list is derived from it
     st.session_state.shopping_list = {}
 if 'meal_plan' not in st.session_state:
     st.session_state.meal_plan = {}
@@ -285,6 +286,18 @@ if 'user_preferences' not in st.session_state:
     }
 if 'recommended_items' not in st.session_state:
     st.session_state.recommended_items = []
+if 'interaction_history' not in st.session_state:
+    st.session_state.interaction_history = []
+if 'recommendation_notes' not in st.session_state:
+    st.session_state.recommendation_notes = ""
+if 'chat_window' not in st.session_state:
+    st.session_state.chat_window = CHAT_WINDOW
+if 'spilled_messages' not in st.session_state:
+    # Older chat messages moved to the shared cache by enforce_memory_limits
+    st.session_state.spilled_messages = 0
+if 'menu_page' not in st.session_state:
+    st.session_state.menu_page = 0
+profile.mark("session_init")
 
 # Professional header
 st.markdown("""
@@ -296,238 +309,350 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # API Configuration
-EURON_API_URL = "https://api.euron.one/api/v1/euri/alpha/chat/completions"
-EURON_MODEL = "gemini-2.5-pro-exp-03-25"
-FALLBACK_MODEL = "gemini-pro"
-
 def get_euron_api_key():
     try:
         api_key = st.secrets["euron"]["api_key"]
         if not api_key:
             raise KeyError("API key is empty")
         return api_key
-    except (KeyError, TypeError) as e:
+    except (KeyError, TypeError, FileNotFoundError) as e:
         logging.error(f"Failed to load API key: {str(e)}")
         return None
 
-def call_euron_api(messages, temperature=0.7, max_tokens=1000, retries=3, initial_delay=2):
-    api_key = get_euron_api_key()
-    if not api_key:
-        logging.error("No API key available")
-        return "Error: API key not configured. Please check your Streamlit secrets."
-    
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
-    
-    # Try primary model first, then fallback
-    for model in [EURON_MODEL, FALLBACK_MODEL]:
-        payload = {
-            "messages": messages,
-            "model": model,
-            "max_tokens": max_tokens,
-            "temperature": temperature
-        }
-        logging.info(f"Sending API request with model {model}: {json.dumps(payload, indent=2)}")
-        
-        for attempt in range(retries):
-            try:
-                response = requests.post(EURON_API_URL, headers=headers, json=payload, timeout=5)
-                response.raise_for_status()
-                data = response.json()
-                logging.info(f"API response (model: {model}, attempt: {attempt+1}): {json.dumps(data, indent=2)}")
-                
-                # Flexible response parsing
-                if 'choices' in data and len(data['choices']) > 0:
-                    choice = data['choices'][0]
-                    if 'message' in choice and 'content' in choice['message']:
-                        return choice['message']['content'].strip()
-                    elif 'text' in choice:
-                        return choice['text'].strip()
-                    elif 'content' in choice:
-                        return choice['content'].strip()
-                logging.warning(f"No valid content in API response (model: {model}, attempt: {attempt+1})")
-                return "Error: No valid response content from API."
-            
-            except requests.exceptions.HTTPError as e:
-                logging.error(f"HTTP error (model: {model}, attempt: {attempt+1}): {str(e)} - Status: {e.response.status_code} - Response: {e.response.text}")
-                if e.response.status_code == 500 and attempt < retries - 1:
-                    delay = initial_delay * (2 ** attempt)
-                    logging.info(f"Retrying after {delay} seconds due to 500 error...")
-                    time.sleep(delay)
-                    continue
-                return f"Error: HTTP {e.response.status_code} - {e.response.text}"
-            
-            except requests.exceptions.Timeout:
-                logging.error(f"Request timed out after 5 seconds (model: {model}, attempt: {attempt+1})")
-                if attempt < retries - 1:
-                    delay = initial_delay * (2 ** attempt)
-                    logging.info(f"Retrying after {delay} seconds due to timeout...")
-                    time.sleep(delay)
-                    continue
-                return "Error: API request timed out after multiple attempts."
-            
-            except requests.exceptions.RequestException as e:
-                logging.error(f"Request error (model: {model}, attempt: {attempt+1}): {str(e)}")
-                return f"Error: Failed to connect to API - {str(e)}"
-            
-            except ValueError as e:
-                logging.error(f"JSON decode error (model: {model}, attempt: {attempt+1}): {str(e)} - Response: {response.text}")
-                return "Error: Invalid API response format."
-            
-            except Exception as e:
-                logging.error(f"Unexpected error (model: {model}, attempt: {attempt+1}): {str(e)}")
-                return f"Error: Unexpected issue - {str(e)}"
-    
-    return f"Error: Failed to get response with models {EURON_MODEL} and {FALLBACK_MODEL} after {retries} attempts."
+# One fair queue per worker: chat is served before extraction, and no session can
+# use more than its share of the global budget
+@st.cache_resource
+def get_rate_limiter() -> RateLimiter:
+    return RateLimiter(cache=get_shared_cache(), counter_key=requests_key)
+
+# Timeouts and max_tokens per kind of call, adapted to the latencies seen by this worker
+@st.cache_resource
+def get_request_profiles() -> AdaptiveProfiles:
+    return AdaptiveProfiles()
+
+@st.cache_resource
+def get_euron_client() -> EuronClient:
+    return EuronClient(get_euron_api_key, cache=get_shared_cache(), transport=transport_from_env(),
+                       limiter=get_rate_limiter(), profiles=get_request_profiles())
+
+# Likely next requests, sent in the background at the lowest priority; SKILLET_PREFETCH=0 turns it off
+@st.cache_resource
+def get_prefetcher() -> Prefetcher:
+    return Prefetcher(get_euron_client(), enabled=os.environ.get("SKILLET_PREFETCH", "1") != "0")
+
+@profiled("api_call")
+def call_euron_api(messages, purpose="chat"):
+    settings = get_request_profiles().settings(purpose)
+    get_prefetcher().observe(messages, settings.temperature, settings.max_tokens)
+    return get_euron_client().complete(messages, temperature=settings.temperature, max_tokens=settings.max_tokens,
+                                       session=session_id(), priority=settings.priority, purpose=purpose)
 
 # Smart menu search
+@st.cache_resource
+def get_menu_index() -> MenuIndex:
+    return cached_menu_index(MENU_ITEMS, get_shared_cache())
+
+@profiled("menu_search")
 def smart_menu_search(query: str, limit: int = 3) -> List[MenuItem]:
-    query_lower = query.lower()
-    scored_items = []
-    for item in MENU_ITEMS:
-        score = 0
-        if query_lower in item.dish_name.lower():
-            score += 90
-        if query_lower in item.category.lower():
-            score += 50
-        if query_lower in item.taste_category.lower():
-            score += 30
-        similarity = difflib.SequenceMatcher(None, query_lower, item.dish_name.lower()).ratio()
-        score += similarity * 40
-        keywords = ['chicken', 'beef', 'biryani', 'kebab', 'dessert', 'drink', 'cake', 'spicy', 'sweet', 'savory']
-        for keyword in keywords:
-            if keyword in query_lower and keyword in item.dish_name.lower():
-                score += 25
-        if score > 20:
-            scored_items.append((item, score))
-    scored_items.sort(key=lambda x: x[1], reverse=True)
-    return [item[0] for item in scored_items[:limit]]
+    return get_menu_index().hybrid_search(query, limit=limit)
+
+@st.cache_resource
+def get_recommender() -> Recommender:
+    return Recommender(get_menu_index())
+
+@st.cache_resource
+def get_meal_planner() -> MealPlanner:
+    return MealPlanner(get_recommender())
+
+@st.cache_resource
+def get_catering_optimizer() -> CateringOptimizer:
+    return CateringOptimizer()
+
+@st.cache_resource
+def get_intent_router() -> IntentRouter:
+    return IntentRouter()
+
+# Remember which dishes the user engaged with, most recent last
+def record_interaction(items: List[MenuItem]):
+    st.session_state.interaction_history.extend(item.id for item in items)
+    keep_last(st.session_state.interaction_history, MEMORY_LIMITS.history)
+
+# Keep this session within MEMORY_LIMITS: old messages go to the shared cache, and
+# recommendations and interaction history keep their newest entries
+def enforce_memory_limits():
+    st.session_state.spilled_messages = spill_messages(
+        st.session_state.messages, get_shared_cache(), session_id(), st.session_state.spilled_messages, MEMORY_LIMITS
+    )
+    st.session_state.recommended_items = dedupe_by_id(st.session_state.recommended_items, MEMORY_LIMITS.recommended)
+    keep_last(st.session_state.interaction_history, MEMORY_LIMITS.history)
 
 def display_menu_item(item: MenuItem, show_video: bool = True):
+    header_html, pricing_html = menu_card_html(item)
     with st.container():
-        st.markdown(f"""
-        <div class="menu-item-card">
-            <div style="display: flex; align-items: center; margin-bottom: 10px;">
-                <h3 style="margin: 0; flex-grow: 1;">{item.dish_name}</h3>
-                <span class="category-badge">{item.category}</span>
-                <span class="category-badge" style="background: linear-gradient(135deg, #ff9a9e 0%, #ff6b6b 100%); color: #ffffff;">{item.taste_category}</span>
-            </div>
-            <div style="display: flex; gap: 10px;">
-                <div style="flex: 1; max-width: 300px;">
-        """, unsafe_allow_html=True)
-        try:
-            st.image(
-                item.image_url,
-                use_container_width=False,
-                width=300,
-                caption=f"{item.dish_name} Image",
-                output_format="JPEG",
-                clamp=True,
-                channels="RGB"
-            )
-            st.markdown("""
-            <style>
-                .menu-item-card img {
-                    width: 100%;
-                    max-width: 300px;
-                    height: 200px;
-                    object-fit: cover;
-                    border-radius: 12px;
-                    box-shadow: 0 4px 15px rgba(0,0,0,0.3);
-                    display: block;
-                    margin: 0 auto;
-                }
-            </style>
-            """, unsafe_allow_html=True)
-        except Exception as e:
-            st.warning(f"Failed to load image for {item.dish_name}: {str(e)}")
-            st.image(
-                f"https://via.placeholder.com/300x200?text={item.dish_name.replace(' ', '+')}",
-                use_container_width=False,
-                width=300,
-                caption="Image Not Available"
-            )
-            st.markdown("""
-            <style>
-                .menu-item-card img {
-                    width: 100%;
-                    max-width: 300px;
-                    height: 200px;
-                    object-fit: cover;
-                    border-radius: 12px;
-                    box-shadow: 0 4px 15px rgba(0,0,0,0.3);
-                    display: block;
-                    margin: 0 auto;
-                }
-            </style>
-            """, unsafe_allow_html=True)
-        st.markdown("""
-                </div>
-                <div style="flex: 1;">
-                    <h4>Pricing Options:</h4>
-        """, unsafe_allow_html=True)
-        for option, price in item.pricing.items():
-            serving_info = item.serving_info.get(option, "")
-            st.markdown(f'<span class="price-badge">{option.replace("_", " ").title()}: ${price} {serving_info}</span>', unsafe_allow_html=True)
-        st.markdown("</div></div>", unsafe_allow_html=True)
+        st.markdown(header_html, unsafe_allow_html=True)
+        st.image(
+            get_thumbnail_cache().get(item.image_url, item.dish_name),
+            width=300,
+            caption=f"{item.dish_name} Image"
+        )
+        st.markdown(pricing_html, unsafe_allow_html=True)
         col1, col2, col3 = st.columns(3)
         with col1:
             if st.button(f"Get Recipe for {item.dish_name}", key=f"recipe_{item.id}"):
-                st.session_state.messages.append({
-                    "role": "user",
-                    "content": f"Please provide a detailed recipe for {item.dish_name}, including ingredients, step-by-step instructions, and cooking tips."
-                })
+                record_interaction([item])
+                st.session_state.messages.append(Message("user", recipe_prompt(item)))
                 st.session_state.current_tab = "AI Assistant"
                 st.rerun()
         with col2:
+            options = [option for option in item.pricing if order_servings(item, option)]
+            option = st.selectbox("Size", options, key=f"shop_option_{item.id}",
+                                  format_func=lambda o: f"{o.replace('_', ' ').title()} ({order_servings(item, o)} servings)")
+            count = st.number_input("How many", min_value=1, max_value=50, value=1, step=1, key=f"shop_count_{item.id}")
             if st.button(f"Add to Shopping List", key=f"shop_{item.id}"):
-                st.session_state.shopping_list[item.dish_name] = [f"Ingredients for {item.dish_name} (to be detailed)"]
-                st.success(f"✅ {item.dish_name} ingredients concept added to shopping list!")
+                record_interaction([item])
+                servings = order_servings(item, option, int(count))
+                st.session_state.shopping_list[item.id] = st.session_state.shopping_list.get(item.id, 0) + servings
+                st.success(f"✅ Ingredients for {servings} servings of {item.dish_name} added to shopping list!")
         with col3:
             if item.youtube_link and st.button(f"Watch Video", key=f"video_{item.id}"):
                 st.video(item.youtube_link)
-        st.markdown("</div>", unsafe_allow_html=True)
 
+@profiled("prompt_build")
 def generate_enhanced_system_message(purpose="general", relevant_menu_items=None):
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    prefs = st.session_state.user_preferences
-    menu_context = ""
-    if relevant_menu_items:
-        menu_context = f"""
-        PRIORITY MENU ITEMS (Always suggest these first when relevant):
-        {chr(10).join([f"- {item.dish_name} ({item.category}, {item.taste_category})" for item in relevant_menu_items])}
-        These are authentic, professional dishes from Shared Skillet. Always prioritize recommending these items when they match the user's request.
-        """
-    base_system_message = f"""
-    You are an expert culinary AI assistant for Shared Skillet, specializing in authentic Bangladeshi and South Asian cuisine. 
-    Today is {current_date}.
-    Current user preferences:
-    - Cooking Style: {prefs["cooking_style"]}
-    - Expertise Level: {prefs["expertise_level"]}
-    - Dietary Restrictions: {', '.join(prefs["dietary_restrictions"]) if prefs["dietary_restrictions"] else "None"}
-    - Spice Level: {prefs["spice_level"]}
-    - Serving Size: {prefs["serving_size"]}
-    {menu_context}
-    CORE GUIDELINES:
-    1. ALWAYS check if user requests match our menu items first
-    2. If menu items are relevant, present them as the primary recommendation
-    3. Only suggest generic/alternative recipes if no menu items match
-    4. Provide detailed, professional cooking instructions
-    5. Include ingredient substitutions and cooking tips
-    6. Emphasize food safety and proper techniques
-    7. Adapt complexity to user's expertise level
-    8. Respect dietary restrictions and preferences
-    RESPONSE STYLE:
-    - Professional yet friendly tone
-    - Clear, step-by-step instructions
-    - Include cooking times, temperatures, and yields
-    - Provide cultural context for traditional dishes
-    - Suggest presentation and serving tips
-    Always prioritize Shared Skillet's authentic menu items over generic suggestions.
-    """
-    return base_system_message
+    return kitchen_prompt(st.session_state.user_preferences, purpose, relevant_menu_items)
+
+def recipe_prompt(item: MenuItem) -> str:
+    return recipe_request(item.dish_name)
+
+# Intent and menu matches for a chat prompt; general cooking questions skip the menu lookup
+def route_prompt(prompt: str):
+    route = get_intent_router().route(prompt)
+    relevant_items = [] if route.intent == QUESTION else smart_menu_search(prompt, limit=MENU_CONTEXT_K)
+    return route, relevant_items
+
+# Menu lookups are answered straight from the catalog, without an API call
+def answered_from_menu(route, relevant_items: List[MenuItem]) -> bool:
+    return route.intent == MENU_LOOKUP and route.confidence >= MIN_CONFIDENCE and bool(relevant_items)
+
+def chat_messages(prompt: str, relevant_items: List[MenuItem]) -> List[Dict[str, str]]:
+    system_message = generate_enhanced_system_message(purpose="recipe_request", relevant_menu_items=relevant_items)
+    return [{"role": "system", "content": system_message}, {"role": "user", "content": prompt}]
+
+# Warm the response cache for "Get Recipe" on the cards just shown, built exactly as
+# chat_view would build the request once the button is clicked
+def prefetch_recipes(items: List[MenuItem]):
+    settings = get_request_profiles().settings("chat")
+    for item in items:
+        prompt = recipe_prompt(item)
+        route, relevant_items = route_prompt(prompt)
+        if not answered_from_menu(route, relevant_items):
+            get_prefetcher().submit(session_id(), chat_messages(prompt, relevant_items), settings.temperature,
+                                    settings.max_tokens, purpose="chat")
+
+# Chat log and input; a new message only reruns this fragment
+@timed_fragment
+def chat_view():
+    hidden = st.session_state.spilled_messages + len(st.session_state.messages) - st.session_state.chat_window
+    if hidden > 0 and st.button(f"Load older messages ({hidden} hidden)", key="load_older"):
+        st.session_state.chat_window += CHAT_WINDOW
+        rerun_fragment()
+    for message in recent_messages(st.session_state.messages, st.session_state.chat_window, get_shared_cache(),
+                                   session_id(), st.session_state.spilled_messages, MEMORY_LIMITS):
+        with st.chat_message(message.role):
+            st.write(message.content)
+    
+    prompt = st.chat_input("Ask about our menu, get recipes, or culinary advice...")
+    if prompt:
+        st.session_state.messages.append(Message("user", prompt))
+        with st.chat_message("user"):
+            st.write(prompt)
+    elif st.session_state.messages and st.session_state.messages[-1].role == "user":
+        # Asked from a menu card's "Get Recipe" button and already shown above
+        prompt = st.session_state.messages[-1].content
+    if prompt:
+        with st.chat_message("assistant"):
+            with st.spinner("Analyzing your request and searching our menu..."):
+                route, relevant_items = route_prompt(prompt)
+                if relevant_items:
+                    st.markdown("### 🎯 From Our Professional Menu:")
+                    cols = st.columns(min(len(relevant_items[:2]), 2))
+                    for idx, item in enumerate(relevant_items[:2]):
+                        with cols[idx]:
+                            display_menu_item(item, show_video=False)
+                    st.markdown("---")
+                
+                if answered_from_menu(route, relevant_items):
+                    # Menu lookups are answered straight from the catalog, without an API call
+                    answer = "Here's what we have on our menu for you:\n"
+                    answer += "\n".join([
+                        f"- **{item.dish_name}**: {item.category}, {item.taste_category} ("
+                        + ", ".join(f"{option.replace('_', ' ').title()} ${price}" for option, price in item.pricing.items()) + ")"
+                        for item in relevant_items
+                    ])
+                    st.markdown(answer)
+                    st.session_state.messages.append(Message("assistant", answer))
+                    st.session_state.recommended_items = relevant_items
+                    record_interaction(relevant_items[:2])
+                    prefetch_recipes(relevant_items[:2])
+                else:
+                    st.markdown("### 👨‍🍳 AI-Powered Response:")
+                    response = call_euron_api(chat_messages(prompt, relevant_items))
+                
+                    # Log API status
+                    if response.startswith("Error:"):
+                        st.session_state.last_api_status = response
+                        st.warning(f"{response}\n\nPlease try again later or contact the API provider for assistance.")
+                        # Fallback response using smart_menu_search
+                        if relevant_items:
+                            fallback = f"Sorry, I couldn't fetch a detailed response due to a server error. Based on your query, I recommend checking out these dishes from our menu:\n"
+                            fallback += "\n".join([f"- **{item.dish_name}**: {item.category}, {item.taste_category}" for item in relevant_items])
+                            st.markdown(fallback)
+                            st.session_state.messages.append(Message("assistant", fallback))
+                        else:
+                            st.markdown("No relevant menu items found. Please try a different query or wait for the API to stabilize.")
+                            st.session_state.messages.append(Message("assistant", "No relevant menu items found due to API issues."))
+                    else:
+                        st.session_state.last_api_status = f"Success: API returned valid response with model {EURON_MODEL}"
+                        st.markdown(response)
+                        st.session_state.messages.append(Message("assistant", response))
+                        # Dishes the answer names, however it spells them, lead Smart Recommendations
+                        mentioned = get_menu_index().resolver.mentions(response)
+                        st.session_state.recommended_items = dedupe_by_id(mentioned + relevant_items,
+                                                                          MEMORY_LIMITS.recommended)
+                        record_interaction(relevant_items[:2])
+                        prefetch_recipes(relevant_items[:2])
+        enforce_memory_limits()
+
+# Menu Explorer search, filters and card grid
+@timed_fragment
+def menu_explorer_grid():
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        search_query = st.text_input("Search menu...", "")
+    with col2:
+        category_filter = st.selectbox("Category", ["All"] + sorted(set(item.category for item in MENU_ITEMS)))
+    with col3:
+        taste_filter = st.selectbox("Taste", ["All"] + sorted(set(item.taste_category for item in MENU_ITEMS)))
+    filtered_items = MENU_ITEMS
+    if search_query:
+        filtered_items = smart_menu_search(search_query, limit=len(MENU_ITEMS))
+    if category_filter != "All":
+        filtered_items = [item for item in filtered_items if item.category == category_filter]
+    if taste_filter != "All":
+        filtered_items = [item for item in filtered_items if item.taste_category == taste_filter]
+    # Back to the first page whenever the filters change
+    filters = (search_query, category_filter, taste_filter)
+    if st.session_state.get("menu_filters") != filters:
+        st.session_state.menu_filters = filters
+        st.session_state.menu_page = 0
+    page_count = max(1, -(-len(filtered_items) // MENU_PAGE_SIZE))
+    page = min(st.session_state.menu_page, page_count - 1)
+    page_items = filtered_items[page * MENU_PAGE_SIZE:(page + 1) * MENU_PAGE_SIZE]
+    for i in range(0, len(page_items), 3):
+        cols = st.columns(3, gap="medium")
+        for j, item in enumerate(page_items[i:i+3]):
+            with cols[j]:
+                display_menu_item(item)
+    if page_count > 1:
+        prev_col, label_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            if st.button("◀ Previous", key="menu_prev", disabled=page == 0):
+                st.session_state.menu_page = page - 1
+                rerun_fragment()
+        with label_col:
+            st.markdown(f"<p style='text-align: center;'>Page {page + 1} of {page_count}</p>", unsafe_allow_html=True)
+        with next_col:
+            if st.button("Next ▶", key="menu_next", disabled=page == page_count - 1):
+                st.session_state.menu_page = page + 1
+                rerun_fragment()
+
+# Cheapest tray and serving mix for an event
+@timed_fragment
+def catering_calculator():
+    with st.expander("🧮 Catering Calculator", expanded=False):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            names = st.multiselect("Dishes for your event", [item.dish_name for item in MENU_ITEMS], key="catering_dishes")
+        with col2:
+            guests = st.number_input("Guests", min_value=1, max_value=10000, value=25, step=1, key="catering_guests")
+        if names:
+            selected = [item for item in MENU_ITEMS if item.dish_name in names]
+            order = get_catering_optimizer().optimize(selected, int(guests))
+            st.dataframe(pd.DataFrame(order.rows()), hide_index=True, use_container_width=True)
+            st.markdown(f"**Estimated total: ${order.total_cost:,.2f}** for {int(guests)} guests "
+                        f"(tray sizes counted at the low end of their serving range)")
+
+# Shopping list rows
+@timed_fragment
+def shopping_list_view():
+    if not st.session_state.shopping_list:
+        st.info("Your shopping list is empty. Add items from the Menu Explorer or AI Assistant!")
+    else:
+        orders = [(MENU_BY_ID[item_id], servings) for item_id, servings in st.session_state.shopping_list.items()]
+        st.markdown("### Dishes")
+        for item, servings in orders:
+            dish_col, remove_col = st.columns([4, 1])
+            with dish_col:
+                st.markdown(f"- **{item.dish_name}**: {servings} servings")
+            with remove_col:
+                if st.button("Remove", key=f"unshop_{item.id}"):
+                    del st.session_state.shopping_list[item.id]
+                    rerun_fragment()
+        shopping_list = order_shopping_list(orders)
+        st.markdown('<div class="shopping-list">', unsafe_allow_html=True)
+        for category, ingredients in shopping_list.items():
+            st.markdown(f"### {category.capitalize()}")
+            for ingredient in ingredients:
+                st.markdown(f"- {ingredient}")
+        st.markdown('</div>', unsafe_allow_html=True)
+        st.download_button("Download CSV", pd.DataFrame(shopping_list_rows(shopping_list)).to_csv(index=False),
+                           file_name="shopping_list.csv", mime="text/csv")
+        if st.button("Clear Shopping List"):
+            st.session_state.shopping_list = {}
+            st.success("✅ Shopping list cleared!")
+            rerun_fragment()
+
+# Meal plan generator and current plan
+@timed_fragment
+def meal_plan_view():
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        days = st.slider("Select number of days to plan", 1, 7, 3)
+    with col2:
+        meals_per_day = st.selectbox("Meals per day", [1, 2, 3], index=1)
+    describe = st.checkbox("Add dish descriptions with AI", value=False)
+    if st.button("Generate Meal Plan"):
+        # The plan itself is built locally from the menu; the LLM only describes it
+        prefs = st.session_state.user_preferences
+        plan = get_meal_planner().plan(prefs, days=days, meals_per_day=meals_per_day,
+                                       history_ids=st.session_state.interaction_history)
+        st.session_state.meal_plan = {"plan": plan.to_markdown()}
+        if describe:
+            with st.spinner("Describing your meal plan..."):
+                system_message = generate_enhanced_system_message(purpose="meal_plan")
+                prompt = f"""
+                Write one appetizing sentence for each day of this meal plan. Do not change the dishes.
+                {st.session_state.meal_plan['plan']}
+                """
+                api_messages = [{"role": "system", "content": system_message}, {"role": "user", "content": prompt}]
+                response = call_euron_api(api_messages, purpose="descriptions")
+            if response.startswith("Error:"):
+                st.warning("Couldn't add descriptions right now; your plan is ready below.")
+            else:
+                st.session_state.meal_plan["notes"] = response
+    if st.session_state.meal_plan.get("plan"):
+        st.markdown('<div class="meal-plan">', unsafe_allow_html=True)
+        st.markdown("### Current Meal Plan")
+        st.markdown(st.session_state.meal_plan["plan"])
+        if st.session_state.meal_plan.get("notes"):
+            st.markdown(st.session_state.meal_plan["notes"])
+        st.markdown('</div>', unsafe_allow_html=True)
+        if st.button("Clear Meal Plan"):
+            st.session_state.meal_plan = {}
+            st.success("✅ Meal plan cleared!")
+            rerun_fragment()
+
+enforce_memory_limits()
 
 # Tab system
 tab_container = st.container()
@@ -591,6 +716,10 @@ if st.session_state.current_tab == "AI Assistant":
         st.write("API call details will appear here after a query.")
         if 'last_api_status' in st.session_state:
             st.markdown(f"**Last API Call Status**: {st.session_state.last_api_status}")
+        show_queue_stats(get_rate_limiter())
+        show_request_profiles(get_request_profiles())
+        show_prefetch_stats(get_prefetcher())
+        show_session_memory(st.session_state, MEMORY_LIMITS, shared=MENU_ITEMS)
     
     if not st.session_state.messages:
         st.markdown("""
@@ -607,135 +736,28 @@ if st.session_state.current_tab == "AI Assistant":
         - "Create a traditional Bangladeshi meal plan"
         - "I have chicken and rice, what can you suggest?"
         """)
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": "Hello! I'm your Shared Skillet AI assistant. I specialize in authentic Bangladeshi and South Asian cuisine, and I have access to our curated menu of professional dishes. What would you like to cook today? 🍳"
-        })
-    
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.write(message["content"])
+        st.session_state.messages.append(Message(
+            "assistant",
+            "Hello! I'm your Shared Skillet AI assistant. I specialize in authentic Bangladeshi and South Asian cuisine, and I have access to our curated menu of professional dishes. What would you like to cook today? 🍳"
+        ))
     
-    prompt = st.chat_input("Ask about our menu, get recipes, or culinary advice...")
-    if prompt:
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        with st.chat_message("user"):
-            st.write(prompt)
-        with st.chat_message("assistant"):
-            with st.spinner("Analyzing your request and searching our menu..."):
-                relevant_items = smart_menu_search(prompt, limit=5)
-                if relevant_items:
-                    st.markdown("### 🎯 From Our Professional Menu:")
-                    cols = st.columns(min(len(relevant_items[:2]), 2))
-                    for idx, item in enumerate(relevant_items[:2]):
-                        with cols[idx]:
-                            display_menu_item(item, show_video=False)
-                    st.markdown("---")
-                
-                st.markdown("### 👨‍🍳 AI-Powered Response:")
-                system_message = generate_enhanced_system_message(purpose="recipe_request", relevant_menu_items=relevant_items)
-                api_messages = [{"role": "system", "content": system_message}, {"role": "user", "content": prompt}]
-                response = call_euron_api(api_messages)
-                
-                # Log API status
-                if response.startswith("Error:"):
-                    st.session_state.last_api_status = response
-                    st.warning(f"{response}\n\nPlease try again later or contact the API provider for assistance.")
-                    # Fallback response using smart_menu_search
-                    if relevant_items:
-                        fallback = f"Sorry, I couldn't fetch a detailed response due to a server error. Based on your query, I recommend checking out these dishes from our menu:\n"
-                        fallback += "\n".join([f"- **{item.dish_name}**: {item.category}, {item.taste_category}" for item in relevant_items])
-                        st.markdown(fallback)
-                        st.session_state.messages.append({"role": "assistant", "content": fallback})
-                    else:
-                        st.markdown("No relevant menu items found. Please try a different query or wait for the API to stabilize.")
-                        st.session_state.messages.append({"role": "assistant", "content": "No relevant menu items found due to API issues."})
-                else:
-                    st.session_state.last_api_status = f"Success: API returned valid response with model {EURON_MODEL}"
-                    st.markdown(response)
-                    st.session_state.messages.append({"role": "assistant", "content": response})
-                    st.session_state.recommended_items = relevant_items
+    chat_view()
 
 elif st.session_state.current_tab == "Menu Explorer":
     st.markdown("## 📋 Menu Explorer")
     st.markdown("Explore our curated selection of authentic Bangladeshi and South Asian dishes.")
-    col1, col2, col3 = st.columns([2, 1, 1])
-    with col1:
-        search_query = st.text_input("Search menu...", "")
-    with col2:
-        category_filter = st.selectbox("Category", ["All"] + sorted(set(item.category for item in MENU_ITEMS)))
-    with col3:
-        taste_filter = st.selectbox("Taste", ["All"] + sorted(set(item.taste_category for item in MENU_ITEMS)))
-    filtered_items = MENU_ITEMS
-    if search_query:
-        filtered_items = smart_menu_search(search_query, limit=len(MENU_ITEMS))
-    if category_filter != "All":
-        filtered_items = [item for item in filtered_items if item.category == category_filter]
-    if taste_filter != "All":
-        filtered_items = [item for item in filtered_items if item.taste_category == taste_filter]
-    for i in range(0, len(filtered_items), 3):
-        cols = st.columns(3, gap="medium")
-        for j, item in enumerate(filtered_items[i:i+3]):
-            with cols[j]:
-                display_menu_item(item)
+    menu_explorer_grid()
+    catering_calculator()
 
 elif st.session_state.current_tab == "Shopping List":
     st.markdown("## 🛒 Shopping List")
     st.markdown("Manage ingredients needed for your selected dishes.")
-    if not st.session_state.shopping_list:
-        st.info("Your shopping list is empty. Add items from the Menu Explorer or AI Assistant!")
-    else:
-        st.markdown('<div class="shopping-list">', unsafe_allow_html=True)
-        for dish_name, items in st.session_state.shopping_list.items():
-            st.markdown(f"### {dish_name}")
-            for item in items:
-                st.markdown(f"- {item}")
-        st.markdown('</div>', unsafe_allow_html=True)
-        if st.button("Clear Shopping List"):
-            st.session_state.shopping_list = {}
-            st.success("✅ Shopping list cleared!")
-            st.rerun()
+    shopping_list_view()
 
 elif st.session_state.current_tab == "Meal Planning":
     st.markdown("## 📅 Meal Planning")
     st.markdown("Plan your meals with our AI-powered suggestions.")
-    col1, col2 = st.columns([2, 1])
-    with col1:
-        days = st.slider("Select number of days to plan", 1, 7, 3)
-    with col2:
-        meals_per_day = st.selectbox("Meals per day", [1, 2, 3], index=1)
-    if st.button("Generate Meal Plan"):
-        with st.spinner("Creating your personalized meal plan..."):
-            system_message = generate_enhanced_system_message(purpose="meal_plan")
-            prompt = f"""
-            Create a {days}-day meal plan with {meals_per_day} meals per day, 
-            respecting the following preferences:
-            - Cuisine: {st.session_state.user_preferences['cooking_style']}
-            - Spice Level: {st.session_state.user_preferences['spice_level']}
-            - Dietary Restrictions: {', '.join(st.session_state.user_preferences['dietary_restrictions'])}
-            - Serving Size: {st.session_state.user_preferences['serving_size']}
-            Prioritize dishes from our menu: {', '.join([item.dish_name for item in MENU_ITEMS])}.
-            Format the response as a clear, structured plan with day-wise meal assignments.
-            """
-            api_messages = [{"role": "system", "content": system_message}, {"role": "user", "content": prompt}]
-            response = call_euron_api(api_messages)
-            if response.startswith("Error:"):
-                st.warning(f"{response}\n\nPlease try again later or contact the API provider.")
-                st.session_state.meal_plan = {"plan": "Failed to generate meal plan due to API server error."}
-            else:
-                st.session_state.meal_plan = {"plan": response}
-                st.markdown('<div class="meal-plan">', unsafe_allow_html=True)
-                st.markdown(response)
-                st.markdown('</div>', unsafe_allow_html=True)
-    if st.session_state.meal_plan.get("plan"):
-        st.markdown('<div class="meal-plan">', unsafe_allow_html=True)
-        st.markdown("### Current Meal Plan")
-        st.markdown(st.session_state.meal_plan["plan"])
-        st.markdown('</div>', unsafe_allow_html=True)
-        if st.button("Clear Meal Plan"):
-            st.session_state.meal_plan = {}
-            st.success("✅ Meal plan cleared!")
-            st.rerun()
+    meal_plan_view()
 
 elif st.session_state.current_tab == "Smart Recommendations":
     st.markdown("## ✨ Smart Recommendations")
@@ -750,32 +772,33 @@ elif st.session_state.current_tab == "Smart Recommendations":
             with cols[idx]:
                 display_menu_item(item, show_video=False)
         st.markdown('</div>', unsafe_allow_html=True)
-        if st.button("Get More Recommendations"):
-            with st.spinner("Generating new recommendations..."):
-                system_message = generate_enhanced_system_message(purpose="recommendations")
+    if st.session_state.recommendation_notes:
+        st.markdown(st.session_state.recommendation_notes)
+    if st.button("Get More Recommendations" if st.session_state.recommended_items else "Get Recommendations"):
+        prefs = st.session_state.user_preferences
+        current_ids = [item.id for item in st.session_state.recommended_items]
+        new_recommendations = [item for item, _ in get_recommender().recommend(
+            prefs, history_ids=st.session_state.interaction_history, exclude_ids=current_ids, k=3)]
+        if new_recommendations:
+            # The LLM only explains the locally ranked picks; the picks stand if the API is down
+            with st.spinner("Explaining your new recommendations..."):
+                system_message = generate_enhanced_system_message(purpose="recommendations", relevant_menu_items=new_recommendations)
                 prompt = f"""
-                Suggest 3 additional dishes from our menu that complement the user's preferences:
-                - Cuisine: {st.session_state.user_preferences['cooking_style']}
-                - Spice Level: {st.session_state.user_preferences['spice_level']}
-                - Dietary Restrictions: {', '.join(st.session_state.user_preferences['dietary_restrictions'])}
-                - Serving Size: {st.session_state.user_preferences['serving_size']}
-                Current recommendations: {', '.join([item.dish_name for item in st.session_state.recommended_items])}.
-                Avoid repeating current recommendations.
+                In one short sentence each, explain why these dishes from our menu suit the user:
+                {', '.join([item.dish_name for item in new_recommendations])}.
+                Consider their preferences:
+                - Cuisine: {prefs['cooking_style']}
+                - Spice Level: {prefs['spice_level']}
+                - Dietary Restrictions: {', '.join(prefs['dietary_restrictions'])}
+                - Serving Size: {prefs['serving_size']}
                 """
                 api_messages = [{"role": "system", "content": system_message}, {"role": "user", "content": prompt}]
-                response = call_euron_api(api_messages)
-                if response.startswith("Error:"):
-                    st.warning(f"{response}\n\nPlease try again later or contact the API provider.")
-                else:
-                    new_dish_names = re.findall(r'\b[\w\s]+\b', response)
-                    new_recommendations = []
-                    for dish_name in new_dish_names:
-                        for item in MENU_ITEMS:
-                            if dish_name.lower() in item.dish_name.lower() and item not in st.session_state.recommended_items:
-                                new_recommendations.append(item)
-                                break
-                    if new_recommendations:
-                        st.session_state.recommended_items.extend(new_recommendations[:3])
-                        st.rerun()
-                    else:
-                        st.warning("No new recommendations found. Try adjusting your preferences!")
+                response = call_euron_api(api_messages, purpose="recommendations")
+            st.session_state.recommendation_notes = "" if response.startswith("Error:") else response
+            st.session_state.recommended_items = dedupe_by_id(new_recommendations + st.session_state.recommended_items,
+                                                              MEMORY_LIMITS.recommended)
+            st.rerun()
+        else:
+            st.warning("No new recommendations found. Try adjusting your preferences!")
+
+profiling_sidebar(profile)
@@ -0,0 +1,82 @@
+"""Aggregation throughput (lists per second) and peak memory as the number of lists grows.
+
+Synthetic records mix LLM-style shopping lists in assorted units, app1 dish orders and
+weekly meal plans. The streaming Aggregator is compared with loading every record and
+folding it in with merge_shopping_list, as the apps do for a single session.
+
+Run from the repository root: python -m benchmarks.bench_aggregate
+"""
+import gzip
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_replay import MEALS, PANTRY
+from skillet.aggregate import Aggregator, iter_records
+from skillet.menu import MENU_ITEMS
+from skillet.models import DAYS, merge_shopping_list, parse_shopping_list
+
+SIZES = (1000, 5000, 20000)
+UNITS = {"meat": ["lb", "g", "kg", "oz"], "dairy": ["cup", "ml", "tbsp"], "spices": ["tsp", "tbsp", "pinch"],
+         "pantry": ["cup", "g", "lb"], "produce": ["", "piece", "g"]}
+
+
+def synthetic_record(rng):
+    roll = rng.random()
+    if roll < 0.6:
+        return {"shopping_list": {category: [{"item": rng.choice(items), "quantity": rng.choice(["1", "2", "1/2", "250"]),
+                                              "unit": rng.choice(UNITS[category])} for _ in range(rng.randint(1, 4))]
+                                  for category, items in PANTRY.items()}}
+    if roll < 0.85:
+        return {"orders": {str(rng.choice(MENU_ITEMS).id): rng.choice([5, 10, 15, 30]) for _ in range(rng.randint(1, 5))}}
+    return {"meal_plan": {day: {meal: {"title": rng.choice(MEALS + [item.dish_name for item in MENU_ITEMS[:6]])}
+                                for meal in ("breakfast", "lunch", "dinner")} for day in DAYS},
+            "servings": rng.randint(2, 6)}
+
+
+def write_records(path, count, seed=0):
+    rng = random.Random(seed)
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for _ in range(count):
+            f.write(json.dumps(synthetic_record(rng)) + "\n")
+
+
+def load_and_merge(path):
+    records = list(iter_records([path]))
+    shopping_list = {}
+    for record in records:
+        if "shopping_list" in record:
+            merge_shopping_list(shopping_list, parse_shopping_list(record["shopping_list"]))
+    return shopping_list
+
+
+# (result, seconds, peak MB); timing and memory come from separate runs since
+# tracemalloc slows allocation-heavy code several times over
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in SIZES:
+            path = os.path.join(tmp, f"records_{count}.jsonl.gz")
+            write_records(path, count)
+            aggregator, elapsed, peak = measure(lambda p: Aggregator().consume([p]), path)
+            _, naive_elapsed, naive_peak = measure(load_and_merge, path)
+            print(f"{count:6d} lists ({os.path.getsize(path) / 1e6:.1f} MB gzip): "
+                  f"streaming {count / elapsed:8.0f} lists/s, peak {peak:6.2f} MB, {len(aggregator.totals)} totals | "
+                  f"load all + merge_shopping_list {count / naive_elapsed:8.0f} lists/s, peak {naive_peak:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Work done by several app workers with per-process caches versus the shared cache.
+
+Each worker process answers the same mix of requests. A miss costs a simulated LLM
+call; with a shared backend a response computed by one worker is a hit for the others.
+Redis is exercised against the in-process stand-in in benchmarks/redis_standin.py.
+
+Run from the repository root: python -m benchmarks.bench_cache
+"""
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.redis_standin import RedisStandIn
+from skillet.cache import open_cache
+
+WORKERS = 4
+REQUESTS = 300
+UNIQUE = 60
+LLM_SECONDS = 0.005
+
+
+def worker(url, seed):
+    cache = open_cache(url)
+    rng = random.Random(seed)
+    computes = 0
+
+    def compute():
+        nonlocal computes
+        computes += 1
+        time.sleep(LLM_SECONDS)
+        return b"response" * 100
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        cache.get_or_set(f"bench:{rng.randrange(UNIQUE)}", compute, ttl=60)
+        cache.incr(f"bench:requests:{seed % 2}", ttl=60)
+    return computes, time.perf_counter() - start
+
+
+def run(url):
+    with multiprocessing.get_context("spawn").Pool(WORKERS) as pool:
+        results = pool.starmap(worker, [(url, seed) for seed in range(WORKERS)])
+    computes = sum(count for count, _ in results)
+    seconds = max(elapsed for _, elapsed in results)
+    return computes, seconds
+
+
+def latency(url, rounds=2000):
+    cache = open_cache(url)
+    cache.set("bench:latency", b"x" * 512)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        cache.get("bench:latency")
+    get_us = (time.perf_counter() - start) / rounds * 1e6
+    start = time.perf_counter()
+    for _ in range(rounds):
+        cache.incr("bench:counter")
+    incr_us = (time.perf_counter() - start) / rounds * 1e6
+    return get_us, incr_us
+
+
+def main():
+    server = RedisStandIn()
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            "memory (per process)": "memory://",
+            "sqlite (shared file)": f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}",
+            "redis (stand-in)": server.url,
+        }
+        print(f"{WORKERS} workers x {REQUESTS} requests over {UNIQUE} unique keys, "
+              f"{LLM_SECONDS * 1000:.0f} ms per miss")
+        for name, url in backends.items():
+            computes, seconds = run(url)
+            print(f"  {name:22} computes {computes:4d}  (unique {UNIQUE}, no sharing {WORKERS * UNIQUE})  "
+                  f"wall {seconds * 1000:6.0f} ms")
+
+        print("\nSingle-process latency (us per op)")
+        for name, url in backends.items():
+            get_us, incr_us = latency(url)
+            print(f"  {name:22} get {get_us:7.1f}  incr {incr_us:7.1f}")
+    server.close()
+
+
+if __name__ == "__main__":
+    main()
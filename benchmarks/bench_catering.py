@@ -0,0 +1,64 @@
+"""Catering optimizer latency and savings versus ordering one pricing option per dish.
+
+Run from the repository root: python -m benchmarks.bench_catering
+"""
+import math
+import time
+
+from benchmarks.bench_search import synthetic_catalog
+from skillet.catering import CateringOptimizer, min_cost_mix, serving_options
+from skillet.menu import MENU_ITEMS
+
+
+# Cheapest order that uses a single pricing option per dish
+def single_option_cost(item, guests):
+    return min(math.ceil(guests / serves) * price for _, price, serves in serving_options(item))
+
+
+# Plain-Python DP over every capacity, used as the reference for min_cost_mix
+def reference_cost(options, guests):
+    size = guests + max(serves for _, _, serves in options)
+    cost = [0.0] + [math.inf] * (size - 1)
+    for capacity in range(1, size):
+        for _, price, serves in options:
+            if serves <= capacity and cost[capacity - serves] + price < cost[capacity]:
+                cost[capacity] = cost[capacity - serves] + price
+    return min(cost[guests:])
+
+
+def main():
+    print("Real menu, all dishes")
+    optimizer = CateringOptimizer()
+    for guests in (10, 25, 60, 150, 500):
+        order = optimizer.optimize(MENU_ITEMS, guests)
+        single = sum(single_option_cost(item, guests) for item in MENU_ITEMS)
+        print(f"  {guests:>4} guests: optimized ${order.total_cost:>10,.2f}  single option ${single:>10,.2f}  "
+              f"saved {1 - order.total_cost / single:5.1%}")
+
+    print("\nReference check (mixed price sheets)")
+    mismatches = 0
+    for item in MENU_ITEMS:
+        options = serving_options(item)
+        for guests in (1, 7, 33, 101, 499):
+            mismatches += abs(min_cost_mix(options, guests)[0] - round(reference_cost(options, guests), 2)) > 0.01
+    print(f"  mismatches: {mismatches}")
+
+    print("\nLatency (ms), cold optimizer per run")
+    items = synthetic_catalog(500)
+    for guests in (100, 1000, 5000):
+        start = time.perf_counter()
+        CateringOptimizer().optimize(items, guests)
+        cold_ms = (time.perf_counter() - start) * 1000
+        sheet = serving_options(items[0])
+        start = time.perf_counter()
+        min_cost_mix(sheet, guests)
+        solve_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        reference_cost(sheet, guests)
+        reference_ms = (time.perf_counter() - start) * 1000
+        print(f"  500 dishes x {guests:>4} guests: {cold_ms:7.2f}  "
+              f"(one price sheet: numpy {solve_ms:6.2f}, pure python {reference_ms:7.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Accuracy and latency of dish-name resolution on misspelled and transliterated names.
+
+Names: each labeled query is resolved to one dish by difflib.get_close_matches over the
+dish names (what the old fuzzy search compared against) and by DishResolver.resolve.
+Answers: dishes named in LLM-style answers, found by the old recommendation parsing
+(regex fragments checked as substrings of each dish name) and by DishResolver.mentions.
+Latency is per lookup, on the menu and on larger synthetic catalogs.
+
+Run from the repository root: python -m benchmarks.bench_dishes
+"""
+import difflib
+import re
+import time
+
+from benchmarks.bench_search import synthetic_catalog
+from skillet.dishes import DishResolver
+from skillet.menu import MENU_ITEMS
+
+# misspelled or transliterated name -> id of the dish meant
+MISSPELLINGS = {
+    "chiken mandi": 1,
+    "kabuli polao": 2,
+    "kabuli pilau": 2,
+    "chicken dum biriyani": 3,
+    "chicken biriani dum": 3,
+    "kabab platter": 4,
+    "kebabs platter": 4,
+    "chicken kapsa": 5,
+    "chicken 65 briyani": 6,
+    "kofta biriyani": 7,
+    "chicken kufta biryani": 7,
+    "beef dum biriyani": 8,
+    "dubai cheesecake": 9,
+    "dubai chese cake": 9,
+    "tiramasu": 10,
+    "tirami su": 10,
+    "mango tiramisu": 11,
+    "buttar pound cake": 12,
+    "malai seekh kebab": 13,
+    "chicken malai sheekh kabab": 13,
+    "beef malai seek kebab": 13,
+    "egg potato cutlets": 14,
+    "shahi malai zarda": 15,
+    "shahi jorda": 15,
+    "beef tehri": 16,
+    "beef tehary": 16,
+    "chicken rost": 17,
+    "piña colada": 18,
+    "pinacolada": 18,
+    "mango lasi": 19,
+    "mango lassie": 19,
+    "mint lemon juice": 20,
+    "lemon mint": 20,
+}
+
+# LLM-style answer -> ids of the dishes it names, in order
+ANSWERS = {
+    "For a party of ten I'd go with the Chicken Kofta Biriyani and a tray of Beef Tehri.": [7, 16],
+    "Try the Malai Seekh Kebab (Chicken) as a starter, then Kabuli Polao.": [13, 2],
+    "1. Chicken 65 Biryani - fiery\n2. Mango Lassi - cooling\n3. Tiramisu": [6, 19, 10],
+    "Our Dubai cheese-cake pairs well with a Pina Colada (non-alcoholic).": [9, 18],
+    "The beef dum biriyani is slow cooked; the chicken roast is milder.": [8, 17],
+    "You might enjoy Shahi Malai Jorda or the Mango Tiramisu for dessert.": [15, 11],
+    "A Kebab Platter and some Egg Potato Cutlets make a good spread.": [4, 14],
+    "Nothing on our menu is vegan, but lentil soup is easy to make at home.": [],
+}
+
+
+def difflib_resolve(items, names, query):
+    match = difflib.get_close_matches(query.lower(), names, n=1, cutoff=0.6)
+    return items[names.index(match[0])] if match else None
+
+
+# The old recommendation parsing: every regex fragment, first dish name containing it
+def regex_mentions(text):
+    found = []
+    for fragment in re.findall(r'\b[\w\s]+\b', text):
+        for item in MENU_ITEMS:
+            if fragment.lower() in item.dish_name.lower() and item.id not in found:
+                found.append(item.id)
+                break
+    return found
+
+
+def per_lookup_us(fn, queries, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            fn(query)
+    return (time.perf_counter() - start) / (repeat * len(queries)) * 1e6
+
+
+def main():
+    resolver = DishResolver(MENU_ITEMS)
+    names = [item.dish_name.lower() for item in MENU_ITEMS]
+    old = sum(getattr(difflib_resolve(MENU_ITEMS, names, q), "id", None) == dish for q, dish in MISSPELLINGS.items())
+    misses = [q for q, dish in MISSPELLINGS.items()
+              if [item.id for item, _ in resolver.resolve(q, 1)] != [dish]]
+    print(f"Names ({len(MISSPELLINGS)} labeled misspellings): difflib {old / len(MISSPELLINGS):.2f}, "
+          f"resolver {1 - len(misses) / len(MISSPELLINGS):.2f} correct at top 1"
+          + (f" (missed: {', '.join(misses)})" if misses else ""))
+
+    exact = {"regex": 0, "resolver": 0}
+    for text, dishes in ANSWERS.items():
+        exact["regex"] += regex_mentions(text) == dishes
+        exact["resolver"] += [item.id for item in resolver.mentions(text)] == dishes
+    print(f"Answers ({len(ANSWERS)} labeled): exact dish list from regex fragments {exact['regex']}, "
+          f"resolver {exact['resolver']}")
+
+    print("\nLatency per lookup (us)")
+    queries = list(MISSPELLINGS)
+    for size in (20, 1000, 10000):
+        items = MENU_ITEMS if size == 20 else synthetic_catalog(size)
+        start = time.perf_counter()
+        resolver = DishResolver(items)
+        build_ms = (time.perf_counter() - start) * 1000
+        names = [item.dish_name.lower() for item in items]
+        repeat = 20 if size == 20 else 1
+        difflib_us = per_lookup_us(lambda q: difflib_resolve(items, names, q), queries, repeat)
+        cold_us = per_lookup_us(lambda q: resolver.resolve(q), queries, 1)
+        warm_us = per_lookup_us(lambda q: resolver.resolve(q), queries, repeat)
+        print(f"  {size:>6} items: build={build_ms:7.1f} ms  difflib={difflib_us:9.1f}  "
+              f"resolver cold={cold_us:7.1f}  warm={warm_us:7.1f}")
+    answers = list(ANSWERS)
+    print(f"  mentions per answer: regex {per_lookup_us(regex_mentions, answers, 50):7.1f}  "
+          f"resolver {per_lookup_us(DishResolver(MENU_ITEMS).mentions, answers, 50):7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Upstream API calls per chat turn, regex/always-call baseline vs the local intent router.
+
+Replays a labeled prompt corpus through both policies and reports router accuracy,
+classification latency, the local preference extractor's escalation rate and the
+number of Euron API calls each turn would dispatch.
+
+Run from the repository root: python -m benchmarks.bench_intents
+"""
+import re
+import time
+
+from skillet.intents import (
+    CHAT_CALL, MENU_LOOKUP, MIN_CONFIDENCE, PREFERENCES_CALL, QUESTION, IntentRouter, plan_calls,
+)
+from skillet.preferences import PreferenceExtractor
+
+# The option lists from app.py's preference widgets
+COOKING_STYLES = ["General", "Bangladeshi", "Italian", "Mexican", "Asian", "Mediterranean", "Indian", "French", "American", "Vegetarian", "Vegan"]
+EXPERTISE_LEVELS = ["Beginner", "Intermediate", "Advanced", "Professional"]
+DIETARY_OPTIONS = ["Gluten-Free", "Dairy-Free", "Nut-Free", "Vegetarian", "Vegan", "Low-Carb", "Low-Sugar", "Keto", "Paleo"]
+
+CORPUS = [
+    ("Give me a chicken karahi recipe", "recipe"),
+    ("What can I make with lentils and spinach?", "recipe"),
+    ("How do I make naan at home", "recipe"),
+    ("quick breakfast ideas with eggs", "recipe"),
+    ("I want to cook fish curry tonight, how?", "recipe"),
+    ("show me a step by step recipe for khichuri", "recipe"),
+    ("How long do I rest a steak?", "question"),
+    ("Can I use yogurt instead of sour cream?", "question"),
+    ("What is the smoke point of mustard oil", "question"),
+    ("why is my dough not rising", "question"),
+    ("is it safe to eat rice left out overnight", "question"),
+    ("Add this recipe to my shopping list", "add_to_list"),
+    ("add the ingredients to my grocery list", "add_to_list"),
+    ("please put these ingredients on my shopping list", "add_to_list"),
+    ("what do i need to buy for this?", "add_to_list"),
+    ("Create a weekly keto meal plan for a beginner", "meal_plan"),
+    ("make a meal plan for next week", "meal_plan"),
+    ("can you plan my meals for 7 days", "meal_plan"),
+    ("generate a vegetarian weekly menu", "meal_plan"),
+    ("I'm vegan", "preference_update"),
+    ("I am a beginner cook", "preference_update"),
+    ("I don't eat dairy anymore", "preference_update"),
+    ("I am allergic to nuts", "preference_update"),
+    ("I prefer mediterranean food", "preference_update"),
+    ("I'm not vegetarian anymore", "preference_update"),
+    ("I'm allergic to shellfish", "preference_update"),
+    ("Show me your best biryani recipes", "menu_lookup"),
+    ("What desserts do you recommend?", "menu_lookup"),
+    ("do you have anything with mango", "menu_lookup"),
+    ("how much is a full tray of chicken mandi", "menu_lookup"),
+    ("what drinks do you offer", "menu_lookup"),
+    ("I want to order kebabs for a party", "menu_lookup"),
+]
+
+# app.py before the router: preferences + chat on every turn, plus regex-triggered calls
+SHOPPING_RE = re.compile(r"add (this|these|the) (recipe|ingredients) to (my )?(shopping|grocery) list")
+MEAL_PLAN_RE = re.compile(r"(create|make|generate) (a )?(meal|weekly|menu) plan")
+
+
+def baseline_app_calls(prompt):
+    text = prompt.lower()
+    return 2 + bool(SHOPPING_RE.search(text)) + bool(MEAL_PLAN_RE.search(text))
+
+
+# Preference extraction only reaches the API when the local extractor escalates
+def routed_app_calls(route, prompt, extractor):
+    calls = plan_calls(route)
+    if PREFERENCES_CALL in calls and not extractor.extract(prompt).needs_llm:
+        return len(calls) - 1
+    return len(calls)
+
+
+def routed_app1_calls(route):
+    if route.intent == MENU_LOOKUP and route.confidence >= MIN_CONFIDENCE:
+        return 0
+    return 1
+
+
+def main():
+    router = IntentRouter()
+    routes = [router.route(prompt) for prompt, _ in CORPUS]
+    correct = sum(route.intent == label for route, (_, label) in zip(routes, CORPUS))
+    print(f"Router accuracy: {correct}/{len(CORPUS)} ({correct / len(CORPUS):.0%})")
+    for route, (prompt, label) in zip(routes, CORPUS):
+        if route.intent != label:
+            print(f"  miss: {prompt!r} -> {route.intent} ({route.confidence:.2f}), expected {label}")
+
+    repeat = 200
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for prompt, _ in CORPUS:
+            router.route(prompt)
+    per_prompt_us = (time.perf_counter() - start) / (repeat * len(CORPUS)) * 1e6
+    print(f"Routing latency: {per_prompt_us:.1f} us/prompt")
+
+    extractor = PreferenceExtractor(COOKING_STYLES, EXPERTISE_LEVELS, DIETARY_OPTIONS)
+    turns = len(CORPUS)
+    old_app = sum(baseline_app_calls(prompt) for prompt, _ in CORPUS)
+    new_app = sum(routed_app_calls(route, prompt, extractor) for route, (prompt, _) in zip(routes, CORPUS))
+    new_chat = sum(CHAT_CALL in plan_calls(route) for route in routes)
+    print("\nUpstream calls per turn")
+    print(f"  app.py : baseline {old_app / turns:.2f}  router {new_app / turns:.2f}  "
+          f"(chat completions {turns} -> {new_chat})")
+    new_app1 = sum(routed_app1_calls(route) for route in routes)
+    skipped_search = sum(route.intent == QUESTION for route in routes)
+    print(f"  app1.py: baseline {1:.2f}  router {new_app1 / turns:.2f}  "
+          f"(menu searches skipped for {skipped_search} questions)")
+
+    print(f"\nPreference extraction: {extractor.messages} turns, {extractor.escalated} escalated to the LLM "
+          f"({extractor.escalation_rate:.0%})")
+    every_turn = PreferenceExtractor(COOKING_STYLES, EXPERTISE_LEVELS, DIETARY_OPTIONS)
+    for prompt, label in CORPUS:
+        signals = every_turn.extract(prompt)
+        if label == "preference_update" and signals.needs_llm:
+            print(f"  escalated: {prompt!r} ({'; '.join(signals.reasons)})")
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for prompt, _ in CORPUS:
+            every_turn.extract(prompt)
+    per_prompt_us = (time.perf_counter() - start) / (repeat * len(CORPUS)) * 1e6
+    print(f"  extraction latency: {per_prompt_us:.1f} us/prompt")
+
+
+if __name__ == "__main__":
+    main()
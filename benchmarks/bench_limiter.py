@@ -0,0 +1,85 @@
+"""Fairness and queue wait of the API rate limiter under a burst from one heavy session.
+
+One session fires a burst of extraction requests (as "Add to Shopping List" per meal
+does) while three light sessions chat. An upstream that allows UPSTREAM_LIMIT requests
+per second answers 429 above it. Rates are scaled up so the run takes a few seconds.
+
+Run from the repository root: python -m benchmarks.bench_limiter
+"""
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from skillet.limiter import Priority, RateLimited, RateLimiter
+
+UPSTREAM_LIMIT = 40
+HEAVY_BURST = 120
+LIGHT_SESSIONS = 3
+LIGHT_REQUESTS = 10
+
+
+class Upstream:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.window = defaultdict(int)
+
+    def call(self) -> bool:
+        with self.lock:
+            second = int(time.monotonic())
+            self.window[second] += 1
+            return self.window[second] <= UPSTREAM_LIMIT
+
+
+def run(limiter):
+    upstream = Upstream()
+    latencies = defaultdict(list)
+    throttled = defaultdict(int)
+    lock = threading.Lock()
+
+    def send(session, priority, gap):
+        for _ in range(HEAVY_BURST if session == "heavy" else LIGHT_REQUESTS):
+            start = time.perf_counter()
+            try:
+                if limiter is not None:
+                    limiter.acquire(session, priority, max_wait=10)
+                ok = upstream.call()
+            except RateLimited:
+                ok = False
+            with lock:
+                latencies[session].append(time.perf_counter() - start)
+                throttled[session] += not ok
+            time.sleep(gap)
+
+    threads = [threading.Thread(target=send, args=("heavy", Priority.EXTRACTION, 0.0))]
+    threads += [threading.Thread(target=send, args=(f"light{i}", Priority.CHAT, 0.1)) for i in range(LIGHT_SESSIONS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, throttled, time.perf_counter() - start
+
+
+def main():
+    configs = {
+        "no limiter": None,
+        "token bucket + fair queue": RateLimiter(global_rate=30, global_burst=10, session_rate=20, session_burst=5,
+                                                 per_minute=None),
+    }
+    for name, limiter in configs.items():
+        latencies, throttled, seconds = run(limiter)
+        print(f"{name} ({seconds:.1f} s)")
+        for session in sorted(latencies):
+            waits = np.array(latencies[session]) * 1000
+            print(f"  {session:7} requests {len(waits):4d}  upstream 429s {throttled[session]:4d}  "
+                  f"wait p50 {np.percentile(waits, 50):7.1f} ms  p95 {np.percentile(waits, 95):7.1f} ms")
+        if limiter is not None:
+            for priority, stats in limiter.stats().items():
+                print(f"  stats {priority:10} granted {stats['granted']:4d}  rejected {stats['rejected']:3d}  "
+                      f"p95 {stats['wait_p95_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
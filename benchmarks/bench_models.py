@@ -0,0 +1,54 @@
+"""Memory and merge cost of dict records vs the slotted models in skillet.models.
+
+Run from the repository root: python -m benchmarks.bench_models
+"""
+import time
+import tracemalloc
+
+from skillet.models import Ingredient, Message, Quantity, Unit
+
+N = 20000
+
+
+def dict_merge(existing, new):
+    # The old add_to_shopping_list path: strings re-parsed on every merge
+    if existing["unit"] == new["unit"]:
+        existing["quantity"] = str(float(existing["quantity"]) + float(new["quantity"]))
+
+
+def allocated(build):
+    tracemalloc.start()
+    records = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, size / len(records)
+
+
+def main():
+    print(f"Bytes per record ({N} records)")
+    _, dict_messages = allocated(lambda: [{"role": "user", "content": f"m{i}"} for i in range(N)])
+    _, slot_messages = allocated(lambda: [Message("user", f"m{i}") for i in range(N)])
+    print(f"  message    : dict {dict_messages:6.0f}  slotted {slot_messages:6.0f}")
+    _, dict_items = allocated(lambda: [{"item": f"item {i}", "quantity": "1.5", "unit": "cup"} for i in range(N)])
+    _, slot_items = allocated(lambda: [Ingredient(f"item {i}", Quantity(1.5, Unit.CUP), "pantry")
+                                       for i in range(N)])
+    print(f"  ingredient : dict {dict_items:6.0f}  slotted {slot_items:6.0f}")
+
+    print("\nMerging the same ingredient N times (ms)")
+    existing = {"item": "rice", "quantity": "1", "unit": "cup"}
+    new = {"item": "rice", "quantity": "0.5", "unit": "cup"}
+    start = time.perf_counter()
+    for _ in range(N):
+        dict_merge(existing, new)
+    dict_ms = (time.perf_counter() - start) * 1000
+    total = Ingredient.from_json({"item": "rice", "quantity": "1", "unit": "cup"})
+    addition = Ingredient.from_json({"item": "rice", "quantity": "0.5", "unit": "cup"})
+    start = time.perf_counter()
+    for _ in range(N):
+        total = total.merged(addition)
+    slot_ms = (time.perf_counter() - start) * 1000
+    print(f"  dict + float(): {dict_ms:6.1f}  Ingredient.merged: {slot_ms:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Serialization time and bytes on the wire for one API round trip, before and after.
+
+Before: the cache key and the body were encoded with the stdlib encoder (the body by
+requests' json=), and the payload and response were pretty-printed into the log on every
+request. After: compact bytes from dumps() (orjson when installed) and a one-line log
+summary. Response sizes compare a plain body with the gzip (and br, when brotli is
+installed) encodings the client now asks for.
+
+Typical is a short chat; long is the full history of a 40-turn session as app.py sends it.
+
+Run from the repository root: python -m benchmarks.bench_payload
+"""
+import gzip
+import json
+import timeit
+
+from skillet import euron
+from skillet.euron import dumps
+from skillet.prompts import assistant_prompt
+
+PREFS = {"cooking_style": "Bangladeshi", "expertise_level": "Intermediate", "dietary_restrictions": ["Halal"]}
+QUESTION = "How do I make a beef tehari for {n} people that isn't too spicy?"
+ANSWER = ("Beef tehari for {n} – a Dhaka favourite\n\n**Ingredients**\n- 1 kg beef, cut into 3 cm cubes\n"
+          "- 500 g kalijira rice, washed and soaked 30 minutes\n- 3 onions, thinly sliced\n- ½ cup mustard oil\n"
+          "- 1 tbsp ginger paste, 1 tbsp garlic paste\n- 2 bay leaves, 4 green cardamoms, 1 cinnamon stick\n\n"
+          "**Steps**\n1. Marinate the beef with yogurt, ginger, garlic and salt for an hour.\n"
+          "2. Fry the onions in oil until deep golden; set half aside for garnish.\n"
+          "3. Add the whole spices and beef, sear on high heat for 5 minutes, then cover and cook on low for "
+          "45 minutes until tender.\n4. Stir in the drained rice, add 750 ml hot water, and simmer covered for "
+          "20 minutes.\n5. Rest 10 minutes, fluff, and garnish with the fried onions and green chillies.\n\n"
+          "**Tips**: keep the heat gentle after adding rice so the bottom doesn't burn; for less heat, deseed "
+          "the chillies. Food safety: cook the beef to at least 71 °C and refrigerate leftovers within 2 hours.")
+MODELS = (euron.EURON_MODEL, euron.FALLBACK_MODEL)
+
+
+def conversation(turns):
+    messages = [{"role": "system", "content": assistant_prompt(PREFS, today="2025-05-01")}]
+    for n in range(turns):
+        messages += [{"role": "user", "content": QUESTION.format(n=n + 2)},
+                     {"role": "assistant", "content": ANSWER.format(n=n + 2)}]
+    messages.append({"role": "user", "content": QUESTION.format(n=turns + 2)})
+    return messages
+
+
+def response_body(messages):
+    return {"id": "chatcmpl-1", "model": euron.EURON_MODEL, "choices": [
+        {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": ANSWER.format(n=4)}}],
+        "usage": {"prompt_tokens": sum(len(m["content"]) for m in messages) // 4, "completion_tokens": 320}}
+
+
+def before(messages, data):
+    key = json.dumps([list(MODELS), messages, 0.7, 1000], sort_keys=True).encode()
+    payload = {"messages": messages, "model": MODELS[0], "max_tokens": 1000, "temperature": 0.7}
+    body = json.dumps(payload, allow_nan=False).encode("utf-8")  # what requests does with json=
+    log = (f"Sending API request with model {MODELS[0]}: {json.dumps(payload, indent=2)}"
+           f"API response (model: {MODELS[0]}, attempt: 1): {json.dumps(data, indent=2)}")
+    return key, body, log
+
+
+def after(messages, data):
+    key = dumps([list(MODELS), messages, 0.7, 1000], sort_keys=True)
+    payload = {"messages": messages, "model": MODELS[0], "max_tokens": 1000, "temperature": 0.7}
+    body = dumps(payload)
+    log = f"Sending API request with model {MODELS[0]}: {len(messages)} messages"
+    return key, body, log
+
+
+def stdlib_after(messages, data):
+    orjson, euron.orjson = euron.orjson, None
+    try:
+        return after(messages, data)
+    finally:
+        euron.orjson = orjson
+
+
+def per_call_us(func, *args, number=200):
+    return min(timeit.repeat(lambda: func(*args), number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+    print(f"orjson: {'yes' if euron.orjson is not None else 'no'}, Accept-Encoding: {euron.ACCEPT_ENCODING}")
+    for name, turns in (("typical", 3), ("long", 40)):
+        messages = conversation(turns)
+        data = response_body(messages)
+        _, old_body, old_log = before(messages, data)
+        _, new_body, new_log = after(messages, data)
+        times = {label: per_call_us(func, messages, data)
+                 for label, func in (("before", before), ("stdlib compact", stdlib_after), ("after", after))}
+        print(f"{name} ({len(messages)} messages): encode + log per request "
+              + ", ".join(f"{label} {us:8.1f} us" for label, us in times.items())
+              + f" ({times['before'] / times['after']:.1f}x)")
+        print(f"    request body {len(old_body):7d} -> {len(new_body):7d} bytes, "
+              f"log {len(old_log.encode()):7d} -> {len(new_log.encode()):3d} bytes per request")
+        raw = json.dumps(data).encode()
+        compressed = f"gzip {len(gzip.compress(raw, 6)):5d}"
+        if brotli is not None:
+            compressed += f", br {len(brotli.compress(raw)):5d}"
+        print(f"    response body {len(raw):5d} bytes -> {compressed} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Latency and constraint checks for the offline meal planner.
+
+Builds 7-day, 3-meal plans on the real menu and on synthetic catalogs, and reports
+planning time, distinct dishes used, same-day repeats and dietary violations.
+
+Run from the repository root: python -m benchmarks.bench_planner
+"""
+import time
+
+from benchmarks.bench_search import synthetic_catalog
+from skillet.menu import MENU_ITEMS
+from skillet.planner import MealPlanner
+from skillet.recommender import Recommender
+from skillet.search import MenuIndex
+
+PROFILES = {
+    "default": {"cooking_style": "Bangladeshi", "spice_level": "Medium", "dietary_restrictions": [],
+                "serving_size": "4-6 people"},
+    "vegetarian, mild": {"cooking_style": "Bangladeshi", "spice_level": "Mild",
+                         "dietary_restrictions": ["Vegetarian"], "serving_size": "2-3 people"},
+    "low-carb party": {"cooking_style": "Middle Eastern", "spice_level": "Spicy",
+                       "dietary_restrictions": ["Low-Carb"], "serving_size": "Large party (15+ people)"},
+}
+
+
+def check(plan, recommender, prefs):
+    allowed = recommender.allowed_mask(prefs["dietary_restrictions"])
+    positions = recommender.positions
+    dishes = [dish for meals in plan.days for meal in meals for dish in meal.dishes]
+    violations = sum(not allowed[positions[dish.item.id]] for dish in dishes)
+    repeats = 0
+    for meals in plan.days:
+        ids = [dish.item.id for meal in meals for dish in meal.dishes]
+        repeats += len(ids) - len(set(ids))
+    return len(dishes), len({dish.item.id for dish in dishes}), repeats, violations
+
+
+def main():
+    print("7 days x 3 meals")
+    for size in (20, 1000, 10000, 100000):
+        items = MENU_ITEMS if size == 20 else synthetic_catalog(size)
+        start = time.perf_counter()
+        recommender = Recommender(MenuIndex(items))
+        planner = MealPlanner(recommender)
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"  {size:>6} items (index + planner build {build_ms:.0f} ms)")
+        for name, prefs in PROFILES.items():
+            repeat = 5
+            start = time.perf_counter()
+            for _ in range(repeat):
+                plan = planner.plan(prefs, days=7, meals_per_day=3)
+            plan_ms = (time.perf_counter() - start) / repeat * 1000
+            dishes, distinct, repeats, violations = check(plan, recommender, prefs)
+            print(f"    {name:<18} {plan_ms:7.2f} ms  dishes={dishes:>2} distinct={distinct:>2} "
+                  f"same-day repeats={repeats} diet violations={violations} cost=${plan.total_cost:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Follow-up latency, hit rate and extra upstream calls with speculative prefetch.
+
+Each simulated session has one chat turn that shows two menu cards. With probability
+CLICK_RATE the user then asks for the recipe of one of them after a think time. The
+upstream answers every request after UPSTREAM_SECONDS.
+
+Run from the repository root: python -m benchmarks.bench_prefetch
+"""
+import json
+import random
+import threading
+import time
+
+import numpy as np
+import requests
+
+from skillet.cache import MemoryCache
+from skillet.euron import EuronClient
+from skillet.limiter import Priority, RateLimiter
+from skillet.prefetch import Prefetcher
+
+SESSIONS = 40
+CLICK_RATE = 0.6
+UPSTREAM_SECONDS = 0.15
+THINK_SECONDS = (0.1, 1.0)
+
+
+def fake_upstream(counter):
+    lock = threading.Lock()
+
+    def post(url, **kwargs):
+        with lock:
+            counter[0] += 1
+        time.sleep(UPSTREAM_SECONDS)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"choices": [{"message": {"content": "A recipe"}}]}).encode()
+        response.encoding = "utf-8"
+        return response
+
+    return post
+
+
+def recipe_messages(dish):
+    return [{"role": "system", "content": "You are a chef."},
+            {"role": "user", "content": f"Please provide a detailed recipe for {dish}"}]
+
+
+def session(client, prefetcher, rng, name, latencies):
+    client.complete([{"role": "user", "content": f"{name}: something spicy"}], session=name)
+    cards = [f"Dish {rng.randrange(60)}", f"Dish {rng.randrange(60)}"]
+    if prefetcher is not None:
+        for dish in cards:
+            prefetcher.submit(name, recipe_messages(dish))
+    time.sleep(rng.uniform(*THINK_SECONDS))
+    if rng.random() < CLICK_RATE:
+        messages = recipe_messages(rng.choice(cards))
+        start = time.perf_counter()
+        if prefetcher is not None:
+            prefetcher.observe(messages)
+        client.complete(messages, session=name, priority=Priority.CHAT)
+        latencies.append(time.perf_counter() - start)
+
+
+def run(prefetch, seed=0):
+    upstream_calls = [0]
+    limiter = RateLimiter(global_rate=50, global_burst=20, session_rate=5, session_burst=4, per_minute=None)
+    client = EuronClient(lambda: "key", cache=MemoryCache(), transport=fake_upstream(upstream_calls),
+                         limiter=limiter, retries=1)
+    prefetcher = Prefetcher(client, workers=4, max_pending=8) if prefetch else None
+    latencies = []
+    threads = [threading.Thread(target=session, args=(client, prefetcher, random.Random(seed + i), f"s{i}", latencies))
+               for i in range(SESSIONS)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.03)
+    for thread in threads:
+        thread.join()
+    return np.array(latencies) * 1000, upstream_calls[0], prefetcher.stats() if prefetcher else None
+
+
+def main():
+    print(f"{SESSIONS} sessions, {CLICK_RATE:.0%} click a card, upstream {UPSTREAM_SECONDS * 1000:.0f} ms")
+    for prefetch in (False, True):
+        latencies, calls, stats = run(prefetch)
+        print(f"  prefetch {'on ' if prefetch else 'off'}: follow-ups {len(latencies):3d}  "
+              f"p50 {np.percentile(latencies, 50):6.1f} ms  p95 {np.percentile(latencies, 95):6.1f} ms  "
+              f"upstream calls {calls}")
+        if stats:
+            print(f"    issued {stats['issued']}, completed {stats['completed']}, hits {stats['hits']} "
+                  f"({stats['late_hits']} still in flight), hit rate {stats['hit_rate']:.0%}, "
+                  f"cancelled {stats['cancelled']}, skipped {stats['skipped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Prompt size and build time before and after the compact prompt builders in skillet.prompts.
+
+The "before" builders are the apps' previous system messages, kept verbatim. Prompt
+tokens are estimated at CHARS_PER_TOKEN characters each; upstream latency grows with
+them, and every chat, extraction and description call pays for the system message.
+The second table shows how the menu context grows with the catalog: listing every dish
+name (as the old meal-plan prompt did) versus app1's chat path, where the top-k dishes
+from hybrid search go into kitchen_prompt as a table under the token budget.
+
+Run from the repository root: python -m benchmarks.bench_prompts
+"""
+import time
+
+from benchmarks.bench_search import synthetic_catalog
+from skillet.menu import MENU_ITEMS
+from skillet.prompts import MENU_CONTEXT_K, assistant_prompt, estimate_tokens, kitchen_prompt
+from skillet.search import MenuIndex
+
+TODAY = "2025-01-01"
+ASSISTANT_PREFS = {"cooking_style": "Bangladeshi", "expertise_level": "Intermediate",
+                   "dietary_restrictions": ["Nut-Free"]}
+KITCHEN_PREFS = dict(ASSISTANT_PREFS, spice_level="Medium", serving_size="4-6 people")
+CATALOG_SIZES = (20, 200, 2000, 20000)
+
+
+def legacy_assistant_prompt(prefs, purpose="general", today=TODAY):
+    current_date = today
+    
+    cooking_style = prefs["cooking_style"]
+    expertise_level = prefs["expertise_level"]
+    diet_string = ", ".join(prefs["dietary_restrictions"]) if prefs["dietary_restrictions"] else "No specific dietary restrictions"
+    
+    base_system_message = f"""
+    You are a specialized cooking assistant with expertise in various cuisines and cooking techniques. 
+    Today is {current_date}.
+    
+    Current preferences:
+    - Cooking Style Focus: {cooking_style}
+    - Expertise Level: {expertise_level}
+    - Dietary Restrictions: {diet_string}
+    
+    Guidelines:
+    1. Provide clear, step-by-step cooking instructions when sharing recipes
+    2. Suggest ingredient substitutions when appropriate, especially for dietary restrictions
+    3. Explain cooking techniques at the appropriate level
+    4. Include cooking times, temperatures, and yields where relevant
+    5. Offer tips for food preparation, storage, and safety
+    
+    Always prioritize food safety and proper handling techniques in your advice.
+    
+    The user can:
+    - Ask for recipes
+    - Add recipes to their shopping list by saying "add this to my shopping list"
+    - Request a meal plan by asking for one
+    - Ask cooking questions
+    
+    Help the user accomplish their cooking goals regardless of their experience level.
+    """
+    
+    if purpose == "shopping_list":
+        return base_system_message + """
+        For extracting shopping list ingredients:
+        1. Extract ingredients from the recipe in a structured format
+        2. Group ingredients by category (produce, dairy, meat, pantry items, etc.)
+        3. Specify quantities and units clearly
+        4. Format your response as a JSON object with the following structure:
+        {
+            "produce": [{"item": "tomato", "quantity": "2", "unit": "medium"}],
+            "dairy": [{"item": "milk", "quantity": "1", "unit": "cup"}],
+            "meat": [],
+            "pantry": [],
+            "spices": [],
+            "other": []
+        }
+        Only respond with the JSON. Do not include any explanations or additional text.
+        """
+    
+    elif purpose == "meal_plan":
+        return base_system_message + """
+        For creating a meal plan:
+        1. Create a 7-day meal plan with breakfast, lunch, and dinner options
+        2. Follow any dietary preferences, restrictions and cooking style
+        3. Keep recipes appropriate to the skill level
+        4. Include variety across the week\
+        5. If Nothing mentioned generate Bangladeshi style Recipes
+        6. Format your response as a JSON object with the following structure:
+        {
+            "monday": {
+                "breakfast": {"title": "Avocado Toast", "description": "Simple avocado toast with eggs", "prep_time": "15 minutes"},
+                "lunch": {"title": "Mediterranean Salad", "description": "Fresh salad with feta and olives", "prep_time": "20 minutes"},
+                "dinner": {"title": "Pasta Primavera", "description": "Seasonal vegetables with pasta", "prep_time": "30 minutes"}
+            },
+            "tuesday": {
+                "breakfast": {},
+                "lunch": {},
+                "dinner": {}
+            },
+            ...and so on for each day of the week...
+        }
+        Only respond with the JSON. Do not include any explanations or additional text.
+        """
+    
+    return base_system_message
+
+
+def legacy_kitchen_prompt(prefs, purpose="general", relevant_menu_items=None, today=TODAY):
+    current_date = today
+    menu_context = ""
+    if relevant_menu_items:
+        menu_context = f"""
+        PRIORITY MENU ITEMS (Always suggest these first when relevant):
+        {chr(10).join([f"- {item.dish_name} ({item.category}, {item.taste_category})" for item in relevant_menu_items])}
+        These are authentic, professional dishes from Shared Skillet. Always prioritize recommending these items when they match the user's request.
+        """
+    base_system_message = f"""
+    You are an expert culinary AI assistant for Shared Skillet, specializing in authentic Bangladeshi and South Asian cuisine. 
+    Today is {current_date}.
+    Current user preferences:
+    - Cooking Style: {prefs["cooking_style"]}
+    - Expertise Level: {prefs["expertise_level"]}
+    - Dietary Restrictions: {', '.join(prefs["dietary_restrictions"]) if prefs["dietary_restrictions"] else "None"}
+    - Spice Level: {prefs["spice_level"]}
+    - Serving Size: {prefs["serving_size"]}
+    {menu_context}
+    CORE GUIDELINES:
+    1. ALWAYS check if user requests match our menu items first
+    2. If menu items are relevant, present them as the primary recommendation
+    3. Only suggest generic/alternative recipes if no menu items match
+    4. Provide detailed, professional cooking instructions
+    5. Include ingredient substitutions and cooking tips
+    6. Emphasize food safety and proper techniques
+    7. Adapt complexity to user's expertise level
+    8. Respect dietary restrictions and preferences
+    RESPONSE STYLE:
+    - Professional yet friendly tone
+    - Clear, step-by-step instructions
+    - Include cooking times, temperatures, and yields
+    - Provide cultural context for traditional dishes
+    - Suggest presentation and serving tips
+    Always prioritize Shared Skillet's authentic menu items over generic suggestions.
+    """
+    return base_system_message
+
+
+def timed_us(fn, repeat=2000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    menu = MENU_ITEMS[:MENU_CONTEXT_K]
+    cases = [
+        ("app.py chat", lambda: legacy_assistant_prompt(ASSISTANT_PREFS), lambda: assistant_prompt(ASSISTANT_PREFS, today=TODAY)),
+        ("app.py shopping_list", lambda: legacy_assistant_prompt(ASSISTANT_PREFS, "shopping_list"),
+         lambda: assistant_prompt(ASSISTANT_PREFS, "shopping_list", TODAY)),
+        ("app.py meal_plan", lambda: legacy_assistant_prompt(ASSISTANT_PREFS, "meal_plan"),
+         lambda: assistant_prompt(ASSISTANT_PREFS, "meal_plan", TODAY)),
+        ("app1 recipe + 5 dishes", lambda: legacy_kitchen_prompt(KITCHEN_PREFS, "recipe_request", menu),
+         lambda: kitchen_prompt(KITCHEN_PREFS, "recipe_request", menu, TODAY)),
+        ("app1 meal_plan notes", lambda: legacy_kitchen_prompt(KITCHEN_PREFS, "meal_plan"),
+         lambda: kitchen_prompt(KITCHEN_PREFS, "meal_plan", today=TODAY)),
+        ("app1 recommendations", lambda: legacy_kitchen_prompt(KITCHEN_PREFS, "recommendations", menu[:3]),
+         lambda: kitchen_prompt(KITCHEN_PREFS, "recommendations", menu[:3], TODAY)),
+    ]
+    print(f"{'system message':24} {'before':>14} {'after':>14}  saved  build before/after")
+    for name, before, after in cases:
+        old, new = before(), after()
+        print(f"{name:24} {len(old):5d} ch {estimate_tokens(old):4d} tk {len(new):5d} ch {estimate_tokens(new):4d} tk"
+              f"  {1 - len(new) / len(old):5.0%}  {timed_us(before):5.1f} / {timed_us(after):5.1f} us")
+
+    print(f"\nMenu context per request as the catalog grows (top {MENU_CONTEXT_K} by hybrid search)")
+    query = "spicy chicken biryani for a party"
+    no_menu = estimate_tokens(kitchen_prompt(KITCHEN_PREFS, "recipe_request", today=TODAY))
+    for size in CATALOG_SIZES:
+        items = synthetic_catalog(size)
+        index = MenuIndex(items)
+        every_dish = f"Prioritize dishes from our menu: {', '.join(item.dish_name for item in items)}."
+        # As app1's chat builds it: route_prompt's search, then generate_enhanced_system_message
+        start = time.perf_counter()
+        relevant_items = index.hybrid_search(query, limit=MENU_CONTEXT_K)
+        system_message = kitchen_prompt(KITCHEN_PREFS, "recipe_request", relevant_items, TODAY)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"  {size:6d} dishes: every dish name {estimate_tokens(every_dish):7d} tk | top-k menu rows "
+              f"{estimate_tokens(system_message) - no_menu:4d} tk of a {estimate_tokens(system_message)} tk system "
+              f"message, built in {elapsed:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Replay a recorded cassette through the client, parsers, merges and renders.
+
+    python -m benchmarks.bench_replay [cassette.jsonl.gz] [--timing]
+
+Without a cassette, a synthetic one is recorded first from a fake upstream whose
+replies mimic the model's: JSON wrapped in prose or code fences, the odd malformed
+reply and a spread of latencies. The run is deterministic for a given cassette;
+--timing sleeps for each recorded latency so end-to-end time matches the original.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+
+import pandas as pd
+import requests
+
+from skillet.cassette import RecordingTransport, ReplayTransport, read_cassette
+from skillet.euron import EuronClient
+from skillet.models import merge_shopping_list, parse_json_reply, parse_shopping_list, parse_week, shopping_list_rows
+
+INGREDIENTS_PROMPT = "Extract ingredients from this recipe: "
+MEAL_PLAN_PROMPT = "Create a weekly meal plan based on these preferences: "
+
+PANTRY = {
+    "produce": ["onion", "garlic", "ginger", "tomato", "green chili", "cilantro", "potato"],
+    "meat": ["chicken", "beef", "mutton"],
+    "dairy": ["yogurt", "ghee", "milk"],
+    "spices": ["turmeric", "cumin", "garam masala", "chili powder", "cardamom"],
+    "pantry": ["basmati rice", "mustard oil", "lentils", "salt"],
+}
+UNITS = ["cup", "tbsp", "tsp", "lb", "g", "piece", "cloves", "", "medium"]
+MEALS = ["Chicken Biryani", "Beef Tehari", "Dal and Rice", "Shorshe Ilish", "Aloo Paratha", "Khichuri"]
+
+
+def fake_reply(payload, rng):
+    prompt = payload["messages"][-1]["content"]
+    if prompt.startswith(INGREDIENTS_PROMPT):
+        data = {category: [{"item": rng.choice(items), "quantity": rng.choice(["1", "2", "1/2", "1 1/2", "to taste"]),
+                            "unit": rng.choice(UNITS)} for _ in range(rng.randint(2, 5))]
+                for category, items in PANTRY.items()}
+    else:
+        data = {day: {meal: {"title": rng.choice(MEALS), "description": "Comforting and easy.", "prep_time": "40 min"}
+                      for meal in ("breakfast", "lunch", "dinner")}
+                for day in ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")}
+    text = json.dumps(data, indent=2)
+    roll = rng.random()
+    if roll < 0.3:
+        text = f"Here is what you asked for:\n```json\n{text}\n```"
+    elif roll < 0.35:
+        text = text[: len(text) // 2]  # truncated at max_tokens
+    return {"choices": [{"message": {"content": text}}]}
+
+
+def fake_upstream(seed=0):
+    rng = random.Random(seed)
+
+    def post(url, **kwargs):
+        time.sleep(rng.uniform(0.0, 0.004))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(fake_reply(kwargs["json"], rng)).encode()
+        response.encoding = "utf-8"
+        return response
+
+    return post
+
+
+def record_synthetic(path, requests_count=60, seed=0):
+    rng = random.Random(seed)
+    client = EuronClient(lambda: "recording", transport=RecordingTransport(path, fake_upstream(seed)), retries=1)
+    for i in range(requests_count):
+        if rng.random() < 0.7:
+            prompt = INGREDIENTS_PROMPT + f"Recipe {i}: {rng.choice(MEALS)}"
+            client.complete([{"role": "user", "content": prompt}], temperature=0.3, max_tokens=1000)
+        else:
+            prompt = MEAL_PLAN_PROMPT + f"Cooking style: Bangladeshi, plan {i}"
+            client.complete([{"role": "user", "content": prompt}], temperature=0.7, max_tokens=2000)
+
+
+def render_meal_cards(week):
+    return [f"<h4>{meal.title}</h4><p>{meal.description}</p><p><strong>Prep time:</strong> {meal.prep_time}</p>"
+            for plan in week.values() for meal in plan.meals.values()]
+
+
+def run(path, timing=False):
+    transport = ReplayTransport(path, timing=timing)
+    client = EuronClient(lambda: "replay", transport=transport, retries=1)
+    stages = defaultdict(float)
+    counts = defaultdict(int)
+    shopping_list = {}
+    start = time.perf_counter()
+    for entry in transport.entries:
+        payload = entry["request"]
+        prompt = payload["messages"][-1]["content"]
+        kind = ("ingredients" if prompt.startswith(INGREDIENTS_PROMPT)
+                else "meal_plan" if prompt.startswith(MEAL_PLAN_PROMPT) else "chat")
+        counts[kind] += 1
+
+        t0 = time.perf_counter()
+        content = client.complete(payload["messages"], payload["temperature"], payload["max_tokens"])
+        t1 = time.perf_counter()
+        stages["client"] += t1 - t0
+        if content.startswith("Error:") or kind == "chat":
+            counts["errors"] += content.startswith("Error:")
+            continue
+        try:
+            parsed = parse_json_reply(content)
+        except ValueError:
+            counts["parse_failures"] += 1
+            stages["parse"] += time.perf_counter() - t1
+            continue
+        if kind == "ingredients":
+            ingredients = parse_shopping_list(parsed)
+            t2 = time.perf_counter()
+            merge_shopping_list(shopping_list, ingredients)
+            t3 = time.perf_counter()
+            [str(item) for items in shopping_list.values() for item in items]
+            pd.DataFrame(shopping_list_rows(shopping_list)).to_csv(index=False)
+        else:
+            week = parse_week(parsed)
+            t2 = t3 = time.perf_counter()
+            render_meal_cards(week)
+        t4 = time.perf_counter()
+        stages["parse"] += t2 - t1
+        stages["merge"] += t3 - t2
+        stages["render"] += t4 - t3
+    total = time.perf_counter() - start
+    return stages, counts, total, transport, shopping_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cassette", nargs="?", help="gzip JSONL cassette recorded with SKILLET_RECORD")
+    parser.add_argument("--timing", action="store_true", help="sleep for each recorded latency")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.cassette
+        if path is None:
+            path = os.path.join(tmp, "synthetic.jsonl.gz")
+            record_synthetic(path)
+            print(f"Recorded synthetic cassette ({os.path.getsize(path)} bytes gzip)")
+        recorded = sum(entry["elapsed"] for entry in read_cassette(path))
+        stages, counts, total, transport, shopping_list = run(path, args.timing)
+
+    print(f"Replayed {len(transport.entries)} requests in {total * 1000:.1f} ms "
+          f"(recorded upstream time {recorded * 1000:.1f} ms, replay misses {transport.misses})")
+    print("  " + ", ".join(f"{kind} {count}" for kind, count in sorted(counts.items())))
+    for stage in ("client", "parse", "merge", "render"):
+        print(f"  {stage:7} {stages[stage] * 1000:8.2f} ms")
+    print(f"  shopping list: {sum(len(items) for items in shopping_list.values())} lines "
+          f"in {len(shopping_list)} categories")
+
+
+if __name__ == "__main__":
+    main()
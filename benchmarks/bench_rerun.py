@@ -0,0 +1,78 @@
+"""Script execution time per interaction: full rerun vs fragment rerun.
+
+Before fragments, every click re-executed the whole script. Now a click inside a
+fragment only re-executes that fragment's body, whose duration each fragment
+records in st.session_state.render_timings.
+
+Run from the repository root: python -m benchmarks.bench_rerun
+"""
+import pathlib
+import statistics
+import time
+
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+
+from skillet.menu import MENU_ITEMS
+from skillet.models import DAYS, MEAL_TYPES, DayPlan, Ingredient, Meal, Message, Quantity
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+RUNS = 5
+
+
+def seeded_state(app, n_messages=200, n_items=60):
+    messages = [Message("user" if i % 2 else "assistant", f"Message {i} " + "lorem ipsum " * 40)
+                for i in range(n_messages)]
+    if app == "app.py":
+        categories = ["produce", "dairy", "meat", "pantry", "spices", "other"]
+        shopping_list = {c: [Ingredient(f"{c} item {i}", Quantity.parse("1", "cup"), c)
+                             for i in range(n_items // len(categories))] for c in categories}
+        meal = Meal("Beef Tehari", "Old Dhaka style beef rice", "45 minutes")
+        meal_plan = {day: DayPlan(day, {m: meal for m in MEAL_TYPES}) for day in DAYS}
+    else:
+        # app1's shopping list is {menu item id: servings}
+        shopping_list = {item.id: 12 for item in MENU_ITEMS}
+        meal_plan = {"plan": "\n".join(f"- Day {d}: Chicken Mandi, Tiramisu" for d in range(7))}
+    return {"messages": messages, "shopping_list": shopping_list, "meal_plan": meal_plan}
+
+
+def measure(app, tab, fragment):
+    at = AppTest.from_file(str(ROOT / app), default_timeout=120)
+    at.secrets["euron"] = {"api_key": ""}
+    for key, value in seeded_state(app).items():
+        at.session_state[key] = value
+    at.session_state["current_tab"] = tab
+    at.run()
+    assert not at.exception, (app, tab, at.exception)
+    full, frag = [], []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        at.run()
+        full.append((time.perf_counter() - start) * 1000)
+        assert not at.exception, (app, tab, at.exception)
+        timings = at.session_state["render_timings"]
+        frag.append(sum(ms for name, ms in timings.items() if name == fragment))
+    return statistics.median(full), statistics.median(frag)
+
+
+CASES = [
+    ("app.py", "Chat", "chat_view"),
+    ("app.py", "Shopping List", "shopping_list_view"),
+    ("app.py", "Meal Planning", "meal_plan_day"),
+    ("app1.py", "AI Assistant", "chat_view"),
+    ("app1.py", "Menu Explorer", "menu_explorer_grid"),
+    ("app1.py", "Shopping List", "shopping_list_view"),
+    ("app1.py", "Meal Planning", "meal_plan_view"),
+]
+
+
+def main():
+    set_log_level("error")
+    print(f"{'app':8} {'tab':15} {'fragment':20} {'full rerun ms':>14} {'fragment ms':>12}")
+    for app, tab, fragment in CASES:
+        full, frag = measure(app, tab, fragment)
+        print(f"{app:8} {tab:15} {fragment:20} {full:14.1f} {frag:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Recall and latency benchmark for menu search.
+
+Run from the repository root: python -m benchmarks.bench_search
+"""
+import random
+import time
+
+from skillet.menu import MENU_ITEMS, MenuItem
+from skillet.search import MenuIndex, lexical_search
+
+# query -> ids of the dishes a human would expect to see
+LABELED_QUERIES = {
+    "something spicy for dinner": {6},
+    "rice dish with lamb": {2},
+    "biryani": {3, 6, 7, 8},
+    "chicken biryani": {3, 6, 7},
+    "kebabs": {4, 13},
+    "what desserts do you recommend": {9, 10, 11, 12, 15},
+    "cold drink": {18, 19, 20},
+    "mango": {11, 19},
+    "coffee dessert": {10},
+    "beef and rice": {8, 16},
+    "fried starter": {14},
+    "coconut pineapple": {18},
+    "kofta biriyani": {7},
+    "saffron sweet rice": {15},
+    "cheesecake": {9},
+}
+
+# Misspelled and transliterated queries, including partial dish names
+MISSPELLED_QUERIES = {
+    "biriyani": {3, 6, 7, 8},
+    "briyani": {3, 6, 7, 8},
+    "chicken biriyani": {3, 6, 7},
+    "beef biriani": {8, 16},
+    "seekh kebab": {13},
+    "kabab": {4, 13},
+    "chiken mandi": {1},
+    "kabuli polao": {2},
+    "beef tehri": {16},
+    "tiramasu": {10, 11},
+    "mango lasi": {19},
+    "shahi zarda": {15},
+    "chese cake": {9},
+}
+
+
+def recall_at_k(search, k, queries=LABELED_QUERIES):
+    total = 0.0
+    for query, relevant in queries.items():
+        found = {item.id for item in search(query, k)}
+        total += len(found & relevant) / min(len(relevant), k)
+    return total / len(queries)
+
+
+def synthetic_catalog(size, seed=0):
+    rng = random.Random(seed)
+    items = []
+    for i in range(size):
+        base = rng.choice(MENU_ITEMS)
+        other = rng.choice(MENU_ITEMS)
+        items.append(MenuItem(
+            i, f"{base.dish_name} {other.dish_name.split()[-1]}", base.category, base.taste_category,
+            base.image_url, "", dict(base.pricing), dict(base.serving_info), f"{base.summary} {other.summary}",
+        ))
+    return items
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    index = MenuIndex(MENU_ITEMS)
+    print("Recall on labeled queries (20-item catalog)")
+    for k in (1, 3, 5):
+        old = recall_at_k(lambda q, n: lexical_search(MENU_ITEMS, q, n), k)
+        new = recall_at_k(lambda q, n: index.hybrid_search(q, n), k)
+        print(f"  recall@{k}: lexical={old:.2f}  hybrid={new:.2f}")
+    print("Recall on misspelled queries")
+    for k in (1, 3, 5):
+        old = recall_at_k(lambda q, n: lexical_search(MENU_ITEMS, q, n), k, MISSPELLED_QUERIES)
+        new = recall_at_k(lambda q, n: index.hybrid_search(q, n), k, MISSPELLED_QUERIES)
+        print(f"  recall@{k}: lexical={old:.2f}  hybrid={new:.2f}")
+
+    queries = list(LABELED_QUERIES)
+    print("\nLatency (ms)")
+    for size in (20, 1000, 10000):
+        items = MENU_ITEMS if size == 20 else synthetic_catalog(size)
+        start = time.perf_counter()
+        idx = MenuIndex(items)
+        build_ms = (time.perf_counter() - start) * 1000
+        lexical_ms = timed(lambda: [lexical_search(items, q, 5) for q in queries], 1) / len(queries)
+        hybrid_ms = timed(lambda: [idx.hybrid_search(q, 5) for q in queries], 1) / len(queries)
+        batched_ms = timed(lambda: idx.top_k(queries, 5), 3) / len(queries)
+        print(f"  {size:>6} items: build={build_ms:8.1f}  lexical/query={lexical_ms:8.3f}  "
+              f"hybrid/query={hybrid_ms:8.3f}  batched top-k/query={batched_ms:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
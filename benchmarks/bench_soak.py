@@ -0,0 +1,84 @@
+"""Session memory over a long-lived kiosk session, unbounded versus MemoryLimits.
+
+Each simulated turn is what app1.py keeps per chat turn: a question and a long answer
+in messages, two recommended menu items and their ids in interaction_history, and an
+extracted ingredient list like app.py's recipe_ingredients. Unbounded is the old
+behaviour of appending forever; bounded runs enforce_memory_limits' steps after every
+turn, spilling old messages to a temporary SQLite cache. Sizes come from memory_report,
+with the menu items counted as shared, and the last window of the chat is read back
+from the spilled pages at the end.
+
+Run from the repository root: python -m benchmarks.bench_soak
+"""
+import os
+import random
+import tempfile
+import time
+
+from skillet.cache import open_cache
+from skillet.menu import MENU_ITEMS
+from skillet.models import Message, content_digest
+from skillet.session import (
+    MemoryLimits, dedupe_by_id, keep_last, memory_report, recent_messages, spill_messages, trim_oldest
+)
+
+TURNS = 5000
+CHECKPOINTS = (100, 500, 1000, 2500, 5000)
+ANSWER = ("Here is a recipe for {dish} for {n} people.\n\n**Ingredients**\n- 1 kg beef\n- 500 g rice\n"
+          "- 3 onions\n- 2 tbsp ginger garlic paste\n\n**Steps**\n1. Marinate for an hour.\n"
+          "2. Fry the onions until golden.\n3. Cook covered on low heat for 45 minutes.\n") * 3
+
+
+def turn(state, rng, n):
+    items = rng.sample(MENU_ITEMS, 2)
+    answer = ANSWER.format(dish=items[0].dish_name, n=n)
+    state["messages"] += [Message("user", f"Something like {items[0].dish_name} for {n} people?"),
+                          Message("assistant", answer)]
+    state["recommended_items"] = items + state["recommended_items"]
+    state["interaction_history"].extend(item.id for item in items)
+    state["recipe_ingredients"][content_digest(answer)] = {
+        "Meat": [{"item": "beef", "quantity": "1", "unit": "kg"}], "Grains": [{"item": "rice", "quantity": "500", "unit": "g"}]}
+
+
+def bound(state, cache, limits):
+    state["spilled_messages"] = spill_messages(state["messages"], cache, "soak", state["spilled_messages"], limits)
+    state["recommended_items"] = dedupe_by_id(state["recommended_items"], limits.recommended)
+    keep_last(state["interaction_history"], limits.history)
+    trim_oldest(state["recipe_ingredients"], limits.extractions)
+
+
+def soak(name, cache=None, limits=None):
+    state = {"messages": [], "recommended_items": [], "interaction_history": [], "recipe_ingredients": {},
+             "spilled_messages": 0}
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for n in range(1, TURNS + 1):
+        turn(state, rng, n)
+        if limits is not None:
+            bound(state, cache, limits)
+        if n in CHECKPOINTS:
+            rows = memory_report(state, shared=MENU_ITEMS)
+            sizes = ", ".join(f"{row['Key']} {row['Bytes'] / 1024:.0f}" for row in rows[:4])
+            print(f"{name:9s} turn {n:5d}: {sum(row['Bytes'] for row in rows) / 1024:7.0f} KB  ({sizes})")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"{name:9s} {TURNS} turns in {elapsed_ms:.0f} ms, {state['spilled_messages']} messages spilled")
+    return state
+
+
+def main():
+    limits = MemoryLimits()
+    soak("unbounded")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = open_cache(f"sqlite:///{os.path.join(tmp, 'soak.sqlite3')}")
+        state = soak("bounded", cache, limits)
+        window = limits.messages + limits.spill_page * 2
+        start = time.perf_counter()
+        messages = recent_messages(state["messages"], window, cache, "soak", state["spilled_messages"], limits)
+        read_ms = (time.perf_counter() - start) * 1000
+        assert len(messages) == window and messages[-1] == state["messages"][-1]
+        print(f"reading back the last {window} messages, {window - len(state['messages'])} from the cache: "
+              f"{read_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Timeouts, retries and latency of API calls under fixed and adaptive timeout policies.
+
+A simulated upstream generates each reply at a per-purpose speed with lognormal jitter,
+and a small share of requests hang without answering. Three policies make the same calls:
+
+    fixed 5 s    app1's old EuronClient(timeout=5, retries=3)
+    no timeout   app.py's old EuronClient(timeout=None), where a hang blocks for HANG seconds
+    adaptive     AdaptiveProfiles: (connect, read) timeouts from p99 latency and a deadline
+
+Times are in real-world seconds; the run sleeps SCALE times as long so it takes a few seconds.
+
+Run from the repository root: python -m benchmarks.bench_timeouts
+"""
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+import requests
+
+from skillet.euron import EuronClient
+from skillet.profiles import PROFILES, AdaptiveProfiles
+
+SCALE = 0.002
+CALLS = 150  # per purpose
+HANG_RATE = 0.02
+HANG = 300.0
+# purpose -> (reply tokens, seconds per generated token)
+TRAFFIC = {
+    "chat": (600, 0.014),
+    "extraction": (350, 0.010),
+    "preferences": (60, 0.020),
+    "meal_plan": (1500, 0.014),
+    "recommendations": (180, 0.012),
+    "descriptions": (250, 0.012),
+}
+
+
+class Reply:
+    def __init__(self, content, tokens):
+        self.data = {"choices": [{"message": {"content": content}}], "usage": {"completion_tokens": tokens}}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class Upstream:
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+
+    def __call__(self, url, headers, json, timeout):
+        tokens, per_token = TRAFFIC[json["messages"][0]["content"]]
+        tokens = min(tokens, json["max_tokens"])
+        hang = self.rng.random() < HANG_RATE
+        latency = HANG if hang else tokens * per_token * self.rng.lognormvariate(0, 0.25) + 0.3
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout  # already scaled
+        if read_timeout is not None and latency * SCALE > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.exceptions.Timeout()
+        time.sleep(latency * SCALE)
+        return Reply("ok " * tokens, tokens)
+
+
+def scaled_profiles():
+    return {purpose: replace(p, read_timeout=p.read_timeout * SCALE, min_read_timeout=p.min_read_timeout * SCALE,
+                             max_read_timeout=p.max_read_timeout * SCALE, deadline=p.deadline * SCALE,
+                             connect_timeout=p.connect_timeout * SCALE)
+            for purpose, p in PROFILES.items()}
+
+
+def run(name, client, profiles=None):
+    def call(purpose):
+        settings = profiles.settings(purpose) if profiles else None
+        max_tokens = settings.max_tokens if settings else PROFILES[purpose].max_tokens
+        start = time.perf_counter()
+        content = client.complete([{"role": "system", "content": purpose}], max_tokens=max_tokens,
+                                  purpose=purpose if profiles else None)
+        return purpose, (time.perf_counter() - start) / SCALE, not content.startswith("Error:")
+
+    calls = [purpose for purpose in TRAFFIC for _ in range(CALLS)]
+    random.Random(1).shuffle(calls)
+    upstream, attempts = Upstream(), []
+    client.transport = lambda *args, **kwargs: attempts.append(1) or upstream(*args, **kwargs)
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(call, calls))
+    latencies = np.array([latency for _, latency, _ in results])
+    failed = sum(not ok for _, _, ok in results)
+    retries = len(attempts) - len(calls)
+    print(f"{name:11s}: {len(calls)} calls, {failed:3d} failed, {retries:4d} retries, "
+          f"p50 {np.percentile(latencies, 50):6.1f} s, p95 {np.percentile(latencies, 95):6.1f} s, "
+          f"worst {latencies.max():6.1f} s")
+    for purpose in TRAFFIC:
+        rows = [(latency, ok) for p, latency, ok in results if p == purpose]
+        print(f"    {purpose:15s} {sum(not ok for _, ok in rows):3d} failed, "
+              f"p95 {np.percentile([latency for latency, _ in rows], 95):6.1f} s")
+    return profiles
+
+
+def main():
+    quiet = {"models": ("m",), "initial_delay": 2 * SCALE}
+    run("fixed 5 s", EuronClient(lambda: "key", timeout=5 * SCALE, retries=3, **quiet))
+    run("no timeout", EuronClient(lambda: "key", timeout=None, retries=1, **quiet))
+    profiles = AdaptiveProfiles(scaled_profiles(), legacy_timeout=5 * SCALE)
+    run("adaptive", EuronClient(lambda: "key", retries=3, profiles=profiles, **quiet), profiles)
+    for purpose, stats in profiles.stats().items():
+        print(f"    {purpose:15s} read timeout {stats['read_timeout_s'] / SCALE:5.1f} s, max_tokens "
+              f"{stats['max_tokens']}, {stats['timeouts']} timeouts, {stats['deadline_exceeded']} past the deadline, "
+              f"{stats['legacy_timeouts_avoided']} timeouts and {stats['legacy_retries_avoided']} retries avoided "
+              f"vs fixed 5 s")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)  # every simulated timeout is logged as an error
+    main()
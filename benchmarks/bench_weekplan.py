@@ -0,0 +1,108 @@
+"""Tokens, calls and estimated latency of meal-plan edits: full regeneration vs patching.
+
+Before: any change regenerated all 21 meals, and "Add All to Shopping List" extracted
+the whole plan again as one text. After: only the unlocked slots are asked for and
+patched in, and only the meals not on the shopping list yet are extracted. Reply sizes
+come from synthetic meals and ingredient lists encoded the way the model returns them;
+latency assumes SECONDS_PER_TOKEN of generation plus OVERHEAD per call.
+
+Run from the repository root: python -m benchmarks.bench_weekplan
+"""
+import json
+import random
+import time
+
+from benchmarks.bench_replay import MEALS, PANTRY
+from skillet.models import DAYS, MEAL_TYPES, merge_shopping_list, parse_shopping_list, parse_week
+from skillet.prompts import estimate_tokens, ingredient_messages, meal_plan_messages
+from skillet.weekplan import all_slots, diff_week, meal_at, meal_texts, patch_week, unlocked_slots
+
+SECONDS_PER_TOKEN = 0.014
+OVERHEAD = 0.8
+PREFS = {"cooking_style": "Bangladeshi", "expertise_level": "Intermediate", "dietary_restrictions": []}
+
+
+def synthetic_meal(rng, n):
+    return {"title": f"{rng.choice(MEALS)} {n}", "description": "Slow-cooked with whole spices and served with rice",
+            "prep_time": f"{rng.choice([15, 30, 45])} minutes"}
+
+
+def ingredient_list(rng):
+    return {category: [{"item": item, "quantity": str(rng.randint(1, 4)), "unit": rng.choice(["cup", "tbsp", "g", ""])}
+                       for item in rng.sample(items, min(len(items), rng.randint(1, 3)))]
+            for category, items in PANTRY.items()}
+
+
+def tokens(messages):
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+
+class Cost:
+    def __init__(self):
+        self.calls = self.prompt = self.reply = 0
+        self.seconds = 0.0
+
+    def add(self, messages, reply):
+        reply_tokens = estimate_tokens(json.dumps(reply, separators=(",", ":")))
+        self.calls += 1
+        self.prompt += tokens(messages)
+        self.reply += reply_tokens
+        self.seconds += OVERHEAD + reply_tokens * SECONDS_PER_TOKEN
+
+    def __str__(self):
+        return (f"{self.calls} calls, {self.prompt:5d} prompt + {self.reply:5d} reply tokens, "
+                f"~{self.seconds:5.1f} s")
+
+
+# One extraction call for some meals: their lists merged, as the model replies
+def add_extraction(cost, texts, lists):
+    merged = {}
+    for ingredients in lists:
+        merge_shopping_list(merged, parse_shopping_list(ingredients))
+    reply = {category: [i.to_json() for i in items] for category, items in merged.items()}
+    cost.add(ingredient_messages("".join(f"{text}\n" for text in texts)), reply)
+
+
+def before(rng, plan_json, lists):
+    # New plan of 21 meals, then the whole plan extracted again
+    cost = Cost()
+    new_plan = {day: {meal_type: synthetic_meal(rng, i) for i, meal_type in enumerate(MEAL_TYPES)} for day in DAYS}
+    cost.add(meal_plan_messages(PREFS, today="2025-05-05"), new_plan)
+    add_extraction(cost, meal_texts(parse_week(plan_json)), lists.values())
+    return cost
+
+
+def after(rng, plan, lists, slots):
+    cost = Cost()
+    start = time.perf_counter()
+    reply = {}
+    for day, meal_type in slots:
+        reply.setdefault(day, {})[meal_type] = synthetic_meal(rng, 100 + len(reply))
+    messages = meal_plan_messages(PREFS, today="2025-05-05", plan=plan, slots=slots)
+    old = {day: type(day_plan)(day, dict(day_plan.meals)) for day, day_plan in plan.items()}
+    changed = patch_week(plan, reply, slots)
+    patch_ms = (time.perf_counter() - start) * 1000
+    cost.add(messages, reply)
+    add_extraction(cost, [meal_at(plan, slot).text for slot in changed], [lists[slot] for slot in changed])
+    assert diff_week(old, plan) == changed
+    return cost, patch_ms
+
+
+def main():
+    rng = random.Random(0)
+    plan_json = {day: {meal_type: synthetic_meal(rng, i) for i, meal_type in enumerate(MEAL_TYPES)} for day in DAYS}
+    lists = {slot: ingredient_list(rng) for slot in all_slots()}
+    scenarios = {
+        "swap 1 meal": [("wednesday", "dinner")],
+        "regenerate 1 day": unlocked_slots(set(), ["friday"]),
+        "keep 7 liked meals": unlocked_slots(set(all_slots()[::3])),
+        "keep nothing": unlocked_slots(set()),
+    }
+    print(f"before, any change:   {before(random.Random(1), plan_json, lists)}")
+    for name, slots in scenarios.items():
+        cost, patch_ms = after(random.Random(1), parse_week(plan_json), lists, slots)
+        print(f"{name:20s}: {cost}  ({len(slots):2d} slots, patch {patch_ms:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""A tiny in-process server speaking the subset of RESP that RedisCache uses.
+
+Stands in for Redis when exercising the Redis backend without a Redis install:
+
+    server = RedisStandIn()          # listens on 127.0.0.1, random port
+    cache = RedisCache(server.url)
+    ...
+    server.close()
+"""
+import socketserver
+import threading
+import time
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            try:
+                reply = self.server.dispatch(args)
+            except Exception as e:
+                reply = e
+            self.wfile.write(self._encode(reply))
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        args = []
+        for _ in range(count):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    @staticmethod
+    def _encode(reply) -> bytes:
+        if isinstance(reply, Exception):
+            return f"-ERR {reply}\r\n".encode()
+        if reply is True:
+            return b"+OK\r\n"
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+
+class RedisStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def _live(self, key):
+        expires = self.expires.get(key)
+        if expires is not None and expires <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def dispatch(self, args):
+        command = args[0].upper()
+        with self.lock:
+            if command in (b"PING", b"SELECT", b"AUTH"):
+                return True
+            if command == b"GET":
+                return self._live(args[1])
+            if command == b"SET":
+                self.data[args[1]] = args[2]
+                self.expires.pop(args[1], None)
+                if len(args) == 5 and args[3].upper() == b"PX":
+                    self.expires[args[1]] = time.time() + int(args[4]) / 1000
+                return True
+            if command == b"INCRBY":
+                value = int(self._live(args[1]) or 0) + int(args[2])
+                self.data[args[1]] = str(value).encode()
+                return value
+            if command == b"PEXPIRE":
+                if self._live(args[1]) is None:
+                    return 0
+                self.expires[args[1]] = time.time() + int(args[2]) / 1000
+                return 1
+            if command == b"DEL":
+                removed = sum(self.data.pop(key, None) is not None for key in args[1:])
+                for key in args[1:]:
+                    self.expires.pop(key, None)
+                return removed
+        raise ValueError(f"unknown command '{command.decode()}'")
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
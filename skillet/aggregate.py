@@ -0,0 +1,299 @@
+"""Consolidated ingredient totals and a dish prep sheet across many stored orders.
+
+    python -m skillet.aggregate orders/ more.jsonl.gz -o totals.csv --prep prep.csv
+    python -m skillet.aggregate orders/ -o totals.parquet
+
+Inputs are JSON Lines files (optionally gzipped), .json files holding one record or a
+list of them, or directories of either. Each record may carry any of:
+
+    {"shopping_list": {"produce": [{"item": "onion", "quantity": "2", "unit": ""}], ...}}
+    {"orders": {"16": 15, "Tiramisu": 12}}                      (menu dish id or name -> servings)
+    {"meal_plan": {"monday": {"lunch": {"title": "Beef Tehari"}}}, "servings": 4}
+    {"meal_plan": MealPlan.to_json()}
+
+Records are read one line at a time and folded into one running total per ingredient,
+category and kind of unit, so memory grows with the number of distinct ingredients and
+not with the number of records. Mass and volume are summed across units and shown in
+the first unit seen for that ingredient, moved up to a handier one at the end.
+Unreadable lines and malformed .json files are skipped and counted in the summary.
+Dish names that are not exact (misspelled, transliterated or with extra words, as in
+"Beef Tehri" or "Chicken Kofta Biriyani") are resolved against the menu when they match
+one dish closely.
+"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from skillet.dishes import DishResolver
+from skillet.ingredients import CATEGORIES, PER_SERVING, order_servings
+from skillet.menu import MENU_BY_ID, MENU_ITEMS, MenuItem
+from skillet.models import UNIT_SIZES, Ingredient, Quantity, Unit, parse_shopping_list
+
+INPUT_SUFFIXES = (".jsonl", ".jsonl.gz", ".json", ".json.gz")
+_BY_NAME = {item.dish_name.lower(): item for item in MENU_ITEMS}
+_RESOLVER = DishResolver(MENU_ITEMS)
+# Fuzzy matches below this score are left off the menu rather than guessed
+RESOLVE_CUTOFF = 0.85
+
+
+def find_dish(ref: Any) -> Optional[MenuItem]:
+    if isinstance(ref, int) or (isinstance(ref, str) and ref.strip().isdigit()):
+        return MENU_BY_ID.get(int(ref))
+    name = str(ref or "").strip()
+    item = _BY_NAME.get(name.lower())
+    if item is None and name:
+        matches = _RESOLVER.resolve(name, limit=1, cutoff=RESOLVE_CUTOFF)
+        item = matches[0][0] if matches else None
+    return item
+
+
+# Quantities with the same kind of unit sum into one total: all masses, all volumes, or
+# the exact same other unit. Amounts like "to taste" are grouped by their text.
+def unit_kind(quantity: Quantity) -> str:
+    if quantity.amount is None:
+        return "?" + quantity.label.lower()
+    if quantity.unit in UNIT_SIZES:
+        return UNIT_SIZES[quantity.unit][0].value
+    return f"{quantity.unit.value}:{quantity.label.lower()}"
+
+
+@dataclass(slots=True)
+class Total:
+    name: str
+    category: str
+    unit: Unit
+    label: str
+    amount: Optional[float]
+    lists: int = 0
+    last_record: int = -1
+
+
+@dataclass(slots=True)
+class Prep:
+    dish: str
+    on_menu: bool
+    servings: float = 0.0
+    orders: int = 0
+    last_record: int = -1
+
+
+class Aggregator:
+    def __init__(self):
+        self.totals: Dict[Tuple[str, str, str], Total] = {}
+        self.prep: Dict[str, Prep] = {}
+        self.records = 0
+        self.lines = 0
+        self.bad_lines = 0
+        self.bad_files = 0
+        # Menu item id -> (total key, per-serving ingredient), so dish orders skip building records
+        self._dish_rows: Dict[int, List[Tuple[Tuple[str, str, str], Ingredient]]] = {}
+
+    def _add(self, key: Tuple[str, str, str], ingredient: Ingredient, factor: float = 1.0):
+        quantity = ingredient.quantity
+        total = self.totals.get(key)
+        if total is None:
+            amount = None if quantity.amount is None else quantity.amount * factor
+            total = self.totals[key] = Total(ingredient.name, key[0], quantity.unit, quantity.label, amount)
+        elif quantity.amount is not None:
+            amount = quantity.amount * factor
+            if quantity.unit is not total.unit:
+                amount *= UNIT_SIZES[quantity.unit][1] / UNIT_SIZES[total.unit][1]
+            total.amount += amount
+        if total.last_record != self.records:
+            total.lists += 1
+            total.last_record = self.records
+        self.lines += 1
+
+    def add_ingredient(self, ingredient: Ingredient):
+        category = ingredient.category.strip().lower() or "other"
+        self._add((category, ingredient.key, unit_kind(ingredient.quantity)), ingredient)
+
+    def add_ingredients(self, ingredients: Dict[str, List[Ingredient]]):
+        for items in ingredients.values():
+            for ingredient in items:
+                self.add_ingredient(ingredient)
+
+    # A dish by menu id or name at some number of servings. Dishes that are not on the
+    # menu only appear on the prep sheet, since there is no ingredient table for them.
+    def add_dish(self, ref: Any, servings: float):
+        item = find_dish(ref)
+        name = item.dish_name if item is not None else str(ref).strip()
+        prep = self.prep.get(name)
+        if prep is None:
+            prep = self.prep[name] = Prep(name, item is not None)
+        prep.servings += servings
+        if prep.last_record != self.records:
+            prep.orders += 1
+            prep.last_record = self.records
+        if item is not None:
+            rows = self._dish_rows.get(item.id)
+            if rows is None:
+                rows = self._dish_rows[item.id] = [
+                    ((i.category, i.key, unit_kind(i.quantity)), i) for i in PER_SERVING.get(item.id, [])
+                ]
+            for key, ingredient in rows:
+                self._add(key, ingredient, servings)
+
+    def add_orders(self, orders: Any):
+        if isinstance(orders, dict):
+            orders = [{"dish": ref, "servings": servings} for ref, servings in orders.items()]
+        for order in orders if isinstance(orders, list) else []:
+            if not isinstance(order, dict):
+                continue
+            ref = order.get("id", order.get("dish"))
+            servings = order.get("servings")
+            if servings is None and "option" in order:
+                item = find_dish(ref)
+                servings = order_servings(item, order["option"], int(order.get("quantity") or 1)) if item else 0
+            try:
+                servings = float(servings or 0)
+            except (TypeError, ValueError):
+                continue
+            if servings > 0:
+                self.add_dish(ref, servings)
+
+    def add_meal_plan(self, plan: Any, servings: float = 1.0):
+        if not isinstance(plan, dict):
+            return
+        if isinstance(plan.get("days"), list):
+            # MealPlan.to_json(): dishes already carry their tray option and count
+            self.add_orders([dish for meals in plan["days"] if isinstance(meals, list)
+                             for meal in meals if isinstance(meal, dict)
+                             for dish in meal.get("dishes") or []])
+            return
+        for meals in plan.values():
+            for meal in meals.values() if isinstance(meals, dict) else []:
+                title = meal.get("title") if isinstance(meal, dict) else meal
+                if isinstance(title, str) and title.strip():
+                    self.add_dish(title, servings)
+
+    def add_record(self, record: Any):
+        if not isinstance(record, dict):
+            self.bad_lines += 1
+            return
+        if "shopping_list" in record:
+            self.add_ingredients(parse_shopping_list(record["shopping_list"]))
+        if "orders" in record:
+            self.add_orders(record["orders"])
+        if "meal_plan" in record:
+            try:
+                servings = float(record.get("servings") or 1)
+            except (TypeError, ValueError):
+                servings = 1.0
+            self.add_meal_plan(record["meal_plan"], servings)
+        self.records += 1
+
+    def consume(self, paths: Iterable[str]) -> "Aggregator":
+        for record in iter_records(paths, self):
+            self.add_record(record)
+        return self
+
+    # One row per ingredient and kind of unit, grouped by category
+    def rows(self) -> List[Dict[str, Any]]:
+        order = {category: i for i, category in enumerate(CATEGORIES)}
+        totals = sorted(self.totals.values(),
+                        key=lambda t: (order.get(t.category, len(order)), t.category, t.name.lower()))
+        rows = []
+        for total in totals:
+            quantity = Quantity(total.amount, total.unit, total.label).simplified()
+            rows.append({"Category": total.category, "Item": total.name, "Quantity": quantity.format_amount(),
+                         "Unit": quantity.unit_text, "Lists": total.lists})
+        return rows
+
+    def prep_rows(self) -> List[Dict[str, Any]]:
+        return [{"Dish": prep.dish, "Servings": round(prep.servings, 2), "Orders": prep.orders,
+                 "On Menu": prep.on_menu}
+                for prep in sorted(self.prep.values(), key=lambda p: (not p.on_menu, -p.servings, p.dish))]
+
+
+def input_files(paths: Iterable[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in sorted(os.walk(path)):
+                for name in sorted(files):
+                    if name.endswith(INPUT_SUFFIXES):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def _open(path: str):
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+# Records from every input, one line at a time; lines that aren't JSON, and .json files
+# that are malformed or truncated, are counted on the aggregator (when given) and skipped
+def iter_records(paths: Iterable[str], aggregator: Optional[Aggregator] = None) -> Iterator[Any]:
+    for path in input_files(paths):
+        with _open(path) as f:
+            if path.endswith((".json", ".json.gz")):
+                try:
+                    data = json.load(f)
+                except (ValueError, EOFError, gzip.BadGzipFile):
+                    if aggregator is not None:
+                        aggregator.bad_files += 1
+                    continue
+                yield from data if isinstance(data, list) else [data]
+                continue
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    if aggregator is not None:
+                        aggregator.bad_lines += 1
+
+
+def aggregate(paths: Iterable[str]) -> Aggregator:
+    return Aggregator().consume(paths)
+
+
+# CSV is written row by row; Parquet goes through pandas and needs pyarrow or fastparquet
+def write_table(rows: List[Dict[str, Any]], path: str):
+    if path.endswith(".parquet"):
+        import pandas as pd
+        pd.DataFrame(rows).to_parquet(path, index=False)
+        return
+    out = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+    try:
+        if rows:
+            writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m skillet.aggregate", description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="JSONL, JSONL.gz or JSON files, directories of them, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="ingredient totals, .csv or .parquet (default: stdout CSV)")
+    parser.add_argument("--prep", help="also write the dish prep sheet, .csv or .parquet")
+    args = parser.parse_args(argv)
+
+    aggregator = aggregate(args.inputs)
+    try:
+        write_table(aggregator.rows(), args.output)
+        if args.prep:
+            write_table(aggregator.prep_rows(), args.prep)
+    except ImportError as e:
+        parser.exit(1, f"Parquet output needs pyarrow or fastparquet: {e}\n")
+    print(f"{aggregator.records} records, {aggregator.lines} ingredient lines -> {len(aggregator.totals)} totals, "
+          f"{len(aggregator.prep)} dishes ({aggregator.bad_lines} unreadable lines and {aggregator.bad_files} "
+          f"unreadable files skipped)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
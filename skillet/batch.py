@@ -0,0 +1,326 @@
+"""Batch meal plans, recipes and ingredient lists from a JSONL file of jobs.
+
+    python -m skillet.batch jobs.jsonl -o results.jsonl --concurrency 8 --rate 4
+
+One job per line; "type" may be left out when the other keys make it clear:
+
+    {"id": "p1", "type": "meal_plan", "preferences": {"cooking_style": "Italian", "dietary_restrictions": ["Vegan"]}}
+    {"id": "d1", "type": "recipe", "dish": "Beef Tehari", "ingredients": true}
+    {"id": "r1", "type": "ingredients", "recipe": "Fry two onions in ghee, ..."}
+
+Jobs go through the same prompt builders, models, request profiles and parsers as the
+apps: recipes as app1.py asks for them, meal plans and ingredient lists as app.py does. A
+batch run therefore shares cached responses with the apps, as long as an app has not yet
+adapted max_tokens for that purpose away from the profile defaults. Up to --concurrency
+jobs run at once while the input is read lazily, and each result is appended to the
+output as one JSON line as soon as it finishes:
+
+    {"id": "r1", "type": "ingredients", "status": "ok", "elapsed": 1.92, "shopping_list": {...}}
+
+The output doubles as the checkpoint: a rerun skips ids already written with status
+"ok", so an interrupted run resumes where it stopped and failed jobs are tried again.
+Successful lines can be fed straight to python -m skillet.aggregate.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Set, TextIO
+
+from skillet.cache import open_cache
+from skillet.cassette import transport_from_env
+from skillet.euron import EURON_MODEL, EuronClient
+from skillet.limiter import Priority, RateLimiter
+from skillet.menu import MENU_ITEMS
+from skillet.models import content_digest, parse_json_reply, parse_shopping_list, parse_week
+from skillet.profiles import AdaptiveProfiles
+from skillet.prompts import (
+    MENU_CONTEXT_K, ingredient_messages, kitchen_prompt, meal_plan_messages, recipe_request
+)
+from skillet.search import MenuIndex
+
+JOB_TYPES = ("meal_plan", "recipe", "ingredients")
+# Preferences a job doesn't set take the apps' defaults
+DEFAULT_PREFERENCES = {
+    "cooking_style": "Bangladeshi",
+    "expertise_level": "Intermediate",
+    "dietary_restrictions": [],
+    "spice_level": "Medium",
+    "serving_size": "4-6 people",
+}
+SECRETS_PATH = os.path.join(".streamlit", "secrets.toml")
+BATCH_MAX_WAIT = 86400.0
+
+
+class JobError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    id: str
+    type: str
+    data: Dict[str, Any]
+
+    # Lines without an "id" are named after their content, so reruns still recognise them
+    @classmethod
+    def from_line(cls, line: str) -> "Job":
+        fallback = content_digest(line.strip())[:16]
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return cls(fallback, "invalid", {"error": "not valid JSON"})
+        if not isinstance(data, dict):
+            return cls(fallback, "invalid", {"error": "a job must be a JSON object"})
+        job_type = data.get("type") or ("ingredients" if "recipe" in data else "recipe" if "dish" in data
+                                        else "meal_plan" if "preferences" in data else "")
+        job_id = str(data.get("id") or fallback)
+        if job_type not in JOB_TYPES:
+            return cls(job_id, "invalid", {"error": f"unknown job type {job_type!r}, expected one of {', '.join(JOB_TYPES)}"})
+        return cls(job_id, job_type, data)
+
+    @property
+    def preferences(self) -> Dict[str, Any]:
+        return {**DEFAULT_PREFERENCES, **(self.data.get("preferences") or {})}
+
+
+def read_jobs(path: str) -> Iterator[Job]:
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in f:
+            if line.strip():
+                yield Job.from_line(line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+# Ids already written with status "ok"; a line cut short by a crash is ignored
+def completed_ids(path: str) -> Set[str]:
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(result, dict) and result.get("status") == "ok":
+                done.add(str(result.get("id")))
+    return done
+
+
+# Appends results one line at a time, after finishing any line a crash left open
+def open_output(path: str) -> TextIO:
+    if path == "-":
+        return sys.stdout
+    if os.path.exists(path) and os.path.getsize(path):
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+        out = open(path, "a", encoding="utf-8")
+        if needs_newline:
+            out.write("\n")
+        return out
+    return open(path, "a", encoding="utf-8")
+
+
+class BatchRunner:
+    # client asks as app.py does and recipe_client (client by default) as app1.py does.
+    # Temperature, max_tokens and the (connect, read) timeouts come from the request
+    # profiles; the per-call deadlines are left to the apps, since batch jobs would rather
+    # wait for a slot than fail
+    def __init__(self, client: EuronClient, index: Optional[MenuIndex] = None, today: Optional[str] = None,
+                 profiles: Optional[AdaptiveProfiles] = None, recipe_client: Optional[EuronClient] = None):
+        self.client = client
+        self.recipe_client = recipe_client or client
+        self.index = index
+        self.today = today
+        self.profiles = profiles or client.profiles or AdaptiveProfiles()
+
+    def _complete(self, purpose: str, messages, client: Optional[EuronClient] = None) -> str:
+        settings = self.profiles.settings(purpose)
+        content = (client or self.client).complete(
+            messages, temperature=settings.temperature, max_tokens=settings.max_tokens, session="batch",
+            priority=Priority.EXTRACTION, purpose=purpose, deadline=False)
+        if content.startswith("Error:"):
+            raise JobError(content[len("Error:"):].strip())
+        return content
+
+    def _parsed(self, purpose: str, messages, parse: Callable) -> Any:
+        content = self._complete(purpose, messages)
+        try:
+            parsed = parse(parse_json_reply(content))
+        except ValueError as e:
+            raise JobError(f"could not parse the reply as JSON: {str(e)}")
+        if not parsed:
+            raise JobError("the reply had no usable content")
+        return parsed
+
+    def shopping_list(self, recipe_text: str) -> Dict[str, Any]:
+        shopping_list = self._parsed("extraction", ingredient_messages(recipe_text), parse_shopping_list)
+        return {category: [item.to_json() for item in items] for category, items in shopping_list.items()}
+
+    def meal_plan(self, job: Job) -> Dict[str, Any]:
+        week = self._parsed("meal_plan", meal_plan_messages(job.preferences, self.today), parse_week)
+        return {"meal_plan": {day: {meal_type: meal.to_json() for meal_type, meal in plan.meals.items()}
+                              for day, plan in week.items()}}
+
+    # As app1 asks for a recipe: the request plus the closest menu dishes as context
+    def recipe(self, job: Job) -> Dict[str, Any]:
+        dish = str(job.data.get("dish") or "").strip()
+        if not dish:
+            raise JobError("recipe jobs need a \"dish\"")
+        prompt = recipe_request(dish)
+        menu_items = self.index.hybrid_search(prompt, limit=MENU_CONTEXT_K) if self.index is not None else []
+        messages = [{"role": "system", "content": kitchen_prompt(job.preferences, "recipe_request", menu_items,
+                                                                 self.today)},
+                    {"role": "user", "content": prompt}]
+        result: Dict[str, Any] = {"recipe": self._complete("chat", messages, self.recipe_client)}
+        if job.data.get("ingredients"):
+            result["shopping_list"] = self.shopping_list(result["recipe"])
+        return result
+
+    def run(self, job: Job) -> Dict[str, Any]:
+        start = time.perf_counter()
+        result: Dict[str, Any] = {"id": job.id, "type": job.type}
+        try:
+            if job.type == "invalid":
+                raise JobError(job.data["error"])
+            if job.type == "meal_plan":
+                output = self.meal_plan(job)
+            elif job.type == "recipe":
+                output = self.recipe(job)
+            else:
+                recipe_text = str(job.data.get("recipe") or "").strip()
+                if not recipe_text:
+                    raise JobError("ingredients jobs need a \"recipe\"")
+                output = {"shopping_list": self.shopping_list(recipe_text)}
+            result.update(status="ok", elapsed=round(time.perf_counter() - start, 3), **output)
+        except JobError as e:
+            result.update(status="error", elapsed=round(time.perf_counter() - start, 3), error=str(e))
+        except Exception as e:
+            logging.error(f"Batch job {job.id} failed: {str(e)}")
+            result.update(status="error", elapsed=round(time.perf_counter() - start, 3), error=f"unexpected: {str(e)}")
+        return result
+
+
+@dataclass
+class BatchStats:
+    ok: int = 0
+    failed: int = 0
+    skipped: int = 0
+    started: float = 0.0
+
+    def line(self) -> str:
+        done = self.ok + self.failed
+        rate = done / max(time.perf_counter() - self.started, 1e-9)
+        return f"{done} done ({self.ok} ok, {self.failed} failed), {self.skipped} already done, {rate:.2f} jobs/s"
+
+
+# Runs jobs on a thread pool with at most `concurrency` in flight; results are written by
+# the event loop as they complete, so output order is completion order
+async def run_batch(runner: BatchRunner, jobs: Iterator[Job], out: TextIO, concurrency: int = 4,
+                    skip: Optional[Set[str]] = None, progress_every: int = 0) -> BatchStats:
+    skip = skip or set()
+    stats = BatchStats(started=time.perf_counter())
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(concurrency)
+    tasks: Set[asyncio.Task] = set()
+
+    async def run_one(job: Job, executor: ThreadPoolExecutor):
+        try:
+            result = await loop.run_in_executor(executor, runner.run, job)
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            if result["status"] == "ok":
+                stats.ok += 1
+            else:
+                stats.failed += 1
+            if progress_every and (stats.ok + stats.failed) % progress_every == 0:
+                print(stats.line(), file=sys.stderr)
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="skillet-batch") as executor:
+        try:
+            for job in jobs:
+                if job.id in skip:
+                    stats.skipped += 1
+                    continue
+                # Read the next job only once a slot is free, so memory stays bounded
+                await slots.acquire()
+                task = asyncio.create_task(run_one(job, executor))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+    return stats
+
+
+# EURON_API_KEY, or [euron] api_key from the apps' Streamlit secrets file
+def api_key_from_env(secrets_path: str = SECRETS_PATH) -> Optional[str]:
+    key = os.environ.get("EURON_API_KEY")
+    if key:
+        return key
+    try:
+        with open(secrets_path, "rb") as f:
+            return tomllib.load(f).get("euron", {}).get("api_key") or None
+    except (OSError, tomllib.TOMLDecodeError):
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m skillet.batch", description=__doc__.splitlines()[0])
+    parser.add_argument("jobs", help="JSONL file of jobs, or - for stdin")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="JSONL results, appended (- for stdout)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="jobs in flight at once")
+    parser.add_argument("--rate", type=float, default=2.0, help="upstream requests per second, 0 for no limit")
+    parser.add_argument("--cache", help="shared cache URL (default: SKILLET_CACHE_URL or the local SQLite cache)")
+    parser.add_argument("--no-resume", action="store_true", help="run every job even if it is already in the output")
+    parser.add_argument("--no-menu", action="store_true", help="leave the menu context out of recipe prompts")
+    parser.add_argument("--progress", type=int, default=25, help="print progress every N jobs, 0 for never")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    limiter = None
+    if args.rate > 0:
+        # One session for the whole batch, allowed the full rate, and waiting as long as it takes
+        # (up to BATCH_MAX_WAIT) instead of failing jobs
+        limiter = RateLimiter(global_rate=args.rate, global_burst=args.concurrency, session_rate=args.rate,
+                              session_burst=args.concurrency, per_minute=None,
+                              max_wait={Priority.EXTRACTION: BATCH_MAX_WAIT})
+    shared = {"retries": 3, "cache": open_cache(args.cache), "transport": transport_from_env(), "limiter": limiter,
+              "profiles": AdaptiveProfiles()}
+    # app.py's model for meal plans and ingredient lists, app1.py's models (with the fallback) for recipes
+    client = EuronClient(api_key_from_env, models=(EURON_MODEL,), **shared)
+    recipe_client = EuronClient(api_key_from_env, **shared)
+    runner = BatchRunner(client, None if args.no_menu else MenuIndex(MENU_ITEMS), recipe_client=recipe_client)
+
+    skip = set() if args.no_resume or args.output == "-" else completed_ids(args.output)
+    out = open_output(args.output)
+    try:
+        stats = asyncio.run(run_batch(runner, read_jobs(args.jobs), out, args.concurrency, skip, args.progress))
+    except KeyboardInterrupt:
+        print("Interrupted; finished jobs are saved and a rerun resumes from them", file=sys.stderr)
+        return 130
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(stats.line(), file=sys.stderr)
+    return 0 if stats.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
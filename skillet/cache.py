@@ -0,0 +1,280 @@
+"""Key/value cache shared by every Streamlit worker: SQLite on one host, Redis across hosts.
+
+Pick the backend with SKILLET_CACHE_URL:
+  sqlite:///path/to/file.sqlite3   (default: <SKILLET_CACHE_DIR>/shared.sqlite3)
+  redis://[:password@]host:port/db
+  memory://                        (this process only)
+
+A cache failure is logged and treated as a miss, so a down Redis never breaks a page.
+"""
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+CACHE_DIR = os.environ.get("SKILLET_CACHE_DIR", ".cache")
+
+
+class CacheError(Exception):
+    pass
+
+
+class SharedCache:
+    errors: Tuple[type, ...] = (CacheError,)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: bytes, ttl: Optional[float]):
+        raise NotImplementedError
+
+    def _incr(self, key: str, amount: int, ttl: Optional[float]) -> int:
+        raise NotImplementedError
+
+    def _delete(self, key: str):
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._get(key)
+        except self.errors as e:
+            logging.error(f"Cache get failed for {key}: {str(e)}")
+            return None
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        try:
+            self._set(key, value, ttl)
+        except self.errors as e:
+            logging.error(f"Cache set failed for {key}: {str(e)}")
+
+    # Atomic counter; ttl only applies when the counter is created, as with INCRBY + EXPIRE NX
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        try:
+            return self._incr(key, amount, ttl)
+        except self.errors as e:
+            logging.error(f"Cache incr failed for {key}: {str(e)}")
+            return amount
+
+    def delete(self, key: str):
+        try:
+            self._delete(key)
+        except self.errors as e:
+            logging.error(f"Cache delete failed for {key}: {str(e)}")
+
+    def get_json(self, key: str) -> Any:
+        data = self.get(key)
+        return None if data is None else json.loads(data)
+
+    def set_json(self, key: str, value: Any, ttl: Optional[float] = None):
+        self.set(key, json.dumps(value).encode(), ttl)
+
+    def get_or_set(self, key: str, compute: Callable[[], bytes], ttl: Optional[float] = None) -> bytes:
+        data = self.get(key)
+        if data is None:
+            data = compute()
+            self.set(key, data, ttl)
+        return data
+
+
+class MemoryCache(SharedCache):
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str):
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self._entries[key]
+            return None
+        return entry
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._live(key)
+        if entry is None:
+            return None
+        return str(entry[0]).encode() if isinstance(entry[0], int) else entry[0]
+
+    def _set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl if ttl else None)
+
+    def _incr(self, key, amount, ttl):
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                entry = (0, time.time() + ttl if ttl else None)
+            value = int(entry[0]) + amount
+            self._entries[key] = (value, entry[1])
+            return value
+
+    def _delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SQLiteCache(SharedCache):
+    # One file shared by every worker on the host. WAL lets readers run alongside a
+    # writer; each thread keeps its own connection.
+    errors = (CacheError, sqlite3.Error)
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, key):
+        row = self._connect().execute(
+            "SELECT value FROM entries WHERE key = ? AND (expires IS NULL OR expires > ?)", (key, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return str(row[0]).encode() if isinstance(row[0], int) else row[0]
+
+    def _set(self, key, value, ttl):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires) VALUES (?, ?, ?)",
+            (key, sqlite3.Binary(value), time.time() + ttl if ttl else None),
+        )
+
+    def _incr(self, key, amount, ttl):
+        now = time.time()
+        row = self._connect().execute(
+            """
+            INSERT INTO entries (key, value, expires) VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                value = CASE WHEN expires IS NOT NULL AND expires <= ? THEN excluded.value
+                             ELSE CAST(value AS INTEGER) + excluded.value END,
+                expires = CASE WHEN expires IS NOT NULL AND expires <= ? THEN excluded.expires ELSE expires END
+            RETURNING value
+            """,
+            (key, amount, now + ttl if ttl else None, now, now),
+        ).fetchone()
+        return int(row[0])
+
+    def _delete(self, key):
+        self._connect().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def purge(self) -> int:
+        return self._connect().execute("DELETE FROM entries WHERE expires <= ?", (time.time(),)).rowcount
+
+
+class RedisCache(SharedCache):
+    # Minimal RESP2 client for GET/SET/INCRBY/PEXPIRE/DEL, so Redis needs no extra
+    # dependency; anything that speaks the protocol works as the server. After a
+    # connection error the server is left alone for retry_after seconds.
+    errors = (CacheError, OSError)
+
+    def __init__(self, url: str = "redis://localhost:6379/0", timeout: float = 2.0, prefix: str = "skillet:",
+                 retry_after: float = 5.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.prefix = prefix
+        self.retry_after = retry_after
+        self._down_until = 0.0
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if time.time() < self._down_until:
+                raise CacheError("Redis unavailable")
+            try:
+                sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            except OSError:
+                self._down_until = time.time() + self.retry_after
+                raise
+            conn = self._local.conn = (sock, sock.makefile("rb"))
+            if self.password:
+                self._command("AUTH", self.password)
+            if self.db:
+                self._command("SELECT", str(self.db))
+        return conn
+
+    def _command(self, *args):
+        sock, reader = self._connection()
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        try:
+            sock.sendall(b"".join(parts))
+            return self._reply(reader)
+        except OSError:
+            self._local.conn = None
+            sock.close()
+            raise
+
+    def _reply(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise CacheError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(body)
+            return None if count < 0 else [self._reply(reader) for _ in range(count)]
+        raise CacheError(f"Unexpected reply {line!r}")
+
+    def _get(self, key):
+        return self._command("GET", self.prefix + key)
+
+    def _set(self, key, value, ttl):
+        if ttl:
+            self._command("SET", self.prefix + key, value, "PX", int(ttl * 1000))
+        else:
+            self._command("SET", self.prefix + key, value)
+
+    def _incr(self, key, amount, ttl):
+        value = self._command("INCRBY", self.prefix + key, amount)
+        if ttl and value == amount:
+            self._command("PEXPIRE", self.prefix + key, int(ttl * 1000))
+        return value
+
+    def _delete(self, key):
+        self._command("DEL", self.prefix + key)
+
+
+def open_cache(url: Optional[str] = None) -> SharedCache:
+    url = url or os.environ.get("SKILLET_CACHE_URL") or f"sqlite:///{os.path.join(CACHE_DIR, 'shared.sqlite3')}"
+    if url.startswith("redis://"):
+        return RedisCache(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteCache(url[len("sqlite:///"):])
+    if url == "memory://":
+        return MemoryCache()
+    raise ValueError(f"Unsupported cache URL: {url}")
@@ -0,0 +1,118 @@
+"""Record Euron API traffic to gzip JSONL cassettes and replay it offline.
+
+Both classes are EuronClient transports. Recording wraps the real one:
+
+    SKILLET_RECORD=.cache/cassettes/today.jsonl.gz streamlit run app.py
+
+and replaying serves the recorded responses without the network:
+
+    SKILLET_REPLAY=.cache/cassettes/today.jsonl.gz SKILLET_REPLAY_TIMING=1 streamlit run app.py
+
+Each line holds the request payload (never the headers, so no API key), the status,
+the response body, when the request started and how long it took.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+import requests
+
+from skillet.euron import post_json
+
+
+def request_key(payload: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def read_cassette(path: str) -> Iterator[Dict[str, Any]]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class RecordingTransport:
+    def __init__(self, path: str, transport: Callable = post_json):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.transport = transport
+        self._lock = threading.Lock()
+
+    def _write(self, entry: Dict[str, Any]):
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        # One gzip member per entry: appends from several threads or runs stay readable
+        with self._lock, gzip.open(self.path, "at", encoding="utf-8") as f:
+            f.write(line)
+
+    def __call__(self, url: str, json: Dict[str, Any], **kwargs) -> requests.Response:
+        entry = {"url": url, "request": json, "started": time.time()}
+        start = time.perf_counter()
+        try:
+            response = self.transport(url, json=json, **kwargs)
+        except requests.exceptions.RequestException as e:
+            entry.update(elapsed=time.perf_counter() - start, error=type(e).__name__, message=str(e))
+            self._write(entry)
+            raise
+        entry.update(elapsed=time.perf_counter() - start, status=response.status_code, body=response.text)
+        self._write(entry)
+        return response
+
+
+class ReplayTransport:
+    # Responses are served per request payload in recorded order, wrapping around when a
+    # request is repeated more often than it was recorded. With timing, each reply waits
+    # as long as the original did, divided by speed.
+    def __init__(self, path: str, timing: bool = False, speed: float = 1.0):
+        self.path = path
+        self.timing = timing
+        self.speed = speed
+        self.entries: List[Dict[str, Any]] = list(read_cassette(path))
+        self._by_request: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        for entry in self.entries:
+            self._by_request[request_key(entry["request"])].append(entry)
+        self._lock = threading.Lock()
+        self.misses = 0
+
+    def _next(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            recorded = self._by_request.get(request_key(payload))
+            if not recorded:
+                self.misses += 1
+                return None
+            entry = recorded.popleft()
+            recorded.append(entry)
+            return entry
+
+    def __call__(self, url: str, json: Dict[str, Any], **kwargs) -> requests.Response:
+        entry = self._next(json)
+        if entry is None:
+            raise requests.exceptions.ConnectionError(f"No recording for this request in {self.path}")
+        if self.timing:
+            time.sleep(entry["elapsed"] / self.speed)
+        if "error" in entry:
+            error = getattr(requests.exceptions, entry["error"], requests.exceptions.RequestException)
+            raise error(entry["message"])
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response._content = entry["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = url
+        return response
+
+
+# The transport selected by SKILLET_RECORD / SKILLET_REPLAY, or the plain network one
+def transport_from_env(transport: Callable = post_json) -> Callable:
+    replay = os.environ.get("SKILLET_REPLAY")
+    if replay:
+        return ReplayTransport(replay, timing=os.environ.get("SKILLET_REPLAY_TIMING") == "1")
+    record = os.environ.get("SKILLET_RECORD")
+    if record:
+        return RecordingTransport(record, transport)
+    return transport
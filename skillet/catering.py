@@ -0,0 +1,99 @@
+"""Catering order optimizer: cheapest mix of trays and single servings for a headcount."""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from skillet.menu import MenuItem, serving_bounds
+
+# People served by one unit of pricing options that have no serving_info entry
+UNIT_SERVINGS = {"per_serving": 1, "per count": 1, "per glass": 1, "Whole Cake": 8}
+
+
+# (option, price, people served) for every orderable pricing option of a dish.
+# Tray ranges like "15-17 people" count as the low end unless conservative is False.
+def serving_options(item: MenuItem, conservative: bool = True) -> List[Tuple[str, float, int]]:
+    options = []
+    for option, price in item.pricing.items():
+        bounds = serving_bounds(item.serving_info.get(option, ""))
+        serves = (bounds[0] if conservative else bounds[1]) if bounds else UNIT_SERVINGS.get(option)
+        if serves:
+            options.append((option, float(price), serves))
+    return options
+
+
+# Min-cost covering knapsack: non-negative counts per option with total people >= guests.
+# Each option is split into 0/1 blocks of 1, 2, 4, ... units so every block is a single
+# vectorized NumPy update over the capacity axis; keeping which blocks were taken lets
+# the counts be read back. O(guests * log(guests)) per option.
+def min_cost_mix(options: List[Tuple[str, float, int]], guests: int) -> Tuple[float, Dict[str, int]]:
+    if guests <= 0 or not options:
+        return 0.0, {}
+    size = guests + max(serves for _, _, serves in options)
+    cost = np.full(size, np.inf)
+    cost[0] = 0.0
+    stages = []
+    for option, price, serves in options:
+        units = 1
+        while units * serves < size:
+            step = units * serves
+            candidate = np.full(size, np.inf)
+            candidate[step:] = cost[:-step] + units * price
+            taken = candidate < cost
+            cost = np.where(taken, candidate, cost)
+            stages.append((option, units, step, taken))
+            units *= 2
+    best = guests + int(np.argmin(cost[guests:]))
+    counts: Dict[str, int] = {}
+    capacity = best
+    for option, units, step, taken in reversed(stages):
+        if taken[capacity]:
+            counts[option] = counts.get(option, 0) + units
+            capacity -= step
+    return round(float(cost[best]), 2), counts
+
+
+@dataclass
+class DishOrder:
+    item: MenuItem
+    guests: int
+    counts: Dict[str, int]
+    feeds: int
+    cost: float
+
+    def describe(self) -> str:
+        return " + ".join(f"{self.counts[option]} × {option.replace('_', ' ').title()}"
+                          for option in self.item.pricing if option in self.counts)
+
+
+@dataclass
+class CateringOrder:
+    dishes: List[DishOrder] = field(default_factory=list)
+
+    @property
+    def total_cost(self) -> float:
+        return sum(dish.cost for dish in self.dishes)
+
+    def rows(self) -> List[Dict]:
+        return [{"Dish": dish.item.dish_name, "Order": dish.describe(), "Guests": dish.guests,
+                 "Feeds": dish.feeds, "Cost ($)": round(dish.cost, 2)} for dish in self.dishes]
+
+
+class CateringOptimizer:
+    def __init__(self, conservative: bool = True):
+        self.conservative = conservative
+        # Many dishes share a price sheet, so solutions are reused per (options, guests)
+        self._solved: Dict[Tuple, Tuple[float, Dict[str, int]]] = {}
+
+    def optimize(self, items: Iterable[MenuItem], guests: int) -> CateringOrder:
+        order = CateringOrder()
+        for item in items:
+            options = serving_options(item, self.conservative)
+            key = (tuple(options), guests)
+            if key not in self._solved:
+                self._solved[key] = min_cost_mix(options, guests)
+            cost, counts = self._solved[key]
+            serves = {option: people for option, _, people in options}
+            feeds = sum(serves[option] * count for option, count in counts.items())
+            order.dishes.append(DishOrder(item, guests, dict(counts), feeds, cost))
+        return order
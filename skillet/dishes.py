@@ -0,0 +1,194 @@
+"""Fuzzy dish-name resolution: misspelled and transliterated names back to menu items.
+
+DishResolver is built once per catalog. Dish names and queries are reduced to the same
+word keys (accents dropped, plurals folded, spelling variants like "biriyani"/"biryani",
+"seekh"/"sheek" or "zarda"/"jorda" collapsed), and each key is looked up SymSpell-style:
+every string a few deletes away from a catalog word points back to it, so a lookup is a
+handful of dict hits rather than a comparison with every dish. A name such as
+"Malai Sheek Kebab (Beef/Chicken)" is indexed as each of its variants.
+"""
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Sequence, Set, Tuple
+
+from skillet.menu import MenuItem
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+PAREN_RE = re.compile(r"\(([^)]*)\)")
+DOUBLE_RE = re.compile(r"(.)\1+")
+
+# Applied in order to every word; spellings of the same sound end up as one key
+TRANSLITERATIONS = [("sh", "s"), ("kh", "k"), ("gh", "g"), ("ph", "f"), ("q", "k"), ("z", "j"), ("ee", "i"),
+                    ("oo", "u"), ("y", "i")]
+
+
+# Edits allowed between two keys of this length
+def max_distance(length: int) -> int:
+    return 0 if length <= 2 else 1 if length <= 4 else 2
+
+
+@lru_cache(maxsize=65536)
+def word_key(word: str) -> str:
+    # Plural folding as in search.tokenize, plus "tomatoes" -> "tomato"
+    if len(word) > 4 and word.endswith("oes"):
+        word = word[:-2]
+    elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    for old, new in TRANSLITERATIONS:
+        word = word.replace(old, new)
+    return DOUBLE_RE.sub(r"\1", word)
+
+
+def text_keys(text: str) -> List[str]:
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode().lower()
+    return [word_key(word) for word in TOKEN_RE.findall(text)]
+
+
+# "Malai Sheek Kebab (Beef/Chicken)" -> the bare name, and the name with each option in
+# front and behind, as people and the LLM write it
+def name_variants(name: str) -> List[str]:
+    base = " ".join(PAREN_RE.sub(" ", name).split())
+    variants = [base]
+    for group in PAREN_RE.findall(name):
+        for option in filter(None, (part.strip() for part in group.split("/"))):
+            variants += [f"{option} {base}", f"{base} {option}"]
+    return variants
+
+
+def deletes(word: str, distance: int) -> Set[str]:
+    found, edge = {word}, {word}
+    for _ in range(distance):
+        edge = {w[:i] + w[i + 1:] for w in edge for i in range(len(w))} - found
+        found |= edge
+    return found
+
+
+# Optimal string alignment distance (adjacent swaps count as one edit), or limit + 1 once it
+# is certainly over limit
+def edit_distance(a: str, b: str, limit: int) -> int:
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+class DishResolver:
+    def __init__(self, items: Sequence[MenuItem]):
+        self.items = list(items)
+        # (item index, variant keys) for every variant of every name, and the same keys as
+        # a set for scoring
+        self.variants: List[Tuple[int, List[str]]] = []
+        for index, item in enumerate(self.items):
+            for variant in name_variants(item.dish_name):
+                keys = text_keys(variant)
+                if keys:
+                    self.variants.append((index, keys))
+        self.key_sets: List[Tuple[int, frozenset]] = [(index, frozenset(keys)) for index, keys in self.variants]
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.starts: Dict[str, List[int]] = defaultdict(list)
+        for v, (_, keys) in enumerate(self.key_sets):
+            for key in keys:
+                self.postings[key].append(v)
+            self.starts[self.variants[v][1][0]].append(v)
+        # Words shared by many dishes ("chicken", "biryani") weigh less than distinctive ones
+        counts: Dict[str, Set[int]] = defaultdict(set)
+        for index, keys in self.key_sets:
+            for key in keys:
+                counts[key].add(index)
+        self.weights = {key: math.log(1 + len(self.items) / len(indices)) for key, indices in counts.items()}
+        self.totals = [sum(self.weights[key] for key in keys) for _, keys in self.key_sets]
+        self.deletes: Dict[str, Set[str]] = defaultdict(set)
+        for key in self.weights:
+            for deleted in deletes(key, max_distance(len(key))):
+                self.deletes[deleted].add(key)
+        self.lookup = lru_cache(maxsize=4096)(self._lookup)
+
+    # Catalog words within the allowed edits of a key, with a 0-1 similarity
+    def _lookup(self, key: str) -> Dict[str, float]:
+        if key in self.weights:
+            return {key: 1.0}
+        matches = {}
+        for deleted in deletes(key, max_distance(len(key))):
+            for word in self.deletes.get(deleted, ()):
+                if word in matches:
+                    continue
+                limit = max_distance(min(len(key), len(word)))
+                distance = edit_distance(key, word, limit)
+                if distance <= limit:
+                    matches[word] = 1 - distance / max(len(key), len(word))
+        return matches
+
+    # Keys of a text with each one's matches; a word with none that is two catalog
+    # words run together ("cheesecake") is split into them
+    def _matched(self, text: str) -> List[Dict[str, float]]:
+        matched = []
+        for key in text_keys(text):
+            matches = self.lookup(key)
+            if not matches and len(key) >= 6:
+                for i in range(3, len(key) - 2):
+                    if key[:i] in self.weights and key[i:] in self.weights:
+                        matched += [{key[:i]: 1.0}, {key[i:]: 1.0}]
+                        break
+                else:
+                    matched.append(matches)
+            else:
+                matched.append(matches)
+        return matched
+
+    # Item index -> score for every dish the text names at least in part: the weighted
+    # share of the dish name the text covers, times the share of the text that is this name
+    def scores(self, text: str) -> Dict[int, float]:
+        matched = self._matched(text)
+        best: Dict[str, float] = {}
+        for matches in matched:
+            for word, similarity in matches.items():
+                best[word] = max(best.get(word, 0.0), similarity)
+        scores: Dict[int, float] = {}
+        for v in {v for word in best for v in self.postings[word]}:
+            index, keys = self.key_sets[v]
+            recall = sum(self.weights[key] * best.get(key, 0.0) for key in keys) / self.totals[v]
+            precision = sum(1 for matches in matched if not keys.isdisjoint(matches)) / len(matched)
+            score = recall * (0.75 + 0.25 * precision)
+            if score > scores.get(index, 0.0):
+                scores[index] = score
+        return scores
+
+    # Best matching dishes for a name or query, with scores from 0 to 1
+    def resolve(self, text: str, limit: int = 3, cutoff: float = 0.5) -> List[Tuple[MenuItem, float]]:
+        ranked = sorted(((score, index) for index, score in self.scores(text).items() if score >= cutoff),
+                        key=lambda pair: (-pair[0], pair[1]))
+        return [(self.items[index], score) for score, index in ranked[:limit]]
+
+    # Dishes named in free text such as an LLM answer, in order of first mention. Every
+    # word of a dish name has to appear in sequence; the longest name wins where they overlap.
+    def mentions(self, text: str) -> List[MenuItem]:
+        matched = self._matched(text)
+        found: Dict[int, None] = {}
+        i = 0
+        while i < len(matched):
+            best_index, best_length = None, 0
+            for word in matched[i]:
+                for v in self.starts.get(word, ()):
+                    index, keys = self.variants[v]
+                    if len(keys) > best_length and all(
+                            i + j < len(matched) and key in matched[i + j] for j, key in enumerate(keys)):
+                        best_index, best_length = index, len(keys)
+            if best_index is None:
+                i += 1
+            else:
+                found.setdefault(best_index, None)
+                i += best_length
+        return [self.items[index] for index in found]
+
@@ -0,0 +1,250 @@
+"""Euron chat-completions client with model fallback, retries and a shared response cache."""
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+
+from skillet.cache import SharedCache
+from skillet.limiter import Priority, RateLimited, RateLimiter
+from skillet.profiles import AdaptiveProfiles, completion_tokens
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder writes the same bytes, only slower
+    orjson = None
+
+EURON_API_URL = "https://api.euron.one/api/v1/euri/alpha/chat/completions"
+EURON_MODEL = "gemini-2.5-pro-exp-03-25"
+FALLBACK_MODEL = "gemini-pro"
+# Successful responses are reused by every worker for this long
+RESPONSE_TTL = 86400
+
+
+# Compact JSON straight to UTF-8 bytes, with orjson when it is installed
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys).encode()
+
+
+def response_key(models: Sequence[str], messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+    request = dumps([list(models), messages, temperature, max_tokens], sort_keys=True)
+    return "euron:response:" + hashlib.sha256(request).hexdigest()
+
+
+# Upstream requests sent in the current minute, across every worker using the cache
+def requests_key(now: Optional[float] = None) -> str:
+    return f"euron:requests:{int((now or time.time()) // 60)}"
+
+
+_session = requests.Session()
+
+
+# The default transport. The payload is encoded once, straight to bytes, and sent over a
+# pooled keep-alive connection; responses may come back compressed with any encoding
+# urllib3 can decode (gzip and deflate, plus br and zstd when brotli or zstandard is installed).
+def post_json(url: str, headers: Dict[str, str], json: Any, timeout=None) -> requests.Response:
+    headers = {**headers, "Content-Type": "application/json", "Accept-Encoding": ACCEPT_ENCODING}
+    return _session.post(url, headers=headers, data=dumps(json), timeout=timeout)
+
+
+class EuronClient:
+    # transport is called like requests.post(url, headers=..., json=..., timeout=...)
+    # and must return a requests.Response-like object, so tests and replays can swap it.
+    def __init__(self, api_key_provider: Callable[[], Optional[str]],
+                 models: Sequence[str] = (EURON_MODEL, FALLBACK_MODEL), timeout: Optional[float] = 5,
+                 retries: int = 3, initial_delay: float = 2, cache: Optional[SharedCache] = None,
+                 cache_ttl: float = RESPONSE_TTL, transport: Callable = post_json,
+                 limiter: Optional[RateLimiter] = None, profiles: Optional[AdaptiveProfiles] = None):
+        self.api_key_provider = api_key_provider
+        self.models = tuple(models)
+        self.timeout = timeout
+        self.retries = retries
+        self.initial_delay = initial_delay
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.transport = transport
+        self.limiter = limiter
+        self.profiles = profiles
+
+    def key_for(self, messages: List[Dict[str, str]], temperature: float = 0.7, max_tokens: int = 1000) -> str:
+        return response_key(self.models, messages, temperature, max_tokens)
+
+    def is_cached(self, messages: List[Dict[str, str]], temperature: float = 0.7, max_tokens: int = 1000) -> bool:
+        return self.cache is not None and self.cache.get(self.key_for(messages, temperature, max_tokens)) is not None
+
+    # session and priority place the request in the limiter's fair queue; cached
+    # responses are returned without waiting. With profiles, purpose picks the connect and
+    # read timeouts and the deadline for all attempts together, and the outcome is recorded;
+    # deadline=False keeps the timeouts but lets the call wait as long as its retries take.
+    def complete(self, messages: List[Dict[str, str]], temperature: float = 0.7, max_tokens: int = 1000,
+                 session: str = "default", priority: Priority = Priority.CHAT, purpose: Optional[str] = None,
+                 deadline: bool = True) -> str:
+        key = self.key_for(messages, temperature, max_tokens)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached.decode()
+        timeout, seconds = self.timeout, None
+        if self.profiles is not None and purpose is not None:
+            settings = self.profiles.settings(purpose)
+            timeout, seconds = settings.timeout, settings.deadline if deadline else None
+        call = _Call(timeout, seconds)
+        content = self._request(messages, temperature, max_tokens, session, priority, call)
+        if self.profiles is not None and purpose is not None:
+            self.profiles.record(purpose, call.latency, call.tokens, call.timeouts, call.retries, call.deadline_exceeded)
+        # Errors are never cached, so the next rerun tries the API again
+        if self.cache is not None and not content.startswith("Error:"):
+            self.cache.set(key, content.encode(), ttl=self.cache_ttl)
+        return content
+
+    def _request(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int, session: str,
+                 priority: Priority, call: Optional["_Call"] = None) -> str:
+        call = call or _Call(self.timeout)
+        api_key = self.api_key_provider()
+        if not api_key:
+            logging.error("No API key available")
+            return "Error: API key not configured. Please check your Streamlit secrets."
+
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        }
+
+        # Try primary model first, then fallback
+        for model in self.models:
+            payload = {
+                "messages": messages,
+                "model": model,
+                "max_tokens": max_tokens,
+                "temperature": temperature
+            }
+            # Full bodies only at DEBUG: encoding the whole history for every log line costs more
+            # than sending it
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(f"Sending API request with model {model}: {dumps(payload).decode()}")
+            else:
+                logging.info(f"Sending API request with model {model}: {len(messages)} messages")
+
+            for attempt in range(self.retries):
+                if call.expired():
+                    return call.deadline_error()
+                if self.limiter is not None:
+                    try:
+                        self.limiter.acquire(session, priority, max_wait=call.max_wait(priority, self.limiter))
+                    except RateLimited as e:
+                        logging.warning(f"Rate limited (model: {model}, attempt: {attempt+1}): {str(e)}")
+                        return "Error: Too many requests right now. Please try again in a moment."
+                if self.cache is not None:
+                    self.cache.incr(requests_key(), ttl=120)
+                timeout = call.attempt_timeout()
+                if attempt:
+                    call.retries += 1
+                try:
+                    start = time.monotonic()
+                    response = self.transport(EURON_API_URL, headers=headers, json=payload, timeout=timeout)
+                    response.raise_for_status()
+                    data = response.json()
+                    if logging.getLogger().isEnabledFor(logging.DEBUG):
+                        logging.debug(f"API response (model: {model}, attempt: {attempt+1}): {dumps(data).decode()}")
+
+                    # Flexible response parsing
+                    if 'choices' in data and len(data['choices']) > 0:
+                        choice = data['choices'][0]
+                        content = None
+                        if 'message' in choice and 'content' in choice['message']:
+                            content = choice['message']['content'].strip()
+                        elif 'text' in choice:
+                            content = choice['text'].strip()
+                        elif 'content' in choice:
+                            content = choice['content'].strip()
+                        if content is not None:
+                            call.latency = time.monotonic() - start
+                            call.tokens = completion_tokens(data, content)
+                            return content
+                    logging.warning(f"No valid content in API response (model: {model}, attempt: {attempt+1})")
+                    return "Error: No valid response content from API."
+
+                except requests.exceptions.HTTPError as e:
+                    logging.error(f"HTTP error (model: {model}, attempt: {attempt+1}): {str(e)} - Status: {e.response.status_code} - Response: {e.response.text}")
+                    if e.response.status_code in (429, 500) and attempt < self.retries - 1:
+                        delay = self.initial_delay * (2 ** attempt)
+                        if not call.can_wait(delay):
+                            return call.deadline_error()
+                        logging.info(f"Retrying after {delay} seconds due to {e.response.status_code} error...")
+                        time.sleep(delay)
+                        continue
+                    return f"Error: HTTP {e.response.status_code} - {e.response.text}"
+
+                except requests.exceptions.Timeout:
+                    call.timeouts += 1
+                    logging.error(f"Request timed out after {timeout} seconds (model: {model}, attempt: {attempt+1})")
+                    if attempt < self.retries - 1:
+                        delay = self.initial_delay * (2 ** attempt)
+                        if not call.can_wait(delay):
+                            return call.deadline_error()
+                        logging.info(f"Retrying after {delay} seconds due to timeout...")
+                        time.sleep(delay)
+                        continue
+                    return "Error: API request timed out after multiple attempts."
+
+                except requests.exceptions.RequestException as e:
+                    logging.error(f"Request error (model: {model}, attempt: {attempt+1}): {str(e)}")
+                    return f"Error: Failed to connect to API - {str(e)}"
+
+                except ValueError as e:
+                    logging.error(f"JSON decode error (model: {model}, attempt: {attempt+1}): {str(e)} - Response: {response.text}")
+                    return "Error: Invalid API response format."
+
+                except Exception as e:
+                    logging.error(f"Unexpected error (model: {model}, attempt: {attempt+1}): {str(e)}")
+                    return f"Error: Unexpected issue - {str(e)}"
+
+        return f"Error: Failed to get response with models {' and '.join(self.models)} after {self.retries} attempts."
+
+
+class _Call:
+    # Timeouts and outcome of one complete() call across all of its attempts. deadline is
+    # in seconds from now; each attempt's timeouts are cut to the time that is left.
+    def __init__(self, timeout, deadline: Optional[float] = None):
+        self.timeout = timeout
+        self.ends = None if deadline is None else time.monotonic() + deadline
+        self.deadline = deadline
+        self.latency: Optional[float] = None
+        self.tokens = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.deadline_exceeded = False
+
+    def remaining(self) -> Optional[float]:
+        return None if self.ends is None else self.ends - time.monotonic()
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def can_wait(self, delay: float) -> bool:
+        remaining = self.remaining()
+        return remaining is None or delay < remaining
+
+    def max_wait(self, priority: Priority, limiter: RateLimiter) -> float:
+        remaining = self.remaining()
+        return limiter.max_wait[priority] if remaining is None else min(limiter.max_wait[priority], remaining)
+
+    def attempt_timeout(self):
+        remaining = self.remaining()
+        if remaining is None:
+            return self.timeout
+        remaining = round(remaining, 2)
+        if isinstance(self.timeout, tuple):
+            return tuple(min(t, remaining) for t in self.timeout)
+        return remaining if self.timeout is None else min(self.timeout, remaining)
+
+    def deadline_error(self) -> str:
+        self.deadline_exceeded = True
+        logging.error(f"Request deadline of {self.deadline} seconds exceeded")
+        return f"Error: API request took longer than {self.deadline:g} seconds."
@@ -0,0 +1,102 @@
+"""Server-side thumbnails for menu photos, kept content-addressed in the shared cache."""
+import hashlib
+import io
+import logging
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+import requests
+from PIL import Image, ImageDraw, ImageFont, ImageOps, features
+
+from skillet.cache import SharedCache, open_cache
+
+THUMB_SIZE = (300, 200)
+# How long every worker skips a URL whose fetch failed
+FAILED_TTL = 600
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ThumbnailCache:
+    # Thumbnails are stored as thumb:blob:<sha256 of thumbnail bytes>. A small ref
+    # entry per (url, size) points at the thumbnail, so the same photo under two URLs
+    # is stored once and each URL is fetched from the origin once across all workers.
+    def __init__(self, store: Optional[SharedCache] = None, size: Tuple[int, int] = THUMB_SIZE, timeout: float = 5):
+        self.store = store or open_cache()
+        self.size = size
+        self.timeout = timeout
+        self.format = "WEBP" if features.check("webp") else "JPEG"
+        self._memory: Dict[str, bytes] = {}
+
+    def _ref_key(self, key: str, kind: str = "ref") -> str:
+        return f"thumb:{kind}:" + _sha256(f"{key}|{self.size[0]}x{self.size[1]}|{self.format}".encode())
+
+    def _load(self, key: str) -> Optional[bytes]:
+        digest = self.store.get(self._ref_key(key))
+        return None if digest is None else self.store.get(f"thumb:blob:{digest.decode()}")
+
+    def _store(self, key: str, data: bytes):
+        digest = _sha256(data)
+        blob_key = f"thumb:blob:{digest}"
+        if self.store.get(blob_key) is None:
+            self.store.set(blob_key, data)
+        self.store.set(self._ref_key(key), digest.encode())
+
+    def _encode(self, image: Image.Image) -> bytes:
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format=self.format, quality=80)
+        return buffer.getvalue()
+
+    def _render(self, url: str) -> bytes:
+        response = requests.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        with Image.open(io.BytesIO(response.content)) as source:
+            # Crop to fill the frame, like object-fit: cover
+            return self._encode(ImageOps.fit(ImageOps.exif_transpose(source), self.size, Image.LANCZOS))
+
+    def placeholder(self, label: str) -> bytes:
+        key = f"placeholder:{label}"
+        data = self._memory.get(key) or self._load(key)
+        if data is None:
+            image = Image.new("RGB", self.size, "#3e3e5e")
+            draw = ImageDraw.Draw(image)
+            try:
+                font = ImageFont.load_default(size=22)
+            except TypeError:  # Pillow < 10.1
+                font = ImageFont.load_default()
+            text = "\n".join(textwrap.wrap(label, width=20))
+            draw.multiline_text((self.size[0] / 2, self.size[1] / 2), text, fill="#ffffff", font=font,
+                                anchor="mm", align="center")
+            data = self._encode(image)
+            self._store(key, data)
+        self._memory[key] = data
+        return data
+
+    # Thumbnail bytes for a URL; fetched and resized on first use, then served from
+    # memory or the shared cache. Falls back to a locally drawn placeholder when the fetch fails.
+    def get(self, url: str, label: str = "") -> bytes:
+        data = self._memory.get(url)
+        if data is not None:
+            return data
+        data = self._load(url)
+        failed_key = self._ref_key(url, "failed")
+        if data is None and self.store.get(failed_key) is not None:
+            data = self.placeholder(label or "Image Not Available")
+        elif data is None:
+            try:
+                data = self._render(url)
+                self._store(url, data)
+            except Exception as e:
+                # Remembered so a broken URL is not refetched on every rerun or by other workers
+                logging.error(f"Thumbnail for {label or url} unavailable: {str(e)} - using placeholder")
+                self.store.set(failed_key, b"1", ttl=FAILED_TTL)
+                data = self.placeholder(label or "Image Not Available")
+        self._memory[url] = data
+        return data
+
+    def warm(self, entries: Iterable[Tuple[str, str]], workers: int = 8):
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda entry: self.get(*entry), entries))
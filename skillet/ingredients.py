@@ -0,0 +1,100 @@
+"""Per-dish ingredient table for the menu, scaled to an order and summed into a shopping list.
+
+Quantities are per serving and parsed into Ingredient records once at import, so a
+shopping list for any number of dishes is multiplication and unit-aware merging only.
+"""
+from typing import Dict, Iterable, List, Tuple
+
+from skillet.catering import serving_options
+from skillet.menu import MENU_ITEMS, MenuItem
+from skillet.models import Ingredient, Quantity, merge_shopping_list
+
+CATEGORIES = ["meat", "produce", "dairy", "pantry", "spices", "other"]
+
+# Menu item id -> (category, item, amount per serving, unit)
+DISH_INGREDIENTS: Dict[int, List[Tuple[str, str, float, str]]] = {
+    1: [("meat", "chicken (bone-in)", 250, "g"), ("pantry", "basmati rice", 90, "g"), ("produce", "onion", 0.25, ""),
+        ("produce", "garlic", 1, "clove"), ("produce", "tomato", 0.25, ""), ("pantry", "vegetable oil", 1, "tbsp"),
+        ("spices", "mandi spice mix", 1, "tsp"), ("spices", "dried lime", 0.25, "piece"), ("spices", "salt", 0.5, "tsp")],
+    2: [("meat", "lamb (bone-in)", 200, "g"), ("pantry", "basmati rice", 90, "g"), ("produce", "carrot", 0.5, ""),
+        ("produce", "onion", 0.25, ""), ("pantry", "raisins", 1, "tbsp"), ("pantry", "vegetable oil", 1, "tbsp"),
+        ("spices", "cumin", 0.5, "tsp"), ("spices", "garam masala", 0.5, "tsp"), ("spices", "salt", 0.5, "tsp")],
+    3: [("meat", "chicken (bone-in)", 200, "g"), ("pantry", "basmati rice", 90, "g"), ("dairy", "yogurt", 60, "ml"),
+        ("produce", "onion", 0.5, ""), ("produce", "garlic", 1, "clove"), ("produce", "ginger", 0.5, "tsp"),
+        ("dairy", "ghee", 1, "tbsp"), ("spices", "biryani masala", 1, "tsp"), ("spices", "saffron", 1, "pinch"),
+        ("spices", "salt", 0.5, "tsp")],
+    4: [("meat", "chicken (boneless)", 100, "g"), ("meat", "ground beef", 100, "g"), ("produce", "onion", 0.25, ""),
+        ("produce", "mint", 0.1, "bunch"), ("produce", "cucumber", 0.25, ""), ("dairy", "yogurt", 30, "ml"),
+        ("spices", "kebab masala", 1, "tsp"), ("spices", "salt", 0.5, "tsp")],
+    5: [("meat", "chicken (bone-in)", 250, "g"), ("pantry", "basmati rice", 90, "g"), ("produce", "tomato", 0.5, ""),
+        ("produce", "onion", 0.25, ""), ("pantry", "tomato paste", 1, "tbsp"), ("pantry", "vegetable oil", 1, "tbsp"),
+        ("spices", "kabsa spice mix", 1, "tsp"), ("spices", "dried lime", 0.25, "piece"), ("spices", "salt", 0.5, "tsp")],
+    6: [("meat", "chicken (boneless)", 200, "g"), ("pantry", "basmati rice", 90, "g"), ("pantry", "cornstarch", 1, "tbsp"),
+        ("dairy", "yogurt", 30, "ml"), ("produce", "curry leaves", 0.05, "bunch"), ("produce", "green chili", 1, "piece"),
+        ("pantry", "vegetable oil", 2, "tbsp"), ("spices", "red chili powder", 1, "tsp"), ("spices", "biryani masala", 1, "tsp"),
+        ("spices", "salt", 0.5, "tsp")],
+    7: [("meat", "ground chicken", 180, "g"), ("pantry", "basmati rice", 90, "g"), ("produce", "onion", 0.5, ""),
+        ("produce", "tomato", 0.25, ""), ("dairy", "yogurt", 30, "ml"), ("pantry", "breadcrumbs", 1, "tbsp"),
+        ("dairy", "ghee", 1, "tbsp"), ("spices", "biryani masala", 1, "tsp"), ("spices", "salt", 0.5, "tsp")],
+    8: [("meat", "beef (bone-in)", 220, "g"), ("pantry", "basmati rice", 90, "g"), ("dairy", "yogurt", 60, "ml"),
+        ("produce", "onion", 0.5, ""), ("produce", "garlic", 1, "clove"), ("produce", "ginger", 0.5, "tsp"),
+        ("dairy", "ghee", 1, "tbsp"), ("spices", "biryani masala", 1, "tsp"), ("spices", "saffron", 1, "pinch"),
+        ("spices", "salt", 0.5, "tsp")],
+    9: [("dairy", "cream cheese", 60, "g"), ("dairy", "heavy cream", 30, "ml"), ("dairy", "butter", 10, "g"),
+        ("produce", "eggs", 0.5, "piece"), ("pantry", "sugar", 25, "g"), ("pantry", "digestive biscuits", 20, "g"),
+        ("pantry", "pistachio cream", 20, "g"), ("pantry", "kataifi pastry", 10, "g")],
+    10: [("dairy", "mascarpone", 60, "g"), ("dairy", "heavy cream", 30, "ml"), ("pantry", "ladyfingers", 4, "piece"),
+         ("pantry", "espresso", 40, "ml"), ("pantry", "sugar", 15, "g"), ("pantry", "cocoa powder", 1, "tsp")],
+    11: [("dairy", "mascarpone", 60, "g"), ("dairy", "heavy cream", 30, "ml"), ("pantry", "ladyfingers", 4, "piece"),
+         ("produce", "mango", 0.5, ""), ("pantry", "mango pulp", 40, "ml"), ("pantry", "sugar", 10, "g")],
+    12: [("dairy", "butter", 28, "g"), ("pantry", "all-purpose flour", 30, "g"), ("pantry", "sugar", 25, "g"),
+         ("produce", "eggs", 0.5, "piece"), ("dairy", "milk", 1, "tbsp"), ("pantry", "vanilla extract", 0.25, "tsp")],
+    13: [("meat", "ground beef", 90, "g"), ("meat", "ground chicken", 90, "g"), ("dairy", "heavy cream", 15, "ml"),
+         ("produce", "onion", 0.25, ""), ("produce", "green chili", 1, "piece"), ("produce", "cilantro", 0.1, "bunch"),
+         ("spices", "kebab masala", 1, "tsp"), ("spices", "salt", 0.5, "tsp")],
+    14: [("produce", "eggs", 0.5, "piece"), ("produce", "potato", 80, "g"), ("produce", "onion", 0.1, ""),
+         ("pantry", "breadcrumbs", 2, "tbsp"), ("pantry", "vegetable oil", 1, "tbsp"), ("spices", "salt", 0.25, "tsp")],
+    15: [("pantry", "kalijira rice", 60, "g"), ("pantry", "sugar", 40, "g"), ("dairy", "malai (clotted cream)", 30, "g"),
+         ("dairy", "ghee", 1, "tbsp"), ("pantry", "mixed nuts", 15, "g"), ("pantry", "raisins", 1, "tbsp"),
+         ("spices", "saffron", 1, "pinch"), ("spices", "cardamom", 2, "piece")],
+    16: [("meat", "beef (boneless)", 180, "g"), ("pantry", "kalijira rice", 90, "g"), ("pantry", "mustard oil", 1.5, "tbsp"),
+         ("produce", "onion", 0.5, ""), ("produce", "green chili", 2, "piece"), ("produce", "garlic", 1, "clove"),
+         ("spices", "garam masala", 0.5, "tsp"), ("spices", "salt", 0.5, "tsp")],
+    17: [("meat", "chicken (bone-in)", 250, "g"), ("produce", "onion", 0.75, ""), ("dairy", "yogurt", 60, "ml"),
+         ("dairy", "ghee", 1.5, "tbsp"), ("pantry", "sugar", 1, "tsp"), ("pantry", "fried onions", 1, "tbsp"),
+         ("spices", "roast masala", 1, "tsp"), ("spices", "salt", 0.5, "tsp")],
+    18: [("pantry", "pineapple juice", 180, "ml"), ("pantry", "coconut cream", 60, "ml"), ("other", "ice", 1, "cup")],
+    19: [("dairy", "yogurt", 120, "ml"), ("produce", "mango", 0.5, ""), ("dairy", "milk", 60, "ml"),
+         ("pantry", "sugar", 1, "tbsp"), ("spices", "cardamom", 1, "pinch"), ("other", "ice", 0.5, "cup")],
+    20: [("produce", "lemon", 1, ""), ("produce", "mint", 0.1, "bunch"), ("pantry", "sugar", 2, "tbsp"),
+         ("other", "ice", 1, "cup")],
+}
+
+PER_SERVING: Dict[int, List[Ingredient]] = {
+    item_id: [Ingredient(name, Quantity.parse(amount, unit), category) for category, name, amount, unit in rows]
+    for item_id, rows in DISH_INGREDIENTS.items()
+}
+_SERVES = {item.id: {option: serves for option, _, serves in serving_options(item)} for item in MENU_ITEMS}
+
+
+# People served by count units of a pricing option, e.g. 2 half trays of Beef Tehari -> 10
+def order_servings(item: MenuItem, option: str, count: int = 1) -> int:
+    return _SERVES.get(item.id, {}).get(option, 0) * count
+
+
+# {category: [Ingredient]} for one dish at the given number of servings
+def dish_ingredients(item: MenuItem, servings: float) -> Dict[str, List[Ingredient]]:
+    ingredients: Dict[str, List[Ingredient]] = {}
+    for ingredient in PER_SERVING.get(item.id, []):
+        ingredients.setdefault(ingredient.category, []).append(ingredient.scaled(servings))
+    return ingredients
+
+
+# One shopping list for several (item, servings) orders: the same ingredient is summed
+# across dishes, converting between units of the same kind, then shown in handy units
+def order_shopping_list(orders: Iterable[Tuple[MenuItem, float]]) -> Dict[str, List[Ingredient]]:
+    shopping_list: Dict[str, List[Ingredient]] = {}
+    for item, servings in orders:
+        merge_shopping_list(shopping_list, dish_ingredients(item, servings))
+    return {category: [Ingredient(i.name, i.quantity.simplified(), i.category) for i in shopping_list[category]]
+            for category in CATEGORIES if category in shopping_list}
@@ -0,0 +1,219 @@
+"""Local intent router: Aho-Corasick keyword automaton plus a tiny Naive Bayes classifier."""
+import math
+import re
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+RECIPE = "recipe"
+QUESTION = "question"
+ADD_TO_LIST = "add_to_list"
+MEAL_PLAN = "meal_plan"
+PREFERENCE_UPDATE = "preference_update"
+MENU_LOOKUP = "menu_lookup"
+INTENTS = [RECIPE, QUESTION, ADD_TO_LIST, MEAL_PLAN, PREFERENCE_UPDATE, MENU_LOOKUP]
+
+# phrase -> (intent, weight)
+KEYWORDS: Dict[str, Tuple[str, float]] = {}
+for _intent, _weight, _phrases in [
+    (ADD_TO_LIST, 2.0, ["shopping list", "grocery list", "add this", "add these", "add the recipe", "add the ingredients",
+                        "add it to my list", "add to my list", "what do i need to buy", "ingredients to buy"]),
+    (MEAL_PLAN, 2.0, ["meal plan", "weekly plan", "menu plan", "plan my meals", "plan for the week", "weekly menu",
+                      "7-day", "7 day", "week of meals", "meal prep plan"]),
+    (PREFERENCE_UPDATE, 1.0, ["vegan", "vegetarian", "keto", "paleo", "gluten free", "gluten-free", "dairy free",
+                              "dairy-free", "nut free", "nut-free", "low carb", "low-carb", "low sugar", "low-sugar",
+                              "halal", "beginner", "intermediate cook", "advanced cook", "professional chef",
+                              "i prefer", "i'm allergic", "i am allergic", "allergic to", "i don't eat", "i do not eat",
+                              "i can't eat", "my diet", "i'm a beginner", "i am a beginner", "i like spicy", "mild food"]),
+    (RECIPE, 1.0, ["recipe", "how do i make", "how to make", "how do you make", "how to cook", "how do i cook",
+                   "cook with", "what can i make", "what can i cook", "dinner idea", "lunch idea", "instructions for",
+                   "step by step"]),
+    (QUESTION, 1.0, ["how long", "what is", "what's the", "why does", "why is", "substitute", "substitution",
+                     "instead of", "difference between", "temperature", "how do i store", "is it safe", "tips for",
+                     "how much time", "can i freeze", "can i use"]),
+    (MENU_LOOKUP, 1.5, ["your menu", "on the menu", "do you have", "do you sell", "do you offer", "price", "prices",
+                        "how much is", "how much does", "order", "tray", "catering", "show me your", "your best",
+                        "what desserts", "what drinks", "recommend"]),
+]:
+    for _phrase in _phrases:
+        KEYWORDS[_phrase] = (_intent, _weight)
+
+# Seed examples for the Naive Bayes half of the router
+TRAINING_EXAMPLES = {
+    RECIPE: [
+        "give me a vegetarian pasta recipe", "i need a quick pasta recipe for dinner", "how do i make sourdough bread",
+        "what can i cook with chicken broccoli and rice", "recipe for chicken curry", "teach me to make biryani",
+        "something easy for dinner tonight", "how to cook beef tehari", "i have eggs and potatoes what should i cook",
+        "detailed recipe for mango lassi",
+    ],
+    QUESTION: [
+        "how long should i boil an egg", "what is the difference between baking soda and baking powder",
+        "can i substitute butter with oil", "why does my rice get sticky", "what temperature should chicken reach",
+        "how do i store fresh herbs", "is it safe to refreeze meat", "what does braising mean",
+        "how do i sharpen a knife", "tips for fluffy rice",
+    ],
+    ADD_TO_LIST: [
+        "add this recipe to my shopping list", "add the ingredients to my grocery list", "put these on my list",
+        "add it to my shopping list please", "what do i need to buy for this", "save the ingredients to my list",
+        "add everything to my grocery list", "i want to shop for this recipe",
+    ],
+    MEAL_PLAN: [
+        "create a meal plan for the week", "make a weekly keto meal plan for a beginner", "plan my meals for 7 days",
+        "generate a weekly menu", "i need a meal plan", "plan breakfast lunch and dinner for the week",
+        "create a traditional bangladeshi meal plan", "weekly meal prep plan please",
+    ],
+    PREFERENCE_UPDATE: [
+        "i am vegan", "i'm a beginner cook", "i don't eat dairy", "i follow a keto diet", "i prefer italian food",
+        "i am allergic to nuts", "i'm gluten free now", "i like my food extra spicy", "i'm an advanced cook",
+        "we only eat halal",
+    ],
+    MENU_LOOKUP: [
+        "show me your best biryani", "what desserts do you recommend", "do you have kebabs", "how much is a full tray",
+        "what drinks do you offer", "i want to order chicken mandi", "prices for catering", "what's on your menu",
+        "do you sell tiramisu", "i want something spicy from your menu",
+    ],
+}
+
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def _features(text: str) -> List[str]:
+    words = WORD_RE.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class KeywordAutomaton:
+    # Aho-Corasick over lowercase phrases; one pass over the text finds every phrase
+    def __init__(self, phrases: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+        for phrase in phrases:
+            state = 0
+            for char in phrase:
+                nxt = self.goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][char] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = nxt
+            self.output[state].append(phrase)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    # (start, end, phrase) for every match that sits on word boundaries
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        matches = []
+        state = 0
+        for pos, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for phrase in self.output[state]:
+                start = pos - len(phrase) + 1
+                end = pos + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    matches.append((start, end, phrase))
+        return matches
+
+
+class NaiveBayes:
+    def __init__(self, examples: Dict[str, List[str]], alpha: float = 0.5):
+        self.labels = list(examples)
+        counts = {label: Counter() for label in self.labels}
+        for label, texts in examples.items():
+            for text in texts:
+                counts[label].update(_features(text))
+        vocab = set().union(*counts.values())
+        total = sum(len(texts) for texts in examples.values())
+        self.log_prior = {label: math.log(len(examples[label]) / total) for label in self.labels}
+        self.log_likelihood = {}
+        self.log_unseen = {}
+        for label in self.labels:
+            denom = sum(counts[label].values()) + alpha * (len(vocab) + 1)
+            self.log_likelihood[label] = {f: math.log((c + alpha) / denom) for f, c in counts[label].items()}
+            self.log_unseen[label] = math.log(alpha / denom)
+        self.vocab = vocab
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        features = [f for f in _features(text) if f in self.vocab]
+        scores = {}
+        for label in self.labels:
+            table, unseen = self.log_likelihood[label], self.log_unseen[label]
+            scores[label] = self.log_prior[label] + sum(table.get(f, unseen) for f in features)
+        top = max(scores.values())
+        exp = {label: math.exp(score - top) for label, score in scores.items()}
+        norm = sum(exp.values())
+        return {label: value / norm for label, value in exp.items()}
+
+
+@dataclass
+class Route:
+    intent: str
+    confidence: float
+    scores: Dict[str, float]
+    intents: List[str] = field(default_factory=list)  # every intent with explicit keyword evidence, primary first
+    matches: List[str] = field(default_factory=list)
+
+    def has(self, intent: str) -> bool:
+        return intent in self.intents
+
+
+class IntentRouter:
+    def __init__(self, extra_keywords: Optional[Dict[str, Tuple[str, float]]] = None):
+        self.keywords = dict(KEYWORDS)
+        if extra_keywords:
+            self.keywords.update({phrase.lower(): value for phrase, value in extra_keywords.items()})
+        self.automaton = KeywordAutomaton(self.keywords)
+        self.classifier = NaiveBayes(TRAINING_EXAMPLES)
+
+    def route(self, prompt: str) -> Route:
+        text = prompt.lower()
+        keyword_scores: Dict[str, float] = defaultdict(float)
+        matches = []
+        for _, _, phrase in self.automaton.find(text):
+            intent, weight = self.keywords[phrase]
+            keyword_scores[intent] += weight
+            matches.append(phrase)
+        probs = self.classifier.predict_proba(text)
+        combined = {intent: probs.get(intent, 0.0) + keyword_scores.get(intent, 0.0) for intent in INTENTS}
+        total = sum(combined.values()) or 1.0
+        scores = {intent: value / total for intent, value in combined.items()}
+        primary = max(scores, key=scores.get)
+        secondary = sorted((i for i in keyword_scores if i != primary), key=lambda i: -keyword_scores[i])
+        return Route(primary, scores[primary], scores, [primary] + secondary, matches)
+
+
+PREFERENCES_CALL = "preferences"
+CHAT_CALL = "chat"
+INGREDIENTS_CALL = "ingredients"
+MEAL_PLAN_CALL = "meal_plan"
+
+# Below this confidence a turn always gets a full chat completion
+MIN_CONFIDENCE = 0.5
+
+
+# Upstream calls a chat turn needs. Preference extraction runs only when the prompt
+# mentions a preference, and a confident list, plan or preference command is answered
+# locally instead of with a chat completion.
+def plan_calls(route: Route, min_confidence: float = MIN_CONFIDENCE) -> List[str]:
+    calls = []
+    if route.has(PREFERENCE_UPDATE):
+        calls.append(PREFERENCES_CALL)
+    if route.intent not in (ADD_TO_LIST, MEAL_PLAN, PREFERENCE_UPDATE) or route.confidence < min_confidence:
+        calls.append(CHAT_CALL)
+    if route.has(ADD_TO_LIST):
+        calls.append(INGREDIENTS_CALL)
+    if route.has(MEAL_PLAN):
+        calls.append(MEAL_PLAN_CALL)
+    return calls
@@ -0,0 +1,178 @@
+"""Client-side rate limiting for Euron API calls.
+
+Every upstream request waits in one fair queue until the global bucket, the calling
+session's bucket and the cross-worker per-minute cap all allow it. Waiters are served
+by priority class first (interactive chat before extraction work), then in start-time
+fair order across sessions, so one session's burst cannot starve the others.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import defaultdict, deque
+from enum import IntEnum
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from skillet.cache import SharedCache
+
+
+class Priority(IntEnum):
+    CHAT = 0
+    EXTRACTION = 1
+    PREFETCH = 2  # speculative; only runs when nothing else is waiting
+
+
+# Longest a request of each class waits in the queue before giving up (seconds)
+MAX_WAIT = {Priority.CHAT: 30.0, Priority.EXTRACTION: 20.0, Priority.PREFETCH: 5.0}
+# Idle session buckets are dropped once this many are tracked
+MAX_SESSIONS = 1000
+
+
+class RateLimited(Exception):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # Seconds until one token is available
+    def delay(self, now: float) -> float:
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class RateLimiter:
+    # global_rate/global_burst bound this process; session_rate/session_burst bound each
+    # session. With a shared cache, per_minute caps upstream requests across all workers
+    # using the counter EuronClient increments for every request it sends.
+    def __init__(self, global_rate: float = 2.0, global_burst: float = 6, session_rate: float = 0.5,
+                 session_burst: float = 4, per_minute: Optional[int] = 90, cache: Optional[SharedCache] = None,
+                 counter_key: Optional[Callable[[float], str]] = None, clock: Callable[[], float] = time.monotonic,
+                 history: int = 1000, max_wait: Optional[Dict[Priority, float]] = None):
+        self.max_wait = {**MAX_WAIT, **(max_wait or {})}
+        self.session_rate = session_rate
+        self.session_burst = session_burst
+        self.per_minute = per_minute
+        self.cache = cache
+        self.counter_key = counter_key
+        self.clock = clock
+        self._global = TokenBucket(global_rate, global_burst, clock())
+        self._sessions: Dict[str, TokenBucket] = {}
+        self._finish: Dict[str, float] = defaultdict(float)
+        self._virtual_time = 0.0
+        self._queue: List[Tuple[int, float, int, str]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self.granted: Dict[Priority, int] = defaultdict(int)
+        self.rejected: Dict[Priority, int] = defaultdict(int)
+        self.waits: Dict[Priority, Deque[float]] = defaultdict(lambda: deque(maxlen=history))
+
+    def _session_bucket(self, session: str, now: float) -> TokenBucket:
+        bucket = self._sessions.get(session)
+        if bucket is None:
+            bucket = self._sessions[session] = TokenBucket(self.session_rate, self.session_burst, now)
+        return bucket
+
+    # Forget sessions that are idle with a full bucket; they would start full anyway
+    def _prune(self, now: float):
+        queued = {ticket[3] for ticket in self._queue}
+        for session, bucket in list(self._sessions.items()):
+            if session not in queued and bucket.delay(now) == 0 and bucket.tokens >= bucket.capacity:
+                del self._sessions[session]
+                self._finish.pop(session, None)
+
+    def _shared_delay(self) -> float:
+        if self.cache is None or self.counter_key is None or not self.per_minute:
+            return 0.0
+        now = time.time()
+        sent = self.cache.get(self.counter_key(now))
+        if sent is None or int(sent) < self.per_minute:
+            return 0.0
+        return 60 - now % 60
+
+    # The first queued ticket, in (priority, fair tag) order, that every budget allows now;
+    # otherwise None and how long until the earliest one could go. Prefetch tickets never
+    # take the global token while a higher-priority ticket is waiting on its session bucket.
+    def _next(self, now: float) -> Tuple[Optional[tuple], float]:
+        wait = max(self._global.delay(now), self._shared_delay())
+        if wait > 0:
+            return None, wait
+        blocked = False
+        for ticket in sorted(self._queue):
+            if ticket[0] == Priority.PREFETCH and blocked:
+                break
+            session_wait = self._session_bucket(ticket[3], now).delay(now)
+            if session_wait == 0:
+                return ticket, 0.0
+            blocked = blocked or ticket[0] < Priority.PREFETCH
+            wait = session_wait if wait == 0 else min(wait, session_wait)
+        return None, wait
+
+    # Block until this session may send one request; raises RateLimited after max_wait seconds
+    def acquire(self, session: str = "default", priority: Priority = Priority.CHAT,
+                max_wait: Optional[float] = None) -> float:
+        max_wait = self.max_wait[priority] if max_wait is None else max_wait
+        with self._cond:
+            start = self.clock()
+            # Start-time fair queueing: each request is tagged after the session's previous one
+            tag = max(self._virtual_time, self._finish[session])
+            self._finish[session] = tag + 1
+            ticket = (int(priority), tag, next(self._seq), session)
+            heapq.heappush(self._queue, ticket)
+            self._cond.notify_all()
+            while True:
+                now = self.clock()
+                chosen, wait = self._next(now)
+                if chosen == ticket:
+                    break
+                remaining = start + max_wait - now
+                if remaining <= 0:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                    self._finish[session] -= 1
+                    self.rejected[priority] += 1
+                    self._cond.notify_all()
+                    raise RateLimited(f"Waited {max_wait:g}s for an API slot")
+                self._cond.wait(min(wait, remaining) if wait > 0 else remaining)
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+            self._global.take(now)
+            self._session_bucket(session, now).take(now)
+            self._virtual_time = max(self._virtual_time, tag)
+            waited = now - start
+            self.granted[priority] += 1
+            self.waits[priority].append(waited)
+            if len(self._sessions) > MAX_SESSIONS:
+                self._prune(now)
+            # Let the next waiter re-check its budgets
+            self._cond.notify_all()
+            return waited
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._cond:
+            report = {}
+            for priority in Priority:
+                waits = np.array(self.waits[priority]) * 1000
+                report[priority.name.lower()] = {
+                    "granted": self.granted[priority],
+                    "rejected": self.rejected[priority],
+                    "queued": sum(ticket[0] == priority for ticket in self._queue),
+                    "wait_p50_ms": float(np.percentile(waits, 50)) if len(waits) else 0.0,
+                    "wait_p95_ms": float(np.percentile(waits, 95)) if len(waits) else 0.0,
+                    "wait_max_ms": float(waits.max()) if len(waits) else 0.0,
+                }
+            return report
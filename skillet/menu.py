@@ -0,0 +1,74 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# Data class for menu items
+@dataclass(frozen=True, slots=True)
+class MenuItem:
+    id: int
+    dish_name: str
+    category: str
+    taste_category: str
+    image_url: str
+    youtube_link: str
+    pricing: Dict[str, float]
+    serving_info: Dict[str, str]
+    summary: str = ""
+
+PEOPLE_RE = re.compile(r"(\d+)\s*(?:-|to)\s*(\d+)|(\d+)\s*\+?")
+
+
+# "15-17 people" -> (15, 17), "Large party (15+ people)" -> (15, 15); None when no number is given
+def serving_bounds(text: str) -> Optional[Tuple[int, int]]:
+    match = PEOPLE_RE.search(text or "")
+    if match is None:
+        return None
+    if match.group(1):
+        low, high = int(match.group(1)), int(match.group(2))
+        return min(low, high), max(low, high)
+    return int(match.group(3)), int(match.group(3))
+
+# Menu items database
+MENU_ITEMS = [
+    MenuItem(1, "Chicken Mandi", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Chicken+Mandi..jpg", "https://youtube.com/embed/B3IV5P-4PCk?si=Ql_EWzyo6hhQ6mp1", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"},
+             "Yemeni style basmati rice cooked in spiced broth and served with tender slow roasted chicken."),
+    MenuItem(2, "Kabuli Pulao", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Kabuli+Polao.jpg", "https://www.youtube.com/embed/ch8zl7V4ABo", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"},
+             "Afghan rice pilaf with lamb or mutton, caramelized carrots and raisins."),
+    MenuItem(3, "Chicken Dum Biryani", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Chicken+Biryani.jpg", "https://www.youtube.com/embed/9CsloZe-ekI", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"},
+             "Layered basmati rice and yogurt marinated chicken slow cooked under a sealed lid."),
+    MenuItem(4, "Kebab Platter", "Appetizer", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Kabab+Platter..jpg", "https://www.youtube.com/embed/3ELfF5s8yz0", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"},
+             "Assorted grilled chicken and beef kebabs with mint chutney and salad."),
+    MenuItem(5, "Chicken Kabsa", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Chicken+Kabsa.jpg", "", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"},
+             "Saudi rice with chicken, tomato, dried lime and warm Arabian spices."),
+    MenuItem(6, "Chicken 65 Biryani", "Main", "Spicy", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Chicken+65+Biryani.jpg", "https://www.youtube.com/embed/jFh6NF7cVcE", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"},
+             "Fiery fried chicken 65 with red chili layered into hot biryani rice."),
+    MenuItem(7, "Chicken Kofta Biryani", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Kofta+Biryani.jpg", "https://www.youtube.com/embed/Q1nDOX4lDuE", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"},
+             "Minced chicken meatballs in gravy layered with fragrant biryani rice."),
+    MenuItem(8, "Beef Dum Biryani", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Beef+Dum+Biryani.jpg", "https://www.youtube.com/embed/qkiMa9Bke0M", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"},
+             "Tender beef and basmati rice slow cooked dum style with saffron and fried onions."),
+    MenuItem(9, "Dubai Cheese Cake", "Dessert", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Dubai+Cheese+Cake.jpg", "https://www.youtube.com/embed/tVJtZBSp3Hw&t", {"full_tray": 94.99, "half_tray": 54.99, "per_serving": 7.99}, {"full_tray": "28-30 people", "half_tray": "12-15 people"},
+             "Creamy baked cheesecake topped with pistachio cream and crispy kataifi."),
+    MenuItem(10, "Tiramisu", "Dessert", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Tiramisu.jpg", "https://www.youtube.com/embed/ens-bJaLuQQ", {"full_tray": 89.99, "half_tray": 49.99, "per_serving": 6.99}, {"full_tray": "28-30 people", "half_tray": "12-15 people"},
+             "Italian layered dessert of coffee soaked ladyfingers and mascarpone cream."),
+    MenuItem(11, "Mango Tiramisu", "Dessert", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Mango+Tiramisu.jpg", "https://drive.google.com/file/d/16rZwh15xVDdm2RE8LseEpjqSrCFdWPJi/preview", {"full_tray": 89.99, "half_tray": 49.99, "per_serving": 6.99}, {"full_tray": "28-30 people", "half_tray": "12-15 people"},
+             "Tiramisu made with ripe mango puree, ladyfingers and mascarpone cream."),
+    MenuItem(12, "Butter Pound Cake", "Dessert", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Pound+Cake.jpg", "https://www.youtube.com/embed/luaEFTC78aQ", {"Whole Cake": 7.99}, {},
+             "Rich golden butter cake baked in a loaf pan, great with tea."),
+    MenuItem(13, "Malai Sheek Kebab (Beef/Chicken)", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Chicken+Malai+Sheek+Kebab.jpg", "https://www.youtube.com/embed/3Ci1Jr8cWn8&t", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"},
+             "Creamy minced beef or chicken skewers grilled over charcoal."),
+    MenuItem(14, "Egg Potato Cutlet", "Appetizer", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Egg+Potato+Cutlet.jpg", "https://www.youtube.com/embed/LjSN5QtdLmE", {"per count": 3.99}, {},
+             "Boiled egg wrapped in spiced mashed potato, crumbed and fried until crisp."),
+    MenuItem(15, "Shahi Malai Jorda", "Dessert", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Shahi+Malai+Jorda.jpg", "https://www.youtube.com/embed/GXS3UHmB6NM", {"full_tray": 90, "half_tray": 50, "per_serving": 9.99}, {"full_tray": "15-17 people", "half_tray": "5-6 people"},
+             "Sweet saffron rice with cream, nuts and dried fruit, a Bangladeshi wedding favourite."),
+    MenuItem(16, "Beef Tehari", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Beef+Tehari.jpg", "https://www.youtube.com/embed/3wwr5nW6af0", {"full_tray": 90, "half_tray": 39.99, "per_serving": 9.99}, {"full_tray": "15-17 people", "half_tray": "5-6 people"},
+             "Old Dhaka style beef and short grain rice cooked in mustard oil with green chili."),
+    MenuItem(17, "Chicken Roast", "Main", "Savory", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Chicken+Roast.jpg", "https://www.youtube.com/embed/P56bYJXx8Ak", {"full_tray": 90, "half_tray": 50, "per_serving": 12}, {"full_tray": "15-17 people", "half_tray": "5-6 people"},
+             "Bangladeshi wedding style chicken roast in a rich onion, yogurt and ghee gravy."),
+    MenuItem(18, "Pina colada (Non Alcoholic)", "Drinks", "Sweet and Refreshing", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Pina+Colada.jpg", "", {"per glass": 3}, {},
+             "Chilled blend of pineapple juice and coconut cream."),
+    MenuItem(19, "Mango Lassi", "Drinks", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Mango+Lassi.jpg", "", {"per glass": 4}, {},
+             "Cold yogurt drink blended with ripe mango and a pinch of cardamom."),
+    MenuItem(20, "Mint Lemon", "Drinks", "Sweet", "https://s3.us-east-1.amazonaws.com/sharedskillet.com/Mint+Lemon.jpg", "", {"per glass": 2}, {},
+             "Refreshing iced lemonade blended with fresh mint leaves."),
+]
+MENU_BY_ID = {item.id: item for item in MENU_ITEMS}
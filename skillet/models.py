@@ -0,0 +1,319 @@
+"""Typed, slotted records for chat messages, shopping list ingredients and meal plans.
+
+The from_json constructors accept whatever the LLM returned and give back a record
+or None, so callers never index into raw dicts or re-parse quantity strings.
+"""
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from fractions import Fraction
+from typing import Any, Dict, List, Optional
+
+ROLES = ("system", "user", "assistant")
+DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MEAL_TYPES = ["breakfast", "lunch", "dinner"]
+
+
+class Unit(str, Enum):
+    NONE = ""
+    PIECE = "piece"
+    GRAM = "g"
+    KILOGRAM = "kg"
+    OUNCE = "oz"
+    POUND = "lb"
+    MILLILITER = "ml"
+    LITER = "l"
+    TEASPOON = "tsp"
+    TABLESPOON = "tbsp"
+    CUP = "cup"
+    CAN = "can"
+    PACKAGE = "package"
+    CLOVE = "clove"
+    BUNCH = "bunch"
+    PINCH = "pinch"
+    OTHER = "other"
+
+    @classmethod
+    def parse(cls, text: str) -> "Unit":
+        return UNIT_ALIASES.get(text.strip().lower().rstrip("."), cls.OTHER)
+
+
+UNIT_ALIASES = {unit.value: unit for unit in Unit if unit is not Unit.OTHER}
+for _unit, _aliases in {
+    Unit.PIECE: ["pieces", "pc", "pcs", "whole", "each", "count"],
+    Unit.GRAM: ["gram", "grams", "gr"],
+    Unit.KILOGRAM: ["kilogram", "kilograms", "kgs"],
+    Unit.OUNCE: ["ounce", "ounces"],
+    Unit.POUND: ["pound", "pounds", "lbs"],
+    Unit.MILLILITER: ["milliliter", "milliliters", "millilitre", "millilitres"],
+    Unit.LITER: ["liter", "liters", "litre", "litres"],
+    Unit.TEASPOON: ["teaspoon", "teaspoons", "tsps"],
+    Unit.TABLESPOON: ["tablespoon", "tablespoons", "tbsps", "tbs"],
+    Unit.CUP: ["cups"],
+    Unit.CAN: ["cans", "tin", "tins"],
+    Unit.PACKAGE: ["packages", "pack", "packs", "packet", "packets", "pkg"],
+    Unit.CLOVE: ["cloves"],
+    Unit.BUNCH: ["bunches"],
+    Unit.PINCH: ["pinches"],
+}.items():
+    for _alias in _aliases:
+        UNIT_ALIASES[_alias] = _unit
+
+# Units that convert into each other: unit -> (base unit, size in base units)
+UNIT_SIZES = {
+    Unit.GRAM: (Unit.GRAM, 1.0),
+    Unit.KILOGRAM: (Unit.GRAM, 1000.0),
+    Unit.OUNCE: (Unit.GRAM, 28.3495),
+    Unit.POUND: (Unit.GRAM, 453.592),
+    Unit.MILLILITER: (Unit.MILLILITER, 1.0),
+    Unit.LITER: (Unit.MILLILITER, 1000.0),
+    Unit.TEASPOON: (Unit.MILLILITER, 4.92892159375),
+    Unit.TABLESPOON: (Unit.MILLILITER, 3 * 4.92892159375),
+    Unit.CUP: (Unit.MILLILITER, 48 * 4.92892159375),
+}
+# (unit, amount at which it reads better as the next unit, next unit), applied in order
+UNIT_STEPS = [
+    (Unit.GRAM, 1000, Unit.KILOGRAM),
+    (Unit.MILLILITER, 1000, Unit.LITER),
+    (Unit.TEASPOON, 3, Unit.TABLESPOON),
+    (Unit.TABLESPOON, 16, Unit.CUP),
+]
+
+UNICODE_FRACTIONS = {"½": "1/2", "⅓": "1/3", "⅔": "2/3", "¼": "1/4", "¾": "3/4", "⅛": "1/8"}
+# "2", "1.5", "1/2", "1 1/2", "2-3" (the upper end is kept), then an optional unit word
+AMOUNT_RE = re.compile(r"^\s*(\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?)(?:\s*(?:-|to)\s*(\d+/\d+|\d+(?:\.\d+)?))?\s*(.*)$")
+
+
+def _number(text: str) -> float:
+    try:
+        return float(text)  # plain numbers skip the much slower Fraction path
+    except ValueError:
+        return float(sum(Fraction(part) for part in text.split()))
+
+
+@dataclass(frozen=True, slots=True)
+class Quantity:
+    amount: Optional[float]  # None for "to taste", "as needed" and the like
+    unit: Unit = Unit.NONE
+    label: str = ""  # original unit text when unit is OTHER, e.g. "medium"
+
+    @classmethod
+    def parse(cls, quantity: Any, unit: Any = "") -> "Quantity":
+        unit_text = str(unit or "").strip()
+        if isinstance(quantity, (int, float)) and not isinstance(quantity, bool):
+            amount, rest = float(quantity), ""
+        else:
+            text = str(quantity or "").strip()
+            for symbol, fraction in UNICODE_FRACTIONS.items():
+                text = text.replace(symbol, f" {fraction}")
+            match = AMOUNT_RE.match(text)
+            if match is None:
+                return cls(None, Unit.NONE, text or unit_text)
+            amount = _number(match.group(2) or match.group(1))
+            rest = match.group(3)
+        unit_text = unit_text or rest
+        parsed = Unit.parse(unit_text) if unit_text else Unit.NONE
+        return cls(amount, parsed, unit_text if parsed is Unit.OTHER else "")
+
+    # Sum with a quantity in the same or a convertible unit (expressed in this one's unit),
+    # or None when the two can't be added
+    def combine(self, other: "Quantity") -> Optional["Quantity"]:
+        if self.amount is None or other.amount is None:
+            return None
+        if self.unit is other.unit and self.label.lower() == other.label.lower():
+            return Quantity(self.amount + other.amount, self.unit, self.label)
+        converted = other.convert(self.unit)
+        return None if converted is None else Quantity(self.amount + converted.amount, self.unit)
+
+    # The same amount in another unit of the same kind (mass or volume), or None
+    def convert(self, unit: Unit) -> Optional["Quantity"]:
+        if self.amount is None or self.unit not in UNIT_SIZES or unit not in UNIT_SIZES:
+            return None
+        (base, size), (target_base, target_size) = UNIT_SIZES[self.unit], UNIT_SIZES[unit]
+        if base is not target_base:
+            return None
+        return Quantity(self.amount * size / target_size, unit)
+
+    def scaled(self, factor: float) -> "Quantity":
+        return self if self.amount is None else Quantity(self.amount * factor, self.unit, self.label)
+
+    # Move large amounts up to a handier unit: 1500 g -> 1.5 kg, 6 tsp -> 2 tbsp
+    def simplified(self) -> "Quantity":
+        quantity = self
+        for unit, limit, bigger in UNIT_STEPS:
+            if quantity.unit is unit and quantity.amount is not None:
+                promoted = quantity.convert(bigger)
+                if promoted.amount >= 1 and quantity.amount >= limit:
+                    quantity = promoted
+        return quantity
+
+    @property
+    def unit_text(self) -> str:
+        return self.label if self.unit is Unit.OTHER else self.unit.value
+
+    def format_amount(self) -> str:
+        if self.amount is None:
+            return ""
+        return f"{self.amount:g}" if self.amount == int(self.amount) else f"{self.amount:.2f}".rstrip("0").rstrip(".")
+
+    def __str__(self) -> str:
+        if self.amount is None:
+            return self.label
+        return f"{self.format_amount()} {self.unit_text}".strip()
+
+
+@dataclass(frozen=True, slots=True)
+class Ingredient:
+    name: str
+    quantity: Quantity
+    category: str = "other"
+
+    @property
+    def key(self) -> str:
+        return self.name.strip().lower()
+
+    @classmethod
+    def from_json(cls, data: Any, category: str = "other") -> Optional["Ingredient"]:
+        if isinstance(data, str):
+            data = {"item": data}
+        if not isinstance(data, dict):
+            return None
+        name = str(data.get("item") or data.get("name") or "").strip()
+        if not name:
+            return None
+        return cls(name, Quantity.parse(data.get("quantity"), data.get("unit")), category)
+
+    def merged(self, other: "Ingredient") -> Optional["Ingredient"]:
+        quantity = self.quantity.combine(other.quantity)
+        return None if quantity is None else Ingredient(self.name, quantity, self.category)
+
+    def scaled(self, factor: float) -> "Ingredient":
+        return Ingredient(self.name, self.quantity.scaled(factor), self.category)
+
+    # The {"item", "quantity", "unit"} shape from_json reads
+    def to_json(self) -> Dict[str, str]:
+        quantity = self.quantity
+        if quantity.amount is None:
+            return {"item": self.name, "quantity": quantity.label, "unit": ""}
+        return {"item": self.name, "quantity": quantity.format_amount(), "unit": quantity.unit_text}
+
+    def __str__(self) -> str:
+        return f"{self.quantity} {self.name}".strip()
+
+
+@dataclass(frozen=True, slots=True)
+class Message:
+    role: str
+    content: str
+
+    @classmethod
+    def from_json(cls, data: Any) -> Optional["Message"]:
+        if not isinstance(data, dict) or data.get("role") not in ROLES:
+            return None
+        return cls(data["role"], str(data.get("content") or ""))
+
+    def to_api(self) -> Dict[str, str]:
+        return {"role": self.role, "content": self.content}
+
+    @property
+    def digest(self) -> str:
+        return content_digest(self.content)
+
+
+# Stable key for a piece of text, e.g. to remember what was extracted from a recipe
+def content_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class Meal:
+    title: str
+    description: str = ""
+    prep_time: str = ""
+
+    @classmethod
+    def from_json(cls, data: Any) -> Optional["Meal"]:
+        if not isinstance(data, dict) or not str(data.get("title") or "").strip():
+            return None
+        return cls(str(data["title"]).strip(), str(data.get("description") or ""), str(data.get("prep_time") or ""))
+
+    def to_json(self) -> Dict[str, str]:
+        return {"title": self.title, "description": self.description, "prep_time": self.prep_time}
+
+    # The line sent for ingredient extraction, and the key its result is cached under
+    @property
+    def text(self) -> str:
+        return f"{self.title}: {self.description}"
+
+
+@dataclass(frozen=True, slots=True)
+class DayPlan:
+    day: str
+    meals: Dict[str, Meal] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, day: str, data: Any) -> "DayPlan":
+        meals = {}
+        if isinstance(data, dict):
+            for meal_type in MEAL_TYPES:
+                meal = Meal.from_json(data.get(meal_type))
+                if meal is not None:
+                    meals[meal_type] = meal
+        return cls(day, meals)
+
+
+# The JSON object in an LLM reply, which may be wrapped in prose or a code fence
+def parse_json_reply(text: str) -> Any:
+    match = re.search(r'({.+})', text, re.DOTALL)
+    return json.loads(match.group(1) if match else text)
+
+
+# {"produce": [{"item": ..., "quantity": ..., "unit": ...}], ...} -> {category: [Ingredient]}
+def parse_shopping_list(data: Any) -> Dict[str, List[Ingredient]]:
+    if not isinstance(data, dict):
+        return {}
+    parsed = {}
+    for category, items in data.items():
+        if isinstance(items, list):
+            ingredients = [i for i in (Ingredient.from_json(item, category) for item in items) if i is not None]
+            if ingredients:
+                parsed[category] = ingredients
+    return parsed
+
+
+# {"monday": {"breakfast": {...}, ...}, ...} -> {day: DayPlan}, days in calendar order
+def parse_week(data: Any) -> Dict[str, DayPlan]:
+    if not isinstance(data, dict):
+        return {}
+    days = {str(day).lower(): value for day, value in data.items()}
+    return {day: DayPlan.from_json(day, days[day]) for day in DAYS if day in days}
+
+
+# Add ingredients to a {category: [Ingredient]} list in place, summing amounts of the same
+# item when the units agree and listing it again when they don't
+def merge_shopping_list(shopping_list: Dict[str, List[Ingredient]], ingredients: Dict[str, List[Ingredient]]):
+    for category, items in ingredients.items():
+        existing_items = shopping_list.setdefault(category, [])
+        for new_item in items:
+            for i, existing_item in enumerate(existing_items):
+                if existing_item.key == new_item.key:
+                    merged = existing_item.merged(new_item)
+                    if merged is not None:
+                        existing_items[i] = merged
+                    else:
+                        existing_items.append(new_item)
+                    break
+            else:
+                existing_items.append(new_item)
+
+
+# Rows for the CSV export, one per ingredient
+def shopping_list_rows(shopping_list: Dict[str, List[Ingredient]]) -> List[Dict[str, str]]:
+    return [
+        {"Category": category, "Item": item.name, "Quantity": item.quantity.format_amount(),
+         "Unit": item.quantity.unit_text}
+        for category, items in shopping_list.items()
+        for item in items
+    ]
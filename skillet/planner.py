@@ -0,0 +1,131 @@
+"""Offline meal planner: fills days and meals with menu dishes under simple constraints."""
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from skillet.catering import serving_options
+from skillet.menu import MenuItem, serving_bounds
+from skillet.recommender import Recommender
+
+# Meals for 1, 2 or 3 meals per day, and the courses each meal is built from
+MEALS_PER_DAY = {1: ["Dinner"], 2: ["Lunch", "Dinner"], 3: ["Breakfast", "Lunch", "Dinner"]}
+MEAL_COURSES = {
+    "Breakfast": ["Appetizer", "Drinks"],
+    "Lunch": ["Main", "Drinks"],
+    "Dinner": ["Appetizer", "Main", "Dessert"],
+}
+
+
+@dataclass
+class PlannedDish:
+    item: MenuItem
+    course: str
+    option: str
+    quantity: int
+    cost: float
+
+
+@dataclass
+class PlannedMeal:
+    name: str
+    dishes: List[PlannedDish] = field(default_factory=list)
+
+
+@dataclass
+class MealPlan:
+    days: List[List[PlannedMeal]]
+    guests: int
+
+    @property
+    def total_cost(self) -> float:
+        return sum(dish.cost for meals in self.days for meal in meals for dish in meal.dishes)
+
+    # Plain data for storage; skillet.aggregate reads it back as a meal plan record
+    def to_json(self) -> Dict:
+        return {"guests": self.guests, "days": [
+            [{"name": meal.name, "dishes": [{"id": dish.item.id, "dish": dish.item.dish_name, "option": dish.option,
+                                            "quantity": dish.quantity} for dish in meal.dishes]}
+             for meal in meals]
+            for meals in self.days
+        ]}
+
+    def to_markdown(self) -> str:
+        lines = [f"**Planned for {self.guests} people** · estimated cost ${self.total_cost:,.2f}", ""]
+        for day, meals in enumerate(self.days, start=1):
+            lines.append(f"#### Day {day}")
+            for meal in meals:
+                if meal.dishes:
+                    dishes = ", ".join(
+                        f"{dish.item.dish_name} ({dish.quantity} × {dish.option.replace('_', ' ')})"
+                        for dish in meal.dishes
+                    )
+                else:
+                    dishes = "_No menu dish fits your restrictions_"
+                lines.append(f"- **{meal.name}:** {dishes}")
+            lines.append("")
+        return "\n".join(lines)
+
+
+# Cheapest way to order a dish for `guests` people with a single pricing option
+def portion(item: MenuItem, guests: int) -> Tuple[str, int, float]:
+    best = None
+    for option, price, serves in serving_options(item, conservative=False):
+        quantity = math.ceil(guests / serves)
+        if best is None or quantity * price < best[2]:
+            best = (option, quantity, quantity * price)
+    if best is None:
+        option, price = next(iter(item.pricing.items()))
+        best = (option, 1, price)
+    return best
+
+
+class MealPlanner:
+    # Greedy and deterministic: every course slot takes the best scoring dish of its
+    # category, after a penalty for dishes used recently or often. A dish appears at
+    # most once a day while the category still has unused alternatives.
+    def __init__(self, recommender: Recommender, variety_weight: float = 1.0, variety_decay: float = 0.5,
+                 repeat_weight: float = 0.25):
+        self.recommender = recommender
+        self.items = recommender.items
+        self.variety_weight = variety_weight
+        self.variety_decay = variety_decay
+        self.repeat_weight = repeat_weight
+        categories = np.array([item.category for item in self.items])
+        self.category_rows = {category: np.flatnonzero(categories == category) for category in set(categories)}
+
+    def plan(self, prefs: Dict, days: int = 7, meals_per_day: int = 2,
+             guests: Optional[int] = None, history_ids: Sequence[int] = ()) -> MealPlan:
+        if guests is None:
+            bounds = serving_bounds(prefs.get("serving_size", "")) or (4, 4)
+            guests = bounds[1]
+        base = self.recommender.scores(prefs, history_ids)
+        # Rows of each course's category that pass the dietary restrictions
+        candidates = {course: rows[np.isfinite(base[rows])] for course, rows in self.category_rows.items()}
+        last_used = np.full(len(self.items), -np.inf)
+        uses = np.zeros(len(self.items))
+        plan_days = []
+        for day in range(days):
+            used_today = np.zeros(len(self.items), dtype=bool)
+            meals = []
+            for name in MEALS_PER_DAY[meals_per_day]:
+                meal = PlannedMeal(name)
+                for course in MEAL_COURSES[name]:
+                    rows = candidates.get(course)
+                    if rows is None or not len(rows):
+                        continue
+                    fresh = rows[~used_today[rows]]
+                    if len(fresh):
+                        rows = fresh
+                    penalty = (self.variety_weight * self.variety_decay ** (day - last_used[rows] - 1)
+                               + self.repeat_weight * uses[rows])
+                    choice = int(rows[np.argmax(base[rows] - penalty)])
+                    used_today[choice] = True
+                    last_used[choice] = day
+                    uses[choice] += 1
+                    item = self.items[choice]
+                    meal.dishes.append(PlannedDish(item, course, *portion(item, guests)))
+                meals.append(meal)
+            plan_days.append(meals)
+        return MealPlan(plan_days, guests)
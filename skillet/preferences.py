@@ -0,0 +1,157 @@
+"""Deterministic preference extraction from the app's own option vocabularies."""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Extra ways of saying an option; only used when the option is in the app's vocabulary
+STYLE_SYNONYMS = {
+    "bengali": "Bangladeshi", "bangla": "Bangladeshi", "deshi": "Bangladeshi",
+    "tex-mex": "Mexican", "tex mex": "Mexican",
+    "chinese": "Asian", "japanese": "Asian", "thai": "Asian", "korean": "Asian", "vietnamese": "Asian",
+    "greek": "Mediterranean", "lebanese": "Mediterranean", "turkish": "Mediterranean",
+    "pakistani": "Indo-Pakistani", "arabic": "Middle Eastern", "arabian": "Middle Eastern",
+}
+EXPERTISE_SYNONYMS = {
+    "beginner": "Beginner", "novice": "Beginner", "new to cooking": "Beginner", "never cooked": "Beginner",
+    "first time cooking": "Beginner", "intermediate": "Intermediate", "home cook": "Intermediate",
+    "advanced": "Advanced", "experienced": "Advanced", "professional": "Professional", "pro chef": "Professional",
+}
+DIET_SYNONYMS = {
+    "vegan": "Vegan", "plant based": "Vegan", "plant-based": "Vegan",
+    "vegetarian": "Vegetarian", "veggie": "Vegetarian",
+    "gluten free": "Gluten-Free", "gluten-free": "Gluten-Free", "celiac": "Gluten-Free", "coeliac": "Gluten-Free",
+    "dairy free": "Dairy-Free", "dairy-free": "Dairy-Free", "lactose intolerant": "Dairy-Free",
+    "nut free": "Nut-Free", "nut-free": "Nut-Free", "nut allergy": "Nut-Free",
+    "low carb": "Low-Carb", "low-carb": "Low-Carb",
+    "low sugar": "Low-Sugar", "low-sugar": "Low-Sugar", "sugar free": "Low-Sugar", "diabetic": "Low-Sugar",
+    "keto": "Keto", "ketogenic": "Keto", "paleo": "Paleo", "halal": "Halal",
+}
+# "no dairy", "allergic to peanuts" ... -> the restriction that avoids the ingredient
+AVOIDED_INGREDIENTS = {
+    "dairy": "Dairy-Free", "milk": "Dairy-Free", "lactose": "Dairy-Free", "cheese": "Dairy-Free",
+    "nut": "Nut-Free", "nuts": "Nut-Free", "peanut": "Nut-Free", "peanuts": "Nut-Free", "tree nuts": "Nut-Free",
+    "gluten": "Gluten-Free", "wheat": "Gluten-Free",
+    "meat": "Vegetarian", "sugar": "Low-Sugar", "carb": "Low-Carb", "carbs": "Low-Carb", "pork": "Halal",
+}
+SPICE_SYNONYMS = {
+    "mild": "Mild", "not spicy": "Mild", "no spice": "Mild", "medium spicy": "Medium", "medium spice": "Medium",
+    "spicy": "Spicy", "extra spicy": "Extra Spicy", "very spicy": "Extra Spicy", "extra hot": "Extra Spicy",
+}
+
+AVOID_RE = re.compile(
+    r"\b(?:no(?! longer)|without|avoid(?:ing)?|(?:do not|don't|dont|can't|cannot|can not|never) eat|"
+    r"allergic to|intolerant to|allergy to)\s+(?:any\s+|eating\s+)?([a-z]+(?: nuts)?)"
+)
+NEGATION_RE = re.compile(r"\b(?:not|no longer|isn't|aren't|am not|'m not|stopped being|quit being|quit|not really)\s+(?:a\s+|an\s+|being\s+|going\s+)?$")
+# Preference-like words the vocabularies can't represent; these go to the LLM
+UNKNOWN_DIET_RE = re.compile(r"\b(?:\w+tarian|kosher|whole ?30|fodmap|atkins|carnivore|flexitarian|raw food)\b")
+
+
+@dataclass
+class PreferenceSignals:
+    cooking_style: Optional[str] = None
+    expertise_level: Optional[str] = None
+    spice_level: Optional[str] = None
+    add_restrictions: List[str] = field(default_factory=list)
+    remove_restrictions: List[str] = field(default_factory=list)
+    needs_llm: bool = False
+    reasons: List[str] = field(default_factory=list)
+
+    # Merge into a user_preferences dict in place; True when something changed
+    def apply(self, prefs: Dict) -> bool:
+        updated = False
+        for key in ("cooking_style", "expertise_level", "spice_level"):
+            value = getattr(self, key)
+            if value and key in prefs and prefs[key] != value:
+                prefs[key] = value
+                updated = True
+        current = list(prefs.get("dietary_restrictions", []))
+        merged = [r for r in current if r not in self.remove_restrictions]
+        merged += [r for r in self.add_restrictions if r not in merged]
+        if merged != current:
+            prefs["dietary_restrictions"] = merged
+            updated = True
+        return updated
+
+
+class PreferenceExtractor:
+    def __init__(self, cooking_styles: Sequence[str], expertise_levels: Sequence[str],
+                 dietary_options: Sequence[str], spice_levels: Sequence[str] = ()):
+        # "Vegan" is both a style and a diet in app.py; a diet statement only updates the diet
+        self.styles = self._vocabulary([s for s in cooking_styles if s not in dietary_options], STYLE_SYNONYMS)
+        self.expertise = self._vocabulary(expertise_levels, EXPERTISE_SYNONYMS)
+        self.diets = self._vocabulary(dietary_options, DIET_SYNONYMS)
+        self.spice = self._vocabulary(spice_levels, SPICE_SYNONYMS)
+        self.dietary_options = set(dietary_options)
+        self.messages = 0
+        self.escalated = 0
+
+    @staticmethod
+    def _vocabulary(options: Sequence[str], synonyms: Dict[str, str]) -> List[Tuple[re.Pattern, str]]:
+        terms = {option.lower(): option for option in options if option != "General"}
+        terms.update({phrase: target for phrase, target in synonyms.items() if target in options})
+        # Longest phrases first so "extra spicy" wins over "spicy"
+        return [(re.compile(rf"\b{re.escape(phrase)}\b"), target)
+                for phrase, target in sorted(terms.items(), key=lambda kv: -len(kv[0]))]
+
+    @staticmethod
+    def _scan(text: str, vocabulary) -> List[Tuple[int, int, str]]:
+        hits, taken = [], []
+        for pattern, target in vocabulary:
+            for match in pattern.finditer(text):
+                if any(start < match.end() and match.start() < end for start, end in taken):
+                    continue
+                taken.append(match.span())
+                hits.append((match.start(), match.end(), target))
+        return sorted(hits)
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalated / self.messages if self.messages else 0.0
+
+    def extract(self, message: str) -> PreferenceSignals:
+        text = message.lower().replace("’", "'")
+        signals = PreferenceSignals()
+
+        masked = text
+        for match in AVOID_RE.finditer(text):
+            restriction = AVOIDED_INGREDIENTS.get(match.group(1))
+            if restriction in self.dietary_options:
+                signals.add_restrictions.append(restriction)
+            elif match.group(0).startswith(("allergic", "allergy", "intolerant")):
+                signals.reasons.append(f"unknown allergy: {match.group(1)}")
+            else:
+                continue
+            masked = masked[:match.start()] + " " * (match.end() - match.start()) + masked[match.end():]
+
+        for start, _, diet in self._scan(masked, self.diets):
+            if NEGATION_RE.search(masked[max(0, start - 20):start]):
+                signals.remove_restrictions.append(diet)
+            else:
+                signals.add_restrictions.append(diet)
+
+        for key, vocabulary in (("cooking_style", self.styles), ("expertise_level", self.expertise),
+                                ("spice_level", self.spice)):
+            found = {target for start, _, target in self._scan(masked, vocabulary)
+                     if not NEGATION_RE.search(masked[max(0, start - 20):start])}
+            if len(found) == 1:
+                setattr(signals, key, found.pop())
+            elif len(found) > 1:
+                signals.reasons.append(f"conflicting {key}: {', '.join(sorted(found))}")
+
+        conflicts = set(signals.add_restrictions) & set(signals.remove_restrictions)
+        if conflicts:
+            signals.reasons.append(f"conflicting restrictions: {', '.join(sorted(conflicts))}")
+        for match in UNKNOWN_DIET_RE.finditer(masked):
+            if not any(p.search(match.group(0)) for p, _ in self.diets):
+                signals.reasons.append(f"unknown diet: {match.group(0)}")
+
+        signals.add_restrictions = list(dict.fromkeys(signals.add_restrictions))
+        signals.remove_restrictions = list(dict.fromkeys(signals.remove_restrictions))
+        if not (signals.reasons or signals.add_restrictions or signals.remove_restrictions
+                or signals.cooking_style or signals.expertise_level or signals.spice_level):
+            signals.reasons.append("no known preference")
+        signals.needs_llm = bool(signals.reasons)
+        self.messages += 1
+        self.escalated += signals.needs_llm
+        return signals
@@ -0,0 +1,119 @@
+"""Speculative prefetch of likely follow-up API calls into the shared response cache.
+
+The app submits the exact request a user is likely to make next (same messages,
+temperature and max_tokens, so the same response key) once the current response is
+shown. A background worker sends it at Priority.PREFETCH, which the rate limiter only
+serves when no chat or extraction request is waiting. The result lands in the response
+cache, so the real request is a cache hit; a wrong guess costs one API call.
+"""
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Deque, Dict, List, Optional
+
+from skillet.euron import EuronClient
+from skillet.limiter import Priority
+
+
+class Prefetcher:
+    # max_pending bounds prefetches queued or in flight for the whole process;
+    # session_budget bounds prefetches per session within window seconds. Up to
+    # history prefetched keys are remembered for hit accounting.
+    def __init__(self, client: EuronClient, workers: int = 1, max_pending: int = 4, session_budget: int = 6,
+                 window: float = 600.0, enabled: bool = True, history: int = 500):
+        self.client = client
+        self.max_pending = max_pending
+        self.session_budget = session_budget
+        self.window = window
+        self.enabled = enabled and client.cache is not None
+        self.history = history
+        self.counts: Counter = Counter()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="skillet-prefetch")
+        self._lock = threading.Lock()
+        self._spent: Dict[str, Deque[float]] = defaultdict(deque)
+        self._inflight: Dict[str, Future] = {}
+        self._ready: "OrderedDict[str, float]" = OrderedDict()  # key -> when it was cached
+
+    def submit(self, session: str, messages: List[Dict[str, str]], temperature: float = 0.7,
+               max_tokens: int = 1000, purpose: Optional[str] = None) -> bool:
+        if not self.enabled:
+            return False
+        key = self.client.key_for(messages, temperature, max_tokens)
+        now = time.monotonic()
+        with self._lock:
+            spent = self._spent[session]
+            while spent and spent[0] <= now - self.window:
+                spent.popleft()
+            if key in self._inflight or key in self._ready:
+                self.counts["duplicate"] += 1
+                return False
+            if len(self._inflight) >= self.max_pending or len(spent) >= self.session_budget:
+                self.counts["skipped"] += 1
+                return False
+        if self.client.is_cached(messages, temperature, max_tokens):
+            with self._lock:
+                self.counts["already_cached"] += 1
+            return False
+        with self._lock:
+            spent.append(now)
+            self.counts["issued"] += 1
+            self._inflight[key] = self._executor.submit(self._run, key, session, messages, temperature, max_tokens,
+                                                        purpose)
+        return True
+
+    def _run(self, key: str, session: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int,
+             purpose: Optional[str] = None):
+        try:
+            content = self.client.complete(messages, temperature=temperature, max_tokens=max_tokens,
+                                           session=session, priority=Priority.PREFETCH, purpose=purpose)
+        except Exception as e:
+            logging.error(f"Prefetch failed: {str(e)}")
+            content = f"Error: {str(e)}"
+        with self._lock:
+            self._inflight.pop(key, None)
+            if content.startswith("Error:"):
+                self.counts["failed"] += 1
+                return
+            self.counts["completed"] += 1
+            self._ready[key] = time.monotonic()
+            while len(self._ready) > self.history:
+                self._ready.popitem(last=False)
+
+    # Call right before the real request. Waits up to timeout for a matching prefetch
+    # still in flight, so the two are not sent twice, and records whether it was a hit.
+    def observe(self, messages: List[Dict[str, str]], temperature: float = 0.7, max_tokens: int = 1000,
+                timeout: Optional[float] = 10.0) -> bool:
+        if not self.enabled:
+            return False
+        key = self.client.key_for(messages, temperature, max_tokens)
+        with self._lock:
+            future = self._inflight.get(key)
+            # Not started yet: drop it and let the real request go at its own priority
+            if future is not None and future.cancel():
+                del self._inflight[key]
+                self.counts["cancelled"] += 1
+                future = None
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except FutureTimeout:
+                pass
+        with self._lock:
+            hit = self._ready.pop(key, None) is not None
+            self.counts["hits" if hit else "misses"] += 1
+            if hit and future is not None:
+                self.counts["late_hits"] += 1
+            return hit
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            report = {name: self.counts[name] for name in
+                      ("issued", "completed", "failed", "cancelled", "skipped", "duplicate", "already_cached",
+                       "hits", "late_hits", "misses")}
+            report["in_flight"] = len(self._inflight)
+        # Share of finished prefetches the user went on to request
+        report["hit_rate"] = report["hits"] / report["completed"] if report["completed"] else 0.0
+        return report
@@ -0,0 +1,155 @@
+"""Per-purpose request profiles whose read timeout and max_tokens follow observed latency.
+
+Each kind of call (chat, extraction, preferences, meal_plan, recommendations, and the
+meal plan descriptions in app1) starts from a static RequestProfile. Once a purpose has
+min_samples successful responses, its read timeout becomes margin times the p99 latency,
+clamped to the profile's range, and its max_tokens shrinks when the observed seconds per
+generated token would not fit that timeout. max_tokens moves in TOKEN_STEP steps because
+it is part of the response cache key. Connect timeouts stay fixed, and every call also
+has a hard deadline across all of its attempts, which EuronClient enforces unless the
+caller passes deadline=False (batch jobs do).
+
+stats() compares each purpose with the old fixed timeout: a success slower than
+legacy_timeout would have timed out there and been retried.
+"""
+import threading
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from skillet.limiter import Priority
+
+TOKEN_STEP = 100
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True, slots=True)
+class RequestProfile:
+    temperature: float
+    max_tokens: int
+    min_tokens: int
+    priority: Priority
+    read_timeout: float  # until there are enough samples
+    min_read_timeout: float
+    max_read_timeout: float
+    deadline: float
+    connect_timeout: float = 3.05
+
+
+PROFILES = {
+    "chat": RequestProfile(0.7, 1000, 400, Priority.CHAT, 45, 10, 60, deadline=90),
+    "extraction": RequestProfile(0.3, 1000, 600, Priority.EXTRACTION, 45, 10, 60, deadline=90),
+    "preferences": RequestProfile(0.3, 500, 200, Priority.EXTRACTION, 20, 5, 30, deadline=40),
+    "meal_plan": RequestProfile(0.7, 2000, 1200, Priority.EXTRACTION, 90, 20, 120, deadline=150),
+    "recommendations": RequestProfile(0.7, 300, 150, Priority.EXTRACTION, 20, 5, 30, deadline=40),
+    "descriptions": RequestProfile(0.7, 500, 200, Priority.EXTRACTION, 30, 5, 45, deadline=60),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class RequestSettings:
+    purpose: str
+    temperature: float
+    max_tokens: int
+    timeout: Tuple[float, float]  # (connect, read), as requests takes it
+    deadline: float
+    priority: Priority
+
+
+# Generated tokens in a reply: the API's usage count when it sends one, else an estimate
+def completion_tokens(data: Dict, content: str) -> int:
+    usage = data.get("usage") if isinstance(data, dict) else None
+    if isinstance(usage, dict) and isinstance(usage.get("completion_tokens"), int):
+        return usage["completion_tokens"]
+    return max(1, len(content) // CHARS_PER_TOKEN)
+
+
+class AdaptiveProfiles:
+    def __init__(self, profiles: Optional[Dict[str, RequestProfile]] = None, window: int = 200, min_samples: int = 20,
+                 margin: float = 1.5, legacy_timeout: float = 5.0, legacy_retries: int = 3):
+        self.profiles = dict(PROFILES if profiles is None else profiles)
+        self.window = window
+        self.min_samples = min_samples
+        self.margin = margin
+        self.legacy_timeout = legacy_timeout
+        self.legacy_retries = legacy_retries
+        self._latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._per_token: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._counts: Dict[str, Counter] = defaultdict(Counter)
+        self._settings: Dict[str, RequestSettings] = {}
+        self._lock = threading.Lock()
+
+    def profile(self, purpose: str) -> RequestProfile:
+        try:
+            return self.profiles[purpose]
+        except KeyError:
+            raise ValueError(f"Unknown request purpose '{purpose}', use one of {', '.join(self.profiles)}")
+
+    def settings(self, purpose: str) -> RequestSettings:
+        with self._lock:
+            settings = self._settings.get(purpose)
+            if settings is None:
+                settings = self._settings[purpose] = self._compute(purpose)
+            return settings
+
+    def _compute(self, purpose: str) -> RequestSettings:
+        profile = self.profile(purpose)
+        read_timeout, max_tokens = profile.read_timeout, profile.max_tokens
+        latencies = self._latencies[purpose]
+        if len(latencies) >= self.min_samples:
+            p99 = float(np.percentile(latencies, 99))
+            read_timeout = min(max(p99 * self.margin, profile.min_read_timeout), profile.max_read_timeout)
+            # Fit the longest reply into the timeout at the slow end of observed generation speed
+            per_token = float(np.percentile(self._per_token[purpose], 90))
+            fits = int(read_timeout / per_token) // TOKEN_STEP * TOKEN_STEP if per_token > 0 else max_tokens
+            max_tokens = min(max(fits, profile.min_tokens), profile.max_tokens)
+        read_timeout = min(read_timeout, profile.deadline)
+        return RequestSettings(purpose, profile.temperature, max_tokens, (profile.connect_timeout, read_timeout),
+                               profile.deadline, profile.priority)
+
+    # One finished call: latency of its successful attempt (None when it failed), plus the
+    # timeouts, retries and deadline it ran into along the way
+    def record(self, purpose: str, latency: Optional[float], tokens: int = 0, timeouts: int = 0, retries: int = 0,
+               deadline_exceeded: bool = False):
+        if purpose not in self.profiles:
+            return
+        with self._lock:
+            counts = self._counts[purpose]
+            counts["calls"] += 1
+            counts["timeouts"] += timeouts
+            counts["retries"] += retries
+            counts["deadline_exceeded"] += int(deadline_exceeded)
+            if latency is None:
+                counts["failed"] += 1
+                return
+            self._latencies[purpose].append(latency)
+            if tokens > 0:
+                self._per_token[purpose].append(latency / tokens)
+            if latency > self.legacy_timeout:
+                counts["legacy_timeouts_avoided"] += 1
+                # Retrying a slow generation is as slow again, so the old policy spent every retry
+                counts["legacy_retries_avoided"] += self.legacy_retries - 1
+            self._settings.pop(purpose, None)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        report = {}
+        for purpose in self.profiles:
+            settings = self.settings(purpose)
+            with self._lock:
+                counts = self._counts[purpose]
+                latencies = list(self._latencies[purpose])
+                if not counts["calls"]:
+                    continue
+                row = {name: counts[name] for name in ("calls", "failed", "timeouts", "retries", "deadline_exceeded",
+                                                       "legacy_timeouts_avoided", "legacy_retries_avoided")}
+            row.update({
+                "p50_s": float(np.percentile(latencies, 50)) if latencies else 0.0,
+                "p99_s": float(np.percentile(latencies, 99)) if latencies else 0.0,
+                "read_timeout_s": settings.timeout[1],
+                "max_tokens": settings.max_tokens,
+                "adapted": len(latencies) >= self.min_samples,
+            })
+            report[purpose] = row
+        return report
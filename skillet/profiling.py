@@ -0,0 +1,203 @@
+"""Named timing spans, per-rerun breakdowns and process-wide latency histograms.
+
+    with span("menu_search"):
+        ...
+
+    @profiled("prompt_build")
+    def generate_system_message(...):
+        ...
+
+Every span feeds a log-bucketed histogram for its name, shared by the whole process
+and exportable as JSON. A script run that calls begin_rerun() also collects its own
+spans in order, and mark() times top-level script sections without indenting them.
+cProfile or pyinstrument can be wrapped around a whole rerun with a Capture.
+"""
+import bisect
+import contextvars
+import cProfile
+import functools
+import io
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Histogram bucket upper bounds: 10 us to 100 s, eight buckets per decade
+BUCKETS_MS = np.logspace(-2, 5, 57)
+_BOUNDS = BUCKETS_MS.tolist()
+CAPTURE_MODES = ("cprofile", "pyinstrument")
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float):
+        # bisect on a list: several times cheaper than numpy for one scalar
+        self.counts[bisect.bisect_left(_BOUNDS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    # Upper bound of the bucket holding the q-th quantile
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        bucket = int(np.searchsorted(np.cumsum(self.counts), q / 100 * self.count))
+        return float(BUCKETS_MS[bucket]) if bucket < len(BUCKETS_MS) else self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": [[float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else None, int(n)]
+                        for i, n in enumerate(self.counts) if n],
+        }
+
+
+_histograms: Dict[str, Histogram] = defaultdict(Histogram)
+_lock = threading.Lock()
+
+
+@dataclass
+class RerunProfile:
+    started: float = field(default_factory=time.perf_counter)
+    spans: List[Tuple[str, float, int]] = field(default_factory=list)  # (name, ms, nesting depth)
+    depth: int = 0
+    last_mark: float = 0.0
+
+    def __post_init__(self):
+        self.last_mark = self.started
+
+    # Time since the previous mark (or the start of the run) as a top-level span
+    def mark(self, name: str):
+        now = time.perf_counter()
+        record(name, (now - self.last_mark) * 1000)
+        self.last_mark = now
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    # (name, calls, total ms) per span name in first-seen order, indented by nesting depth
+    def breakdown(self) -> List[Tuple[str, int, float]]:
+        rows: Dict[Tuple[str, int], List[float]] = {}
+        for name, ms, depth in self.spans:
+            rows.setdefault((name, depth), []).append(ms)
+        return [("  " * depth + name, len(times), sum(times)) for (name, depth), times in rows.items()]
+
+
+_current: contextvars.ContextVar[Optional[RerunProfile]] = contextvars.ContextVar("skillet_rerun", default=None)
+
+
+def record(name: str, ms: float, depth: Optional[int] = None):
+    with _lock:
+        _histograms[name].add(ms)
+    profile = _current.get()
+    if profile is not None:
+        profile.spans.append((name, ms, profile.depth if depth is None else depth))
+
+
+@contextmanager
+def span(name: str):
+    profile = _current.get()
+    depth = 0
+    if profile is not None:
+        depth = profile.depth
+        profile.depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        if profile is not None:
+            profile.depth = depth
+        record(name, ms, depth)
+
+
+def profiled(name: Optional[str] = None):
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def begin_rerun() -> RerunProfile:
+    profile = RerunProfile()
+    _current.set(profile)
+    return profile
+
+
+def current_rerun() -> Optional[RerunProfile]:
+    return _current.get()
+
+
+def export_histograms() -> Dict[str, Dict[str, Any]]:
+    with _lock:
+        return {name: histogram.to_dict() for name, histogram in sorted(_histograms.items())}
+
+
+def reset_histograms():
+    with _lock:
+        _histograms.clear()
+
+
+class Capture:
+    # Whole-rerun profiler. pyinstrument is optional; without it, start() reports why
+    # and nothing is captured.
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.error = ""
+        self._profiler: Any = None
+
+    def start(self) -> "Capture":
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.mode == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                self.error = "pyinstrument is not installed (pip install pyinstrument)"
+                return self
+            self._profiler = Profiler()
+            self._profiler.start()
+        else:
+            self.error = f"Unknown profiler '{self.mode}', use one of {', '.join(CAPTURE_MODES)}"
+        return self
+
+    @property
+    def running(self) -> bool:
+        return self._profiler is not None
+
+    # Stop and return a text report: top functions by cumulative time, or the call tree
+    def stop(self, limit: int = 30) -> str:
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return self.error
+        if self.mode == "cprofile":
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+            return out.getvalue()
+        profiler.stop()
+        return profiler.output_text(unicode=True, color=False)
@@ -0,0 +1,136 @@
+"""System prompts for both apps and a token-budgeted menu context for them.
+
+Prompts are sent on every call, so they are kept short: one line per idea, no
+indentation, JSON schemas without whitespace, and only the menu rows relevant to
+the request, as a compact table that stops at a token budget.
+"""
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from skillet.menu import MenuItem
+
+CHARS_PER_TOKEN = 4  # rough average for English prose, good enough for budgeting
+MENU_CONTEXT_K = 5
+MENU_CONTEXT_TOKENS = 120
+MENU_TABLE_HEADER = "dish|course|taste"
+
+SHOPPING_LIST_SCHEMA = ('{"produce":[{"item":"tomato","quantity":"2","unit":"medium"}],'
+                        '"dairy":[{"item":"milk","quantity":"1","unit":"cup"}],"meat":[],"pantry":[],"spices":[],"other":[]}')
+MEAL_PLAN_SCHEMA = ('{"monday":{"breakfast":{"title":"Avocado Toast","description":"Simple avocado toast with eggs",'
+                    '"prep_time":"15 minutes"},"lunch":{...},"dinner":{...}},"tuesday":{...},...every day to "sunday"}')
+PREFERENCES_PROMPT = ("You extract cooking preferences from user messages: cooking style, expertise level and dietary "
+                      "restrictions. Reply with JSON only, with keys 'cooking_style', 'expertise_level' and "
+                      "'dietary_restrictions' (array). Default the cooking style to Bangladeshi if none is mentioned.")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _today(today: Optional[str]) -> str:
+    return today or datetime.now().strftime("%Y-%m-%d")
+
+
+def _diet(prefs: Dict) -> str:
+    return ", ".join(prefs.get("dietary_restrictions") or []) or "none"
+
+
+# Menu rows in relevance order, as many as fit in budget tokens (header included)
+def menu_table(items: Iterable[MenuItem], budget: int = MENU_CONTEXT_TOKENS) -> str:
+    lines = [MENU_TABLE_HEADER]
+    used = estimate_tokens(MENU_TABLE_HEADER) + 1
+    for item in items:
+        row = f"{item.dish_name}|{item.category}|{item.taste_category}"
+        cost = estimate_tokens(row) + 1
+        if used + cost > budget:
+            break
+        lines.append(row)
+        used += cost
+    return "\n".join(lines) if len(lines) > 1 else ""
+
+
+# app.py: general cooking assistant; purpose is "general", "shopping_list" or "meal_plan"
+def assistant_prompt(prefs: Dict, purpose: str = "general", today: Optional[str] = None) -> str:
+    if purpose == "shopping_list":
+        # Extraction needs neither the preferences nor the chat guidelines
+        return ("Extract the ingredients of the recipe the user gives, grouped by category (produce, dairy, meat, "
+                "pantry, spices, other), with clear quantities and units. Reply with JSON only, in this shape:\n"
+                + SHOPPING_LIST_SCHEMA)
+    profile = (f"Preferences: {prefs['cooking_style']} cooking, {prefs['expertise_level']} level, "
+               f"dietary restrictions: {_diet(prefs)}.")
+    if purpose == "meal_plan":
+        return (f"You are a cooking assistant. Today is {_today(today)}.\n{profile}\n"
+                "Create a 7-day meal plan with breakfast, lunch and dinner that follows the preferences, suits the "
+                "skill level and varies across the week. With no cooking style given, use Bangladeshi recipes. "
+                "Reply with JSON only, in this shape:\n" + MEAL_PLAN_SCHEMA)
+    return (f"You are a cooking assistant skilled in many cuisines and techniques. Today is {_today(today)}.\n"
+            f"{profile}\n"
+            "Give clear step-by-step recipes with times, temperatures and yields. Suggest substitutions, especially "
+            "for dietary restrictions. Explain techniques at the user's level. Add preparation, storage and food "
+            "safety tips; food safety comes first.\n"
+            "The user can ask for recipes or cooking questions, say \"add this to my shopping list\", or ask for a "
+            "meal plan. Help them whatever their experience.")
+
+
+# app1.py: Shared Skillet kitchen assistant, with the relevant menu rows when there are any
+def kitchen_prompt(prefs: Dict, purpose: str = "general", menu_items: Optional[List[MenuItem]] = None,
+                   today: Optional[str] = None, budget: int = MENU_CONTEXT_TOKENS) -> str:
+    lines = [
+        "You are Shared Skillet's culinary assistant, expert in authentic Bangladeshi and South Asian cuisine. "
+        f"Today is {_today(today)}.",
+        f"User: {prefs['cooking_style']} cooking, {prefs['expertise_level']} level, dietary restrictions: "
+        f"{_diet(prefs)}, {prefs['spice_level']} spice, serves {prefs['serving_size']}.",
+    ]
+    table = menu_table(menu_items or [], budget)
+    if table:
+        lines += ["Shared Skillet menu dishes matching this request (authentic and professionally made):", table]
+    if purpose in ("general", "recipe_request"):
+        lines += [
+            "Check the menu dishes first and present any that fit as the main recommendation; suggest other "
+            "recipes only when none match.",
+            "Give professional step-by-step instructions with times, temperatures and yields, plus substitutions "
+            "and tips. Stress food safety and technique, match the user's expertise and respect their diet.",
+            "Be professional yet friendly, add cultural context for traditional dishes and suggest presentation "
+            "and serving.",
+        ]
+    return "\n".join(lines)
+
+
+def recipe_request(dish_name: str) -> str:
+    return f"Please provide a detailed recipe for {dish_name}, including ingredients, step-by-step instructions, and cooking tips."
+
+
+# Messages for extract_ingredients in app.py
+def ingredient_messages(recipe_text: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": assistant_prompt({}, purpose="shopping_list")},
+        {"role": "user", "content": f"Extract ingredients from this recipe: {recipe_text}"},
+    ]
+
+
+# Messages for generate_meal_plan in app.py. With slots, only those (day, meal type) slots
+# are asked for, and the meals kept from plan are listed so the new ones fit around them.
+def meal_plan_messages(prefs: Dict, today: Optional[str] = None, plan: Optional[Dict] = None,
+                       slots: Optional[Sequence[Tuple[str, str]]] = None) -> List[Dict[str, str]]:
+    preferences = (f"Cooking style: {prefs['cooking_style']}, Expertise level: {prefs['expertise_level']}, "
+                   f"Dietary restrictions: {', '.join(prefs['dietary_restrictions'])}")
+    system = {"role": "system", "content": assistant_prompt(prefs, purpose="meal_plan", today=today)}
+    if slots is None:
+        request = f"Create a weekly meal plan based on these preferences: {preferences}"
+        return [system, {"role": "user", "content": request}]
+    plan = plan or {}
+    replace = set(slots)
+    kept = [f"{day} {meal_type}: {meal.title}" for day, day_plan in plan.items()
+            for meal_type, meal in day_plan.meals.items() if (day, meal_type) not in replace]
+    current = {(day, meal_type): meal.title for day, day_plan in plan.items()
+               for meal_type, meal in day_plan.meals.items()}
+    replaced = [f"{day} {meal_type}" + (f" (now {current[day, meal_type]})" if (day, meal_type) in current else "")
+                for day, meal_type in slots]
+    request = (f"Update my weekly meal plan based on these preferences: {preferences}\n"
+               f"Replace only these meals with different dishes: {', '.join(replaced)}.\n")
+    if kept:
+        request += "Keep these meals and avoid repeating them:\n" + "\n".join(kept) + "\n"
+    request += "Reply in the same JSON shape with only the replaced meals."
+    return [system, {"role": "user", "content": request}]
+
@@ -0,0 +1,79 @@
+"""Local menu recommender: scores the whole catalog against a user profile in one NumPy pass."""
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from skillet.menu import MenuItem
+from skillet.search import MenuIndex, tokenize
+
+MEAT_TERMS = {"chicken", "beef", "lamb", "mutton", "meat", "meatball", "kebab", "kofta"}
+DAIRY_TERMS = {"yogurt", "cream", "cheese", "cheesecake", "butter", "ghee", "mascarpone", "milk", "lassi", "malai"}
+EGG_TERMS = {"egg", "ladyfinger"}
+GLUTEN_TERMS = {"cake", "ladyfinger", "crumbed", "cutlet", "kataifi", "tiramisu"}
+CARB_TERMS = {"rice", "biryani", "pulao", "tehari", "cake", "potato", "jorda"}
+SUGAR_TERMS = {"sweet", "dessert", "cake", "mango", "pineapple", "tiramisu"}
+
+# Dietary restriction -> terms that rule a dish out
+DIET_EXCLUSIONS = {
+    "Vegetarian": MEAT_TERMS,
+    "Vegan": MEAT_TERMS | DAIRY_TERMS | EGG_TERMS,
+    "Dairy-Free": DAIRY_TERMS,
+    "Gluten-Free": GLUTEN_TERMS,
+    "Low-Carb": CARB_TERMS,
+    "Keto": CARB_TERMS | SUGAR_TERMS,
+    "Low-Sugar": SUGAR_TERMS,
+}
+
+# Spice level -> weight applied to dishes whose taste is Spicy
+SPICE_WEIGHTS = {"Mild": -0.5, "Medium": 0.0, "Spicy": 0.3, "Extra Spicy": 0.5}
+
+
+class Recommender:
+    def __init__(self, index: MenuIndex, history_decay: float = 0.8):
+        self.index = index
+        self.items = index.items
+        self.history_decay = history_decay
+        self.positions = {item.id: pos for pos, item in enumerate(self.items)}
+        self.spicy = np.array([item.taste_category == "Spicy" for item in self.items], dtype=np.float32)
+        token_sets = [set(tokenize(f"{item.dish_name} {item.summary}")) for item in self.items]
+        self.diet_masks = {
+            diet: np.array([not (tokens & terms) for tokens in token_sets], dtype=bool)
+            for diet, terms in DIET_EXCLUSIONS.items()
+        }
+
+    def allowed_mask(self, dietary_restrictions: Iterable[str]) -> np.ndarray:
+        mask = np.ones(len(self.items), dtype=bool)
+        for diet in dietary_restrictions:
+            if diet in self.diet_masks:
+                mask &= self.diet_masks[diet]
+        return mask
+
+    # Profile = preference text embedded in the index space plus a recency-weighted
+    # mean of the vectors of dishes the user interacted with (most recent last).
+    def profile_vector(self, prefs: Dict, history_ids: Sequence[int] = ()) -> np.ndarray:
+        pref_text = " ".join([prefs.get("cooking_style", ""), prefs.get("spice_level", "")])
+        profile = self.index.encode([pref_text])[0]
+        rows = [self.positions[i] for i in history_ids if i in self.positions]
+        if rows:
+            weights = self.history_decay ** np.arange(len(rows) - 1, -1, -1, dtype=np.float32)
+            history = weights @ self.index.matrix[rows] / weights.sum()
+            profile = 0.3 * profile + 0.7 * history
+        return profile
+
+    def scores(self, prefs: Dict, history_ids: Sequence[int] = (), exclude_ids: Iterable[int] = ()) -> np.ndarray:
+        scores = self.index.matrix @ self.profile_vector(prefs, history_ids)
+        scores += SPICE_WEIGHTS.get(prefs.get("spice_level", "Medium"), 0.0) * self.spicy
+        scores[~self.allowed_mask(prefs.get("dietary_restrictions", []))] = -np.inf
+        excluded = [self.positions[i] for i in exclude_ids if i in self.positions]
+        scores[excluded] = -np.inf
+        return scores
+
+    def recommend(self, prefs: Dict, history_ids: Sequence[int] = (), exclude_ids: Iterable[int] = (),
+                  k: int = 3) -> List[Tuple[MenuItem, float]]:
+        scores = self.scores(prefs, history_ids, exclude_ids)
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.items[i], float(scores[i])) for i in top]
@@ -0,0 +1,205 @@
+"""Local TF-IDF vector index over the menu catalog with hybrid lexical scoring."""
+import difflib
+import hashlib
+import io
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from skillet.cache import SharedCache
+from skillet.dishes import DishResolver, word_key
+from skillet.menu import MenuItem
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "any", "are", "as", "at", "be", "best", "can", "dish", "dishes", "do", "for",
+    "from", "give", "have", "i", "in", "is", "it", "me", "my", "of", "on", "or", "please", "recommend",
+    "show", "some", "something", "suggest", "that", "the", "to", "want", "what", "with", "you", "your",
+}
+
+# Words a customer uses for a category that never appear in the dish data itself
+CATEGORY_TERMS = {
+    "Main": "main dinner lunch entree meal",
+    "Appetizer": "appetizer starter snack side",
+    "Dessert": "dessert sweet treat",
+    "Drinks": "drink beverage refreshing cold",
+}
+
+LEXICAL_KEYWORDS = ['chicken', 'beef', 'biryani', 'kebab', 'dessert', 'drink', 'cake', 'spicy', 'sweet', 'savory']
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        # Light plural folding so "kebabs" and "kebab" share a term
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+# Terms of the vector index: tokens with the resolver's spelling folds, so "biriyani" and
+# "biryani" are one term
+def index_terms(text: str) -> List[str]:
+    return [word_key(token) for token in tokenize(text)]
+
+
+def item_document(item: MenuItem) -> str:
+    return " ".join([
+        item.dish_name,
+        item.dish_name,  # the name is weighted twice over the summary
+        item.category,
+        CATEGORY_TERMS.get(item.category, ""),
+        item.taste_category,
+        item.summary,
+    ])
+
+
+# Substring and keyword part of the original smart_menu_search score
+def substring_score(query_lower: str, item: MenuItem) -> float:
+    name_lower = item.dish_name.lower()
+    score = 0.0
+    if query_lower in name_lower:
+        score += 90
+    if query_lower in item.category.lower():
+        score += 50
+    if query_lower in item.taste_category.lower():
+        score += 30
+    for keyword in LEXICAL_KEYWORDS:
+        if keyword in query_lower and keyword in name_lower:
+            score += 25
+    return score
+
+
+# Original substring + difflib score, kept as the lexical half of the hybrid score
+def lexical_score(query_lower: str, item: MenuItem) -> Tuple[float, float]:
+    similarity = difflib.SequenceMatcher(None, query_lower, item.dish_name.lower()).ratio()
+    return substring_score(query_lower, item), similarity
+
+
+def lexical_search(items: Sequence[MenuItem], query: str, limit: int = 3) -> List[MenuItem]:
+    query_lower = query.lower()
+    scored_items = []
+    for item in items:
+        score, similarity = lexical_score(query_lower, item)
+        score += similarity * 40
+        if score > 20:
+            scored_items.append((item, score))
+    scored_items.sort(key=lambda x: x[1], reverse=True)
+    return [item[0] for item in scored_items[:limit]]
+
+
+class MenuIndex:
+    def __init__(self, items: Sequence[MenuItem], _state: Optional[Tuple[Dict[str, int], np.ndarray, np.ndarray]] = None):
+        self.items = list(items)
+        self.resolver = DishResolver(self.items)
+        if _state is not None:
+            self.vocab, self.idf, self.matrix = _state
+            return
+        docs = [index_terms(item_document(item)) for item in self.items]
+        vocab: Dict[str, int] = {}
+        for tokens in docs:
+            for token in tokens:
+                vocab.setdefault(token, len(vocab))
+        self.vocab = vocab
+
+        counts = np.zeros((len(docs), len(vocab)), dtype=np.float32)
+        for row, tokens in enumerate(docs):
+            for token in tokens:
+                counts[row, vocab[token]] += 1
+        doc_freq = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(docs)) / (1 + doc_freq)) + 1).astype(np.float32)
+        self.matrix = self._normalize(np.log1p(counts) * self.idf)
+
+    # Vocabulary, idf and document matrix as an .npz blob; the items are not included
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        terms = np.array(sorted(self.vocab, key=self.vocab.get), dtype=str)
+        np.savez(buffer, terms=terms, idf=self.idf, matrix=self.matrix)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, items: Sequence[MenuItem], data: bytes) -> "MenuIndex":
+        with np.load(io.BytesIO(data)) as arrays:
+            vocab = {str(term): col for col, term in enumerate(arrays["terms"])}
+            return cls(items, (vocab, arrays["idf"], arrays["matrix"]))
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def encode(self, queries: Iterable[str]) -> np.ndarray:
+        queries = list(queries)
+        vectors = np.zeros((len(queries), len(self.vocab)), dtype=np.float32)
+        for row, query in enumerate(queries):
+            for term in index_terms(query):
+                col = self.vocab.get(term)
+                if col is not None:
+                    vectors[row, col] += 1
+                    continue
+                # A misspelled dish-name word counts toward the closest name words
+                matches = self.resolver.lookup(term)
+                closest = max(matches.values(), default=0.0)
+                for word, similarity in matches.items():
+                    col = self.vocab.get(word)
+                    if col is not None and similarity == closest:
+                        vectors[row, col] += similarity
+        return self._normalize(np.log1p(vectors) * self.idf)
+
+    def similarities(self, queries: Iterable[str]) -> np.ndarray:
+        return self.encode(queries) @ self.matrix.T
+
+    # Batched top-k cosine search: one matrix product for all queries
+    def top_k(self, queries: Iterable[str], k: int = 5) -> List[List[Tuple[MenuItem, float]]]:
+        sims = self.similarities(queries)
+        k = min(k, len(self.items))
+        if k == 0:
+            return [[] for _ in range(len(sims))]
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in enumerate(top):
+            ordered = candidates[np.argsort(-sims[row, candidates], kind="stable")]
+            results.append([(self.items[i], float(sims[row, i])) for i in ordered if sims[row, i] > 0])
+        return results
+
+    # Blend cosine similarity with the lexical score. Misspelled words already reach the
+    # cosine side through encode(); the resolver's whole-name score only adds to the lexical
+    # side for near misses, so it doesn't let every item through.
+    def hybrid_search(self, query: str, limit: int = 3, semantic_weight: float = 0.6,
+                      fuzzy_cutoff: float = 0.75) -> List[MenuItem]:
+        sims = self.similarities([query])[0]
+        query_lower = query.lower()
+        names = self.resolver.scores(query)
+        scored_items = []
+        for idx, item in enumerate(self.items):
+            lexical = substring_score(query_lower, item)
+            similarity = names.get(idx, 0.0)
+            if similarity >= fuzzy_cutoff:
+                lexical += similarity * 40
+            if sims[idx] <= 0 and lexical == 0:
+                continue
+            score = semantic_weight * float(sims[idx]) + (1 - semantic_weight) * min(lexical / 100.0, 1.0)
+            scored_items.append((item, score))
+        scored_items.sort(key=lambda x: x[1], reverse=True)
+        return [item for item, _ in scored_items[:limit]]
+
+
+# Build the index once per catalog version and share it with every worker through the cache
+def cached_menu_index(items: Sequence[MenuItem], cache: SharedCache) -> MenuIndex:
+    docs = "\n".join(item_document(item) for item in items)
+    key = "menu:index:v2:" + hashlib.sha256(docs.encode()).hexdigest()
+    data = cache.get(key)
+    if data is not None:
+        try:
+            return MenuIndex.from_bytes(items, data)
+        except (ValueError, KeyError, OSError):
+            cache.delete(key)
+    index = MenuIndex(items)
+    cache.set(key, index.to_bytes())
+    return index
@@ -0,0 +1,134 @@
+"""Per-session memory caps for long-lived Streamlit sessions, such as shop kiosks.
+
+Chat history keeps at most MemoryLimits.messages + spill_page messages in memory; the
+oldest are moved to the shared cache a page at a time and only read back to show them
+under "Load older messages". Recommended items are deduplicated by menu id and capped,
+and interaction history and extraction caches keep their newest entries.
+memory_report() sizes what each session_state key holds, for the debug views.
+
+Limits come from SKILLET_MAX_MESSAGES, SKILLET_SPILL_PAGE, SKILLET_MAX_RECOMMENDED,
+SKILLET_MAX_HISTORY and SKILLET_MAX_EXTRACTIONS.
+"""
+import os
+import sys
+from dataclasses import dataclass, fields
+from enum import Enum
+from types import FunctionType, ModuleType
+from typing import Any, Dict, Iterable, List, Mapping
+
+from skillet.cache import SharedCache
+from skillet.models import Message
+
+# Spilled messages outlive an idle session by this long
+SPILL_TTL = 7 * 86400
+LIMIT_ENV = {
+    "messages": "SKILLET_MAX_MESSAGES",
+    "spill_page": "SKILLET_SPILL_PAGE",
+    "recommended": "SKILLET_MAX_RECOMMENDED",
+    "history": "SKILLET_MAX_HISTORY",
+    "extractions": "SKILLET_MAX_EXTRACTIONS",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryLimits:
+    messages: int = 200  # chat messages always kept in memory
+    spill_page: int = 50  # messages moved to the cache at a time
+    recommended: int = 30
+    history: int = 200
+    extractions: int = 50
+
+    @classmethod
+    def from_env(cls) -> "MemoryLimits":
+        values = {}
+        for f in fields(cls):
+            value = os.environ.get(LIMIT_ENV[f.name], "").strip()
+            if value:
+                values[f.name] = max(1, int(value))
+        return cls(**values)
+
+
+def spill_key(session: str, page: int) -> str:
+    return f"skillet:session:{session}:messages:{page}"
+
+
+# Move whole pages of the oldest messages to the cache once the list is a page over the
+# limit. spilled is how many messages this session has moved so far; returns the new count.
+def spill_messages(messages: List[Message], cache: SharedCache, session: str, spilled: int,
+                   limits: MemoryLimits) -> int:
+    page = limits.spill_page
+    while len(messages) >= limits.messages + page:
+        cache.set_json(spill_key(session, spilled // page), [m.to_api() for m in messages[:page]], ttl=SPILL_TTL)
+        del messages[:page]
+        spilled += page
+    return spilled
+
+
+# The last window messages of the whole conversation, reading spilled pages back from the
+# cache only when the window reaches past the ones in memory. Expired pages are skipped.
+def recent_messages(messages: List[Message], window: int, cache: SharedCache, session: str, spilled: int,
+                    limits: MemoryLimits) -> List[Message]:
+    if window <= len(messages):
+        return messages[-window:]
+    older: List[Message] = []
+    page = (spilled - 1) // limits.spill_page
+    while page >= 0 and len(older) + len(messages) < window:
+        data = cache.get_json(spill_key(session, page))
+        older[:0] = [m for m in map(Message.from_json, data if isinstance(data, list) else []) if m is not None]
+        page -= 1
+    return (older + messages)[-window:]
+
+
+# Items in order, without repeats of the same id, at most limit of them
+def dedupe_by_id(items: Iterable[Any], limit: int) -> List[Any]:
+    seen, kept = set(), []
+    for item in items:
+        if item.id not in seen:
+            seen.add(item.id)
+            kept.append(item)
+            if len(kept) >= limit:
+                break
+    return kept
+
+
+def keep_last(items: List[Any], limit: int):
+    del items[:-limit]
+
+
+# Drop the oldest entries of an insertion-ordered dict
+def trim_oldest(mapping: Dict[Any, Any], limit: int):
+    while len(mapping) > limit:
+        del mapping[next(iter(mapping))]
+
+
+# Bytes held by obj and everything it references, each object counted once; objects
+# already in seen, enum members, classes and functions are not the session's
+def deep_size(obj: Any, seen: set) -> int:
+    if id(obj) in seen or isinstance(obj, (Enum, type, ModuleType, FunctionType)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_size(item, seen) for item in obj)
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            size += deep_size(getattr(obj, name, None), seen)
+    if hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    return size
+
+
+# One row per session_state key, largest first. Objects in shared (like the menu items)
+# belong to the process and are left out.
+def memory_report(state: Mapping[str, Any], shared: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+    seen = {id(obj) for obj in shared}
+    rows = []
+    for key in list(state.keys()):
+        value = state[key]
+        rows.append({"Key": key, "Items": len(value) if hasattr(value, "__len__") else None,
+                     "Bytes": deep_size(value, seen)})
+    return sorted(rows, key=lambda row: -row["Bytes"])
@@ -0,0 +1,141 @@
+"""Streamlit rendering helpers shared by both apps."""
+import functools
+import html
+import json
+import time
+from typing import Dict, Tuple
+
+import pandas as pd
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from skillet.limiter import RateLimiter
+from skillet.menu import MenuItem
+from skillet.prefetch import Prefetcher
+from skillet.profiles import AdaptiveProfiles
+from skillet.session import MemoryLimits, memory_report
+from skillet.profiling import Capture, RerunProfile, begin_rerun, export_histograms, span
+
+
+# st.fragment that also records how long the last run of its body took, in
+# st.session_state.render_timings[<function name>] (milliseconds)
+def timed_fragment(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with span(func.__name__):
+                return func(*args, **kwargs)
+        finally:
+            timings = st.session_state.setdefault("render_timings", {})
+            timings[func.__name__] = (time.perf_counter() - start) * 1000
+
+    return st.fragment(wrapper)
+
+
+# Rerun only the calling fragment. A fragment body also runs as part of full reruns,
+# where Streamlit rejects scope="fragment", so fall back to rerunning the app.
+def rerun_fragment():
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+# Id of the browser session running this script, the same across its reruns
+def session_id() -> str:
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "default"
+
+
+# One line per priority class that has used the API: requests sent, throttled and queue wait
+def show_queue_stats(limiter: RateLimiter):
+    for name, stats in limiter.stats().items():
+        if stats["granted"] or stats["rejected"]:
+            st.caption(f"API queue ({name}): {stats['granted']} sent, {stats['rejected']} throttled, "
+                       f"wait p50 {stats['wait_p50_ms']:.0f} ms, p95 {stats['wait_p95_ms']:.0f} ms")
+
+
+def show_request_profiles(profiles: AdaptiveProfiles):
+    for purpose, stats in profiles.stats().items():
+        st.caption(f"API {purpose}: {stats['calls']} calls, p50 {stats['p50_s']:.1f} s, p99 {stats['p99_s']:.1f} s, "
+                   f"read timeout {stats['read_timeout_s']:.0f} s, max {stats['max_tokens']} tokens, "
+                   f"{stats['timeouts']} timeouts, {stats['retries']} retries, "
+                   f"{stats['legacy_timeouts_avoided']} timeouts avoided vs a fixed {profiles.legacy_timeout:g} s")
+
+
+def show_prefetch_stats(prefetcher: Prefetcher):
+    stats = prefetcher.stats()
+    if stats["issued"]:
+        st.caption(f"Prefetch: {stats['issued']} sent, {stats['completed']} ready, {stats['hits']} used "
+                   f"({stats['hit_rate']:.0%} hit rate), {stats['skipped']} over budget, {stats['failed']} failed")
+
+
+# What this session holds in memory, per session_state key, against its limits
+def show_session_memory(state, limits: MemoryLimits, shared=()):
+    rows = memory_report(state, shared)
+    st.caption(f"Session memory: {sum(row['Bytes'] for row in rows) / 1024:.0f} KB in {len(rows)} keys, "
+               f"{len(state.get('messages', []))} of max {limits.messages + limits.spill_page} messages in memory, "
+               f"{state.get('spilled_messages', 0)} moved to the shared cache")
+    st.dataframe(pd.DataFrame(rows[:10]), hide_index=True)
+
+
+# Opt-in profiling for this script run: ?debug=1 shows the timing sidebar, and
+# ?profile=cprofile (or pyinstrument) also profiles the whole rerun
+def start_profiling() -> RerunProfile:
+    # A rerun cut short by st.rerun() never reached profiling_sidebar
+    stale = st.session_state.pop("profile_capture", None)
+    if stale is not None:
+        stale.stop()
+    profile = begin_rerun()
+    mode = st.query_params.get("profile")
+    if mode:
+        st.session_state.profile_capture = Capture(mode).start()
+    return profile
+
+
+def profiling_sidebar(profile: RerunProfile):
+    if not (st.query_params.get("debug") or st.query_params.get("profile")):
+        return
+    capture = st.session_state.pop("profile_capture", None)
+    report = capture.stop() if capture is not None else ""
+    with st.sidebar:
+        st.subheader("⏱️ Rerun Timing")
+        st.caption(f"This rerun: {profile.elapsed_ms:.1f} ms")
+        st.dataframe(pd.DataFrame(profile.breakdown(), columns=["Span", "Calls", "ms"]).round({"ms": 2}),
+                     hide_index=True, use_container_width=True)
+        st.download_button(
+            label="Download span histograms",
+            data=json.dumps(export_histograms(), indent=2),
+            file_name="skillet_span_histograms.json",
+            mime="application/json",
+        )
+        if report:
+            with st.expander(f"{capture.mode} report", expanded=False):
+                st.code(report)
+
+
+_card_html: Dict[int, Tuple[str, str]] = {}
+
+
+# Header and pricing HTML for a menu card, built once per item and reused on every rerun
+def menu_card_html(item: MenuItem) -> Tuple[str, str]:
+    cached = _card_html.get(item.id)
+    if cached is None:
+        header = f"""
+        <div class="menu-item-card">
+            <div style="display: flex; align-items: center; margin-bottom: 10px;">
+                <h3 style="margin: 0; flex-grow: 1;">{html.escape(item.dish_name)}</h3>
+                <span class="category-badge">{html.escape(item.category)}</span>
+                <span class="category-badge" style="background: linear-gradient(135deg, #ff9a9e 0%, #ff6b6b 100%); color: #ffffff;">{html.escape(item.taste_category)}</span>
+            </div>
+        </div>
+        """
+        badges = "".join(
+            f'<span class="price-badge">{option.replace("_", " ").title()}: ${price} {item.serving_info.get(option, "")}</span>'
+            for option, price in item.pricing.items()
+        )
+        pricing = f'<div><h4>Pricing Options:</h4>{badges}</div>'
+        cached = _card_html[item.id] = (header, pricing)
+    return cached
@@ -0,0 +1,70 @@
+"""Incremental edits to app.py's weekly meal plan: locks, diffs and in-place patches.
+
+A plan is {day: DayPlan} as parse_week returns it, and a slot is one (day, meal type).
+Regenerating asks the LLM for the unlocked slots only and patches its reply into the
+plan, so meals that did not change keep their text, and with it their cached
+ingredient extractions.
+"""
+from dataclasses import replace
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from skillet.models import DAYS, MEAL_TYPES, DayPlan, Meal
+
+Slot = Tuple[str, str]
+
+
+def all_slots(days: Optional[Iterable[str]] = None) -> List[Slot]:
+    days = set(DAYS if days is None else days)
+    return [(day, meal_type) for day in DAYS if day in days for meal_type in MEAL_TYPES]
+
+
+# Slots to regenerate: every slot of the given days (all by default) that isn't locked
+def unlocked_slots(locked: Set[Slot], days: Optional[Iterable[str]] = None) -> List[Slot]:
+    return [slot for slot in all_slots(days) if slot not in locked]
+
+
+def meal_at(plan: Dict[str, DayPlan], slot: Slot) -> Optional[Meal]:
+    day_plan = plan.get(slot[0])
+    return None if day_plan is None else day_plan.meals.get(slot[1])
+
+
+# Slots whose meal differs between two plans, in week order
+def diff_week(old: Dict[str, DayPlan], new: Dict[str, DayPlan]) -> List[Slot]:
+    return [slot for slot in all_slots() if meal_at(old, slot) != meal_at(new, slot)]
+
+
+# Put the meals of a week-shaped reply into the plan in place, for the requested slots
+# only; slots the reply leaves out keep their meal. DayPlans are frozen, so a changed day
+# is replaced by a copy with the new meal. Returns the slots that changed.
+def patch_week(plan: Dict[str, DayPlan], data: Any, slots: Iterable[Slot]) -> List[Slot]:
+    if not isinstance(data, dict):
+        return []
+    days = {str(day).lower(): value for day, value in data.items()}
+    changed, added_day = [], False
+    for day, meal_type in slots:
+        reply = days.get(day)
+        meal = Meal.from_json(reply.get(meal_type)) if isinstance(reply, dict) else None
+        if meal is None:
+            continue
+        day_plan = plan.get(day)
+        if day_plan is None:
+            day_plan = plan[day] = DayPlan(day)
+            added_day = True
+        if day_plan.meals.get(meal_type) != meal:
+            plan[day] = replace(day_plan, meals={**day_plan.meals, meal_type: meal})
+            changed.append((day, meal_type))
+    if added_day:
+        # New days go in week order like the rest
+        for day in [day for day in DAYS if day in plan]:
+            plan[day] = plan.pop(day)
+    return changed
+
+
+# Each distinct meal of the plan once, in week order, as the text used for extraction
+def meal_texts(plan: Dict[str, DayPlan]) -> List[str]:
+    texts = {}
+    for slot in all_slots():
+        meal = meal_at(plan, slot)
+        if meal is not None:
+            texts.setdefault(meal.text, None)
+    return list(texts)